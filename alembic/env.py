@@ -14,8 +14,10 @@ fileConfig(config.config_file_name)
 
 # Import models here to ensure they are registered:
 from app.models.course import Course
+from app.models.idempotency_key import IdempotencyKey
 from app.models.private_lesson import PrivateLesson
 from app.models.reservation import Reservation
+from app.models.reservation_tombstone import ReservationTombstone
 from app.models.review import Review
 from app.models.user import User
 from app.models.weekly_timeblock import WeeklyTimeblock
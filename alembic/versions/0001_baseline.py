@@ -0,0 +1,162 @@
+"""Baseline: the tables as `init_db()` created them before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+Databases created by `init_db()` already have these tables, so each one is
+only created when it's missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "course" not in existing_tables:
+        op.create_table(
+            "course",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(100), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+        )
+
+    if "user" not in existing_tables:
+        op.create_table(
+            "user",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("password", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("number", sa.String(), nullable=True),
+            sa.Column(
+                "role",
+                sa.Enum("student", "tutor", "admin", name="userrole"),
+                nullable=False
+            ),
+        )
+        op.create_index("ix_user_id", "user", ["id"])
+        op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    if "privatelesson" not in existing_tables:
+        op.create_table(
+            "privatelesson",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "tutor_id",
+                sa.Integer(),
+                sa.ForeignKey("user.id"),
+                nullable=True
+            ),
+            sa.Column(
+                "course_id",
+                sa.Integer(),
+                sa.ForeignKey("course.id"),
+                nullable=False
+            ),
+            sa.Column("price", sa.Integer(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column(
+                "offer_status",
+                sa.Enum("OPEN", "CLOSED", name="offerstatus"),
+                nullable=False
+            ),
+        )
+
+    if "reservation" not in existing_tables:
+        op.create_table(
+            "reservation",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "private_lesson_id",
+                sa.Integer(),
+                sa.ForeignKey("privatelesson.id"),
+                nullable=False
+            ),
+            sa.Column(
+                "student_id",
+                sa.Integer(),
+                sa.ForeignKey("user.id"),
+                nullable=True
+            ),
+            sa.Column(
+                "status",
+                sa.Enum(
+                    "PENDING", "ACCEPTED", "REJECTED",
+                    name="reservationstatus"
+                ),
+                nullable=False
+            ),
+            sa.Column("start_time", sa.DateTime(), nullable=False),
+            sa.Column("end_time", sa.DateTime(), nullable=False),
+        )
+
+    if "review" not in existing_tables:
+        op.create_table(
+            "review",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "reservation_id",
+                sa.Integer(),
+                sa.ForeignKey("reservation.id"),
+                nullable=False
+            ),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("rating", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+    if "weeklytimeblock" not in existing_tables:
+        op.create_table(
+            "weeklytimeblock",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("user.id"),
+                nullable=False
+            ),
+            sa.Column(
+                "weekday",
+                sa.Enum(
+                    "MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY",
+                    "SATURDAY", "SUNDAY",
+                    name="weekday"
+                ),
+                nullable=False
+            ),
+            sa.Column("start_hour", sa.Time(), nullable=False),
+            sa.Column("end_hour", sa.Time(), nullable=False),
+            sa.Column("valid_from", sa.DateTime(), nullable=False),
+            sa.Column("valid_until", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_weeklytimeblock_id", "weeklytimeblock", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in [
+        "weeklytimeblock",
+        "review",
+        "reservation",
+        "privatelesson",
+        "user",
+        "course",
+    ]:
+        op.drop_table(table_name)
+    if op.get_bind().dialect.name == "postgresql":
+        for enum_name in [
+            "weekday", "reservationstatus", "offerstatus", "userrole"
+        ]:
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
@@ -0,0 +1,101 @@
+"""Add reservation.tutor_id and forbid overlapping accepted reservations
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+Databases created by `init_db()` after `Reservation.tutor_id` was added
+already have the column, and its constraints or triggers, so then this
+revision does nothing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    reservation_columns = {
+        column["name"]
+        for column in sa.inspect(bind).get_columns("reservation")
+    }
+    if "tutor_id" in reservation_columns:
+        return
+
+    op.add_column(
+        "reservation",
+        sa.Column("tutor_id", sa.Integer(), nullable=True)
+    )
+    op.execute(
+        "UPDATE reservation SET tutor_id = ("
+        "SELECT privatelesson.tutor_id FROM privatelesson "
+        "WHERE privatelesson.id = reservation.private_lesson_id"
+        ")"
+    )
+
+    if bind.dialect.name == "postgresql":
+        op.create_foreign_key(
+            "reservation_tutor_id_fkey",
+            "reservation", "user",
+            ["tutor_id"], ["id"],
+            ondelete="SET NULL"
+        )
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        # Fails if there already are overlapping accepted reservations,
+        # which must then be fixed by hand:
+        for column in ("tutor_id", "student_id"):
+            op.execute(
+                f"ALTER TABLE reservation "
+                f"ADD CONSTRAINT reservation_no_overlap_{column} "
+                f"EXCLUDE USING gist ("
+                f"{column} WITH =, "
+                f"tsrange(start_time, end_time, '[)') WITH &&"
+                f") WHERE (status = 'ACCEPTED')"
+            )
+    elif bind.dialect.name == "sqlite":
+        for operation, exclude_itself in (
+            ("INSERT", ""),
+            ("UPDATE", "AND id != NEW.id"),
+        ):
+            op.execute(
+                f"CREATE TRIGGER reservation_no_overlap_on_{operation.lower()} "
+                f"BEFORE {operation} ON reservation "
+                f"WHEN NEW.status = 'ACCEPTED' AND EXISTS ("
+                f"SELECT 1 FROM reservation "
+                f"WHERE status = 'ACCEPTED' {exclude_itself} "
+                f"AND start_time < NEW.end_time AND end_time > NEW.start_time "
+                f"AND (tutor_id = NEW.tutor_id OR student_id = NEW.student_id)"
+                f") "
+                f"BEGIN SELECT RAISE(ABORT, 'reservation_no_overlap'); "
+                f"END"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for column in ("tutor_id", "student_id"):
+            op.execute(
+                "ALTER TABLE reservation "
+                f"DROP CONSTRAINT IF EXISTS reservation_no_overlap_{column}"
+            )
+        op.drop_constraint(
+            "reservation_tutor_id_fkey", "reservation", type_="foreignkey"
+        )
+    elif bind.dialect.name == "sqlite":
+        for operation in ("insert", "update"):
+            op.execute(
+                f"DROP TRIGGER IF EXISTS reservation_no_overlap_on_{operation}"
+            )
+    with op.batch_alter_table("reservation") as batch_op:
+        batch_op.drop_column("tutor_id")
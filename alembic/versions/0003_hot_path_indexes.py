@@ -0,0 +1,83 @@
+"""Add composite and partial indexes for the hot query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+The same indexes are declared in the `__table_args__` of the models, so
+databases created by `init_db()` may already have them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, WHERE of a partial index):
+INDEXES = [
+    ("ix_privatelesson_tutor_id", "privatelesson", ["tutor_id"], None),
+    (
+        "ix_privatelesson_course_id_open",
+        "privatelesson",
+        ["course_id"],
+        "offer_status = 'OPEN'"
+    ),
+    (
+        "ix_reservation_student_id_status_start_time",
+        "reservation",
+        ["student_id", "status", "start_time"],
+        None
+    ),
+    (
+        "ix_reservation_private_lesson_id_status_start_time",
+        "reservation",
+        ["private_lesson_id", "status", "start_time"],
+        None
+    ),
+    (
+        "ix_reservation_start_time_id",
+        "reservation",
+        ["start_time", "id"],
+        None
+    ),
+    (
+        "ix_reservation_tutor_id_start_time_accepted",
+        "reservation",
+        ["tutor_id", "start_time"],
+        "status = 'ACCEPTED'"
+    ),
+    ("ix_review_reservation_id", "review", ["reservation_id"], None),
+    (
+        "ix_weeklytimeblock_user_id_weekday_valid_from_valid_until",
+        "weeklytimeblock",
+        ["user_id", "weekday", "valid_from", "valid_until"],
+        None
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table_name, columns, where in INDEXES:
+        where_options = {}
+        if where is not None:
+            where_options = {
+                "postgresql_where": sa.text(where),
+                "sqlite_where": sa.text(where),
+            }
+        op.create_index(
+            name, table_name, columns, if_not_exists=True, **where_options
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name, if_exists=True)
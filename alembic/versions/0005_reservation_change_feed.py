@@ -0,0 +1,97 @@
+"""Add reservation timestamps and tombstones for the change feed
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+Existing reservations get the time of the upgrade as `created_at` and
+`updated_at`. On SQLite, both columns stay nullable, because making them
+`NOT NULL` would rebuild the table and drop its overlap triggers.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = ["created_at", "updated_at"]
+
+# (name, table, columns):
+INDEXES = [
+    (
+        "ix_reservation_student_id_updated_at",
+        "reservation",
+        ["student_id", "updated_at"]
+    ),
+    (
+        "ix_reservation_tutor_id_updated_at",
+        "reservation",
+        ["tutor_id", "updated_at"]
+    ),
+    (
+        "ix_reservationtombstone_student_id_deleted_at",
+        "reservationtombstone",
+        ["student_id", "deleted_at"]
+    ),
+    (
+        "ix_reservationtombstone_tutor_id_deleted_at",
+        "reservationtombstone",
+        ["tutor_id", "deleted_at"]
+    ),
+    (
+        "ix_reservationtombstone_deleted_at",
+        "reservationtombstone",
+        ["deleted_at"]
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    reservation_columns = {
+        column["name"] for column in inspector.get_columns("reservation")
+    }
+    for column in TIMESTAMP_COLUMNS:
+        if column in reservation_columns:
+            continue
+        op.add_column(
+            "reservation",
+            sa.Column(column, sa.DateTime(), nullable=True)
+        )
+        op.execute(
+            f"UPDATE reservation SET {column} = CURRENT_TIMESTAMP"
+        )
+        if bind.dialect.name == "postgresql":
+            op.alter_column("reservation", column, nullable=False)
+
+    if not inspector.has_table("reservationtombstone"):
+        op.create_table(
+            "reservationtombstone",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("reservation_id", sa.Integer(), nullable=False),
+            sa.Column("student_id", sa.Integer(), nullable=True),
+            sa.Column("tutor_id", sa.Integer(), nullable=True),
+            sa.Column("deleted_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    for name, table_name, columns in INDEXES:
+        op.create_index(name, table_name, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name, if_exists=True)
+    op.drop_table("reservationtombstone")
+    for column in reversed(TIMESTAMP_COLUMNS):
+        op.drop_column("reservation", column)
@@ -0,0 +1,46 @@
+"""Add indexes for the calendars of students and tutors
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+Used by `GET /reservations/calendar`, which scans a range of `start_time`
+for a single student or tutor.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns):
+INDEXES = [
+    (
+        "ix_reservation_student_id_start_time",
+        "reservation",
+        ["student_id", "start_time"]
+    ),
+    (
+        "ix_reservation_tutor_id_start_time",
+        "reservation",
+        ["tutor_id", "start_time"]
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table_name, columns in INDEXES:
+        op.create_index(name, table_name, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name, if_exists=True)
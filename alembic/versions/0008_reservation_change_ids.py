@@ -0,0 +1,118 @@
+"""Order the reservation change feed by change IDs
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00.000000
+
+Reservations and their tombstones get a `change_id`, written by the
+database (see `app.database.current_change_id`), which replaces
+`updated_at` and `deleted_at` in the indexes of the change feed. Existing
+rows get 0, which sorts them before every new change. On SQLite, the
+columns stay nullable, because making them `NOT NULL` would rebuild the
+table and drop its overlap triggers.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ["reservation", "reservationtombstone"]
+
+# (name, table, columns):
+OLD_INDEXES = [
+    (
+        "ix_reservation_student_id_updated_at",
+        "reservation",
+        ["student_id", "updated_at"]
+    ),
+    (
+        "ix_reservation_tutor_id_updated_at",
+        "reservation",
+        ["tutor_id", "updated_at"]
+    ),
+    (
+        "ix_reservationtombstone_student_id_deleted_at",
+        "reservationtombstone",
+        ["student_id", "deleted_at"]
+    ),
+    (
+        "ix_reservationtombstone_tutor_id_deleted_at",
+        "reservationtombstone",
+        ["tutor_id", "deleted_at"]
+    ),
+    (
+        "ix_reservationtombstone_deleted_at",
+        "reservationtombstone",
+        ["deleted_at"]
+    ),
+]
+NEW_INDEXES = [
+    (
+        "ix_reservation_student_id_change_id",
+        "reservation",
+        ["student_id", "change_id"]
+    ),
+    (
+        "ix_reservation_tutor_id_change_id",
+        "reservation",
+        ["tutor_id", "change_id"]
+    ),
+    ("ix_reservation_change_id", "reservation", ["change_id"]),
+    (
+        "ix_reservationtombstone_student_id_change_id",
+        "reservationtombstone",
+        ["student_id", "change_id"]
+    ),
+    (
+        "ix_reservationtombstone_tutor_id_change_id",
+        "reservationtombstone",
+        ["tutor_id", "change_id"]
+    ),
+    (
+        "ix_reservationtombstone_change_id",
+        "reservationtombstone",
+        ["change_id"]
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table_name in TABLES:
+        columns = {
+            column["name"] for column in inspector.get_columns(table_name)
+        }
+        if "change_id" in columns:
+            continue
+        op.add_column(
+            table_name,
+            sa.Column("change_id", sa.BigInteger(), nullable=True)
+        )
+        op.execute(f"UPDATE {table_name} SET change_id = 0")
+        if bind.dialect.name == "postgresql":
+            op.alter_column(table_name, "change_id", nullable=False)
+
+    for name, table_name, _ in OLD_INDEXES:
+        op.drop_index(name, table_name=table_name, if_exists=True)
+    for name, table_name, columns in NEW_INDEXES:
+        op.create_index(name, table_name, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in reversed(NEW_INDEXES):
+        op.drop_index(name, table_name=table_name, if_exists=True)
+    for name, table_name, columns in OLD_INDEXES:
+        op.create_index(name, table_name, columns, if_not_exists=True)
+    for table_name in reversed(TABLES):
+        op.drop_column(table_name, "change_id")
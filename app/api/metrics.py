@@ -0,0 +1,23 @@
+from app.utilities.availability_calendar import availability_cache
+from app.utilities.idempotency_key_cleanup import idempotency_key_cleanup_job
+from app.utilities.reservation_expiry import reservation_expiry_job
+from fastapi import APIRouter
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    description=(
+        "Counters of the in-process caches and periodic jobs, for "
+        "monitoring. "
+        "Every worker process reports its own counters."
+    ),
+)
+async def read_metrics():
+    return {
+        "availability_cache": availability_cache.get_stats(),
+        "reservation_expiry": reservation_expiry_job.get_stats(),
+        "idempotency_key_cleanup": idempotency_key_cleanup_job.get_stats(),
+    }
@@ -0,0 +1,73 @@
+from app.auth.auth_bearer import JWTBearer
+from app.auth.auth_handler import decode_token
+from app.utilities.notifications import (
+    get_notification_broker,
+    get_seconds_until_expiry,
+    iterate_server_sent_events,
+)
+from fastapi import APIRouter, Depends, WebSocket
+from fastapi.responses import StreamingResponse
+from jose import JWTError
+import asyncio
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/notifications/stream",
+    dependencies=[Depends(JWTBearer())],
+    response_class=StreamingResponse,
+    description=(
+        "Server-sent events with the changes to your reservations, as "
+        "they happen. The stream ends with a `token.expired` event when "
+        "the token expires."
+    ),
+)
+async def stream_notifications(payload: dict = Depends(JWTBearer())):
+    user_id = payload.get("user_id") or payload.get("id")
+    return StreamingResponse(
+        iterate_server_sent_events(
+            user_id, expires_in_seconds=get_seconds_until_expiry(payload)
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/notifications/ws")
+async def notifications_websocket(websocket: WebSocket, token: str):
+    '''
+    Sends the changes to the reservations of the user as JSON messages.
+    Browsers can't set headers on WebSockets, so the JWT goes in `token`.
+    The connection is closed with code 1008 when the token expires.
+    '''
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        # 1008: policy violation.
+        await websocket.close(code=1008)
+        return
+    user_id = payload.get("user_id") or payload.get("id")
+    await websocket.accept()
+    async with get_notification_broker().subscribe(user_id) as subscription:
+
+        async def forward_notifications():
+            async for notification in subscription:
+                await websocket.send_json(notification)
+
+        async def wait_for_disconnect():
+            # Clients don't send anything, so this only waits until they
+            # disconnect:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        forwarding = asyncio.create_task(forward_notifications())
+        try:
+            await asyncio.wait_for(
+                wait_for_disconnect(), get_seconds_until_expiry(payload)
+            )
+        except asyncio.TimeoutError:
+            await websocket.close(code=1008)
+        finally:
+            forwarding.cancel()
@@ -2,12 +2,15 @@ from app.api.routes import get_db
 from app.auth.auth_bearer import JWTBearer
 from app.crud.private_lesson import PrivateLessonCRUD
 from app.schemas.private_lesson import (
+    AvailablePrivateLessonPage,
     PrivateLessonCreate,
     PrivateLessonExtendedOut,
     PrivateLessonOut,
     PrivateLessonPage,
     PrivateLessonUpdate,
 )
+from app.utilities.availability import AvailabilityService
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
@@ -74,6 +77,33 @@ async def search_private_lessons(
     )
 
 
+@router.get(
+    "/private-lessons/available",
+    response_model=AvailablePrivateLessonPage
+)
+async def search_available_private_lessons(
+    course_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db_session: AsyncSession = Depends(get_db)
+):
+    '''
+    Open lessons of a course whose tutor is free for the whole time window.
+    Instead of a `total`, pages tell whether there are more (`has_more`).
+    '''
+    if end_time <= start_time:
+        raise HTTPException(
+            status_code=400,
+            detail="`end_time` must be after `start_time`"
+        )
+    availability_service = AvailabilityService(db_session)
+    return await availability_service.get_private_lessons_available_on_datetime_range(
+        course_id, start_time, end_time, page, page_size
+    )
+
+
 @router.get(
     "/private-lessons/{lesson_id}",
     response_model=PrivateLessonExtendedOut
@@ -1,30 +1,145 @@
-from app.api.routes import get_db
+from app.api.routes import get_db, get_idempotent_request
 from app.auth.auth_bearer import JWTBearer
 from app.crud.reservation import (
     delete_reservation,
+    EXPORTED_RESERVATION_COLUMNS,
     get_all_reservations,
+    get_reservation_calendar,
+    get_reservation_changes,
     get_reservation_by_student_id,
     get_reservation_by_tutor_id,
     get_reservation_by_tutor_and_student,
+    stream_reservations,
     update_reservation_data_student,
     update_reservation_data_tutor,
+    update_reservation_statuses_of_tutor,
     validate_and_create_reservation,
+    validate_and_create_reservation_package,
 )
 from app.schemas.reservation import (
+    DEFAULT_RESERVATIONS_PER_PAGE,
+    MAX_CALENDAR_DAYS,
+    MAX_RESERVATIONS_PER_PAGE,
+    RESERVATION_FIELDS,
+    RESERVATION_INCLUDES,
+    ReservationCalendarEntry,
+    ReservationChanges,
     ReservationCreate,
-    ReservationExtendedOut,
+    ReservationFieldset,
     ReservationOut,
+    ReservationPackageCreate,
+    ReservationPageParams,
+    ReservationSparseOut,
     ReservationStatus,
+    ReservationStatusDecisions,
+    ReservationStatusDecisionsResult,
     ReservationUpdate,
 )
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from app.utilities.idempotency import IdempotentRequest
+from app.utilities.pagination import (
+    decode_cursor,
+    decode_change_cursor,
+    encode_cursor,
+    encode_change_cursor,
+)
+from app.utilities.reservation_export import (
+    encode_as_csv,
+    encode_as_ndjson,
+    EXPORT_MEDIA_TYPES,
+)
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
 
 
 router = APIRouter()
 
 
+def get_reservation_page_params(
+    cursor: str | None = Query(
+        None,
+        description=(
+            "The `X-Next-Cursor` header of the previous page; "
+            "omit it to get the first page."
+        )
+    ),
+    limit: int = Query(
+        DEFAULT_RESERVATIONS_PER_PAGE,
+        ge=1,
+        le=MAX_RESERVATIONS_PER_PAGE,
+        description=(
+            "Reservations per page. Lists are always paginated: without a "
+            "`cursor`, only the first page is returned, and the cursor of "
+            "the next one is sent in the `X-Next-Cursor` header."
+        )
+    ),
+    from_date: date | None = None,
+    to_date: date | None = None,
+    status: ReservationStatus | None = None,
+) -> ReservationPageParams:
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return ReservationPageParams(
+        after=after,
+        limit=limit,
+        from_date=from_date,
+        to_date=to_date,
+        status=status
+    )
+
+
+def get_reservation_fieldset(
+    fields: str | None = Query(
+        None,
+        description=(
+            "Comma-separated fields of each reservation to return, "
+            f"among: {', '.join(RESERVATION_FIELDS)}. Omit it to get all."
+        )
+    ),
+    include: str | None = Query(
+        None,
+        description=(
+            "Comma-separated related objects to return, "
+            f"among: {', '.join(RESERVATION_INCLUDES)}. Omit it to get all "
+            "of them, or none if `fields` is given."
+        )
+    ),
+) -> ReservationFieldset:
+    def split(names: str | None):
+        if names is None:
+            return None
+        return tuple(name.strip() for name in names.split(",") if name.strip())
+
+    try:
+        return ReservationFieldset(fields=split(fields), include=split(include))
+    except ValidationError as error:
+        raise HTTPException(
+            status_code=400,
+            detail=error.errors()[0]["msg"]
+        )
+
+
+def set_next_cursor_header(
+    response: Response,
+    reservations: list,
+    page_params: ReservationPageParams
+):
+    '''
+    A full page may be followed by more reservations, so its last one
+    becomes the cursor of the next page.
+    '''
+    if len(reservations) == page_params.limit:
+        last_reservation = reservations[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last_reservation.start_time, last_reservation.id
+        )
+
+
 # CREATE
 
 
@@ -32,13 +147,18 @@ router = APIRouter()
     "/reservations/lesson/{private_lesson_id}",
     dependencies=[Depends(JWTBearer())],
     response_model=ReservationOut,
+    description=(
+        "Send an `Idempotency-Key` header to retry safely: retries with "
+        "the same key get the response of the first request."
+    ),
 )
 async def post_reservation(
     private_lesson_id: int,
     start_time: datetime,
     end_time: datetime,
     db: AsyncSession = Depends(get_db),
-    jwt_payload: dict = Depends(JWTBearer())
+    jwt_payload: dict = Depends(JWTBearer()),
+    idempotent_request: IdempotentRequest = Depends(get_idempotent_request)
 ):
     user_id = jwt_payload.get("id") or jwt_payload.get("user_id")
     if jwt_payload["role"] != "student":
@@ -53,23 +173,187 @@ async def post_reservation(
         start_time=start_time,
         end_time=end_time
     )
-    return await validate_and_create_reservation(db, reservation_data)
+    return await idempotent_request.run(
+        lambda before_commit: validate_and_create_reservation(
+            db, reservation_data, before_commit
+        ),
+        ReservationOut
+    )
+
+
+@router.post(
+    "/reservations/lesson/{private_lesson_id}/package",
+    dependencies=[Depends(JWTBearer())],
+    response_model=list[ReservationOut],
+    description=(
+        "Create many pending reservations of the same lesson at once, "
+        "from either a list of intervals or a weekly (or every N days) "
+        "recurrence. Either all of them are created, or none."
+    ),
+)
+async def post_reservation_package(
+    private_lesson_id: int,
+    package: ReservationPackageCreate,
+    db: AsyncSession = Depends(get_db),
+    jwt_payload: dict = Depends(JWTBearer())
+):
+    user_id = jwt_payload.get("id") or jwt_payload.get("user_id")
+    if jwt_payload["role"] != "student":
+        raise HTTPException(
+            status_code=403,
+            detail="Only students can create reservations"
+        )
+    return await validate_and_create_reservation_package(
+        db, private_lesson_id, user_id, package.get_intervals()
+    )
 
 
 # READ
 
 
-@router.get("/reservations", response_model=list[ReservationExtendedOut])
-async def read_reservations(db: AsyncSession = Depends(get_db)):
-    return await get_all_reservations(db)
+@router.get(
+    "/reservations",
+    response_model=list[ReservationSparseOut],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(JWTBearer())],
+    description="Every reservation (only for admins), by pages."
+)
+async def read_reservations(
+    response: Response,
+    page_params: ReservationPageParams = Depends(get_reservation_page_params),
+    fieldset: ReservationFieldset = Depends(get_reservation_fieldset),
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(JWTBearer())
+):
+    if payload.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    reservations = await get_all_reservations(db, page_params, fieldset)
+    set_next_cursor_header(response, reservations, page_params)
+    return [fieldset.serialize(reservation) for reservation in reservations]
+
+
+@router.get(
+    "/reservations/calendar",
+    response_model=list[ReservationCalendarEntry],
+    dependencies=[Depends(JWTBearer())],
+    description=(
+        "Your reservations that start between `from` (included) and `to` "
+        f"(excluded), at most {MAX_CALENDAR_DAYS} days apart, without "
+        "related objects."
+    ),
+)
+async def read_reservation_calendar(
+    from_datetime: datetime = Query(alias="from"),
+    to_datetime: datetime = Query(alias="to"),
+    status: ReservationStatus | None = None,
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(JWTBearer())
+):
+    user_role = payload.get("role")
+    if user_role not in ["tutor", "student"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if to_datetime <= from_datetime:
+        raise HTTPException(
+            status_code=400,
+            detail="`to` must be after `from`"
+        )
+    if to_datetime - from_datetime > timedelta(days=MAX_CALENDAR_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"`from` and `to` must be at most {MAX_CALENDAR_DAYS} days apart"
+        )
+    user_id = payload.get("user_id") or payload.get("id")
+    return await get_reservation_calendar(
+        db, user_id, user_role, from_datetime, to_datetime, status
+    )
+
+
+@router.get(
+    "/reservations/changes",
+    response_model=ReservationChanges,
+    dependencies=[Depends(JWTBearer())],
+    description=(
+        "A page of your reservations created, updated or deleted since "
+        "`since`, which is the `cursor` of the previous response. Omit it "
+        "to start with every reservation of yours. Keep requesting pages "
+        "while `has_more` is true."
+    ),
+)
+async def read_reservation_changes(
+    since: str | None = None,
+    limit: int = Query(
+        DEFAULT_RESERVATIONS_PER_PAGE, ge=1, le=MAX_RESERVATIONS_PER_PAGE
+    ),
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(JWTBearer())
+):
+    user_role = payload.get("role")
+    if user_role not in ["tutor", "student", "admin"]:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    user_id = payload.get("user_id") or payload.get("id")
+    try:
+        position = (
+            decode_change_cursor(since, 4) if since is not None else None
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    reservations, tombstones, next_position, has_more = (
+        await get_reservation_changes(
+            db, user_id, user_role, position, limit
+        )
+    )
+    return ReservationChanges(
+        changed=reservations,
+        deleted=tombstones,
+        cursor=encode_change_cursor(next_position),
+        has_more=has_more
+    )
+
+
+@router.get(
+    "/reservations/export",
+    dependencies=[Depends(JWTBearer())],
+    response_class=StreamingResponse,
+    description=(
+        "Every reservation (only for admins), as NDJSON or CSV, written "
+        "while it's read from the database."
+    ),
+)
+async def export_reservations(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    from_date: date | None = None,
+    to_date: date | None = None,
+    status: ReservationStatus | None = None,
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(JWTBearer())
+):
+    if payload.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+    encode = encode_as_csv if format == "csv" else encode_as_ndjson
+    return StreamingResponse(
+        encode(
+            stream_reservations(db, from_date, to_date, status),
+            [column.key for column in EXPORTED_RESERVATION_COLUMNS]
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="reservations.{format}"'
+            )
+        }
+    )
 
 
 @router.get(
     "/reservations/student",
-    response_model=list[ReservationExtendedOut],
+    response_model=list[ReservationSparseOut],
+    response_model_exclude_unset=True,
     dependencies=[Depends(JWTBearer())]
 )
 async def read_students_reservations(
+    response: Response,
+    page_params: ReservationPageParams = Depends(get_reservation_page_params),
+    fieldset: ReservationFieldset = Depends(get_reservation_fieldset),
     db: AsyncSession = Depends(get_db),
     payload: dict = Depends(JWTBearer())
 ):
@@ -78,15 +362,23 @@ async def read_students_reservations(
     student_id = payload.get("user_id") or payload.get("id")
     if student_id is None:
         raise HTTPException(status_code=400, detail="Invalid token payload")
-    return await get_reservation_by_student_id(db, student_id)
+    reservations = await get_reservation_by_student_id(
+        db, student_id, page_params, fieldset
+    )
+    set_next_cursor_header(response, reservations, page_params)
+    return [fieldset.serialize(reservation) for reservation in reservations]
 
 
 @router.get(
     "/reservations/tutor",
-    response_model=list[ReservationExtendedOut],
+    response_model=list[ReservationSparseOut],
+    response_model_exclude_unset=True,
     dependencies=[Depends(JWTBearer())]
 )
 async def read_tutors_reservations(
+    response: Response,
+    page_params: ReservationPageParams = Depends(get_reservation_page_params),
+    fieldset: ReservationFieldset = Depends(get_reservation_fieldset),
     db: AsyncSession = Depends(get_db),
     payload: dict = Depends(JWTBearer())
 ):
@@ -95,17 +387,25 @@ async def read_tutors_reservations(
     tutor_id = payload.get("user_id") or payload.get("id")
     if tutor_id is None:
         raise HTTPException(status_code=400, detail="Invalid token payload")
-    return await get_reservation_by_tutor_id(db, tutor_id)
+    reservations = await get_reservation_by_tutor_id(
+        db, tutor_id, page_params, fieldset
+    )
+    set_next_cursor_header(response, reservations, page_params)
+    return [fieldset.serialize(reservation) for reservation in reservations]
 
 
 @router.get(
     "/reservations/tutor/{tutor_id}/student/{student_id}",
-    response_model=list[ReservationExtendedOut],
+    response_model=list[ReservationSparseOut],
+    response_model_exclude_unset=True,
     dependencies=[Depends(JWTBearer())]
 )
 async def read_reservation_by_tutor_and_student(
     tutor_id: int,
     student_id: int,
+    response: Response,
+    page_params: ReservationPageParams = Depends(get_reservation_page_params),
+    fieldset: ReservationFieldset = Depends(get_reservation_fieldset),
     db: AsyncSession = Depends(get_db),
     payload: dict = Depends(JWTBearer())
 ):
@@ -131,15 +431,45 @@ async def read_reservation_by_tutor_and_student(
         )
 
     reservations = await get_reservation_by_tutor_and_student(
-        db, tutor_id, student_id
+        db, tutor_id, student_id, page_params, fieldset
     )
+    set_next_cursor_header(response, reservations, page_params)
 
-    return reservations
+    return [fieldset.serialize(reservation) for reservation in reservations]
 
 
 # UPDATE
 
 
+@router.patch(
+    "/reservations/tutor",
+    response_model=ReservationStatusDecisionsResult,
+    dependencies=[Depends(JWTBearer())],
+    description=(
+        "Accept and reject many reservations of your lessons at once. "
+        "Every pending reservation of yours that overlaps an accepted one "
+        "is rejected too, and returned in `auto_rejected`."
+    ),
+)
+async def update_reservation_statuses_tutor(
+    decisions: ReservationStatusDecisions,
+    db: AsyncSession = Depends(get_db),
+    tutor: dict = Depends(JWTBearer())
+):
+    if tutor["role"] != "tutor":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    user_id = tutor.get("user_id") or tutor.get("id")
+
+    updated, auto_rejected = await update_reservation_statuses_of_tutor(
+        db, user_id, decisions
+    )
+    return ReservationStatusDecisionsResult(
+        updated=updated,
+        auto_rejected=auto_rejected
+    )
+
+
 @router.patch(
     "/reservations/tutor/{reservation_id}",
     response_model=ReservationOut,
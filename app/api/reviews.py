@@ -1,4 +1,4 @@
-from app.api.routes import get_db
+from app.api.routes import get_db, get_idempotent_request
 from app.auth.auth_bearer import JWTBearer
 from app.crud.review import (
     create_review,
@@ -12,6 +12,7 @@ from app.crud.review import (
     update_review,
 )
 from app.schemas.review import ReviewCreate, ReviewOut, ReviewUpdate
+from app.utilities.idempotency import IdempotentRequest
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
@@ -30,6 +31,7 @@ async def post_review(
     review: ReviewCreate,
     db_session: AsyncSession = Depends(get_db),
     jwt_payload: dict = Depends(JWTBearer()),
+    idempotent_request: IdempotentRequest = Depends(get_idempotent_request),
 ):
     """Crear una nueva review"""
     # Solo estudiantes pueden crear reviews
@@ -39,7 +41,13 @@ async def post_review(
             detail="Only students can create reviews"
         )
     
-    return await create_review(db_session, review)
+    return await idempotent_request.run(
+        lambda before_commit: create_review(
+            db_session, review, before_commit
+        ),
+        ReviewOut,
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 # READ
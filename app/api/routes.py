@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.auth_bearer import JWTBearer
 from app.database import SessionLocal
 from app.schemas.user import UserCreate, UserLogin, UserOut
 from app.crud.user import create_user, get_user_by_email
 from app.auth.auth_handler import verify_password, create_access_token
+from app.utilities.idempotency import (
+    IdempotentRequest,
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+)
 
 
 router = APIRouter()
@@ -14,6 +19,18 @@ async def get_db():
         yield session
 
 
+async def get_idempotent_request(
+    request: Request,
+    idempotency_key: str | None = Header(
+        None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH
+    ),
+    db: AsyncSession = Depends(get_db),
+    jwt_payload: dict = Depends(JWTBearer())
+) -> IdempotentRequest:
+    user_id = jwt_payload.get("id") or jwt_payload.get("user_id")
+    return IdempotentRequest(db, request, user_id, idempotency_key)
+
+
 @router.post("/register", response_model=UserOut)
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     db_user = await get_user_by_email(db, user.email)
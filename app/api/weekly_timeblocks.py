@@ -1,24 +1,44 @@
 from app.api.routes import get_db
 from app.auth.auth_bearer import JWTBearer
-from app.crud.user import UserCRUD
 from app.crud.weekly_timeblocks import (
     create_weekly_timeblock,
     read_weekly_timeblocks_of_user,
     remove_weekly_timeblock_that_belongs_to_user
 )
+from app.schemas.availability import BookableSlot, UserAvailability
 from app.schemas.single_timeblock import SingleTimeblock
 from app.schemas.weekly_timeblock import (
     WeeklyTimeblockCreate,
     WeeklyTimeblockOut
 )
 from app.utilities.availability import AvailabilityService
-from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter()
 
+MAX_AVAILABILITY_RANGE_DAYS = 92
+MAX_USERS_PER_AVAILABILITY_BATCH = 100
+
+
+def validate_availability_range(from_date: date, to_date: date):
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=400,
+            detail="`to_date` must not be before `from_date`"
+        )
+    if to_date - from_date >= timedelta(days=MAX_AVAILABILITY_RANGE_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "The range can't be longer than "
+                f"{MAX_AVAILABILITY_RANGE_DAYS} days"
+            )
+        )
+
 
 # CREATE
 
@@ -73,16 +93,130 @@ async def get_available_single_timeblocks_of_user(
     on_date: date,
     db_session: AsyncSession = Depends(get_db),
 ):
-    user_crud = UserCRUD(db_session)
-    if not await user_crud.exists(user_id):
+    availability_service = AvailabilityService(db_session)
+    blocks = await availability_service.get_available_single_timeblocks_of_user(
+        user_id=user_id,
+        on_date=on_date
+    )
+    if blocks is None:
         raise HTTPException(
             status_code=404,
             detail=f"User with ID {user_id} not found"
         )
+    return blocks
+
+
+@router.get(
+    "/timeblocks",
+    description=(
+        "Get the individual, available timeblocks of many users at once, "
+        "for every date between `from_date` and `to_date` (both included). "
+        "If `to_date` is not provided, only `from_date` is considered."
+    ),
+    response_model=list[UserAvailability]
+)
+async def get_available_single_timeblocks_of_users(
+    from_date: date,
+    to_date: date = None,
+    user_ids: list[int] = Query(...),
+    db_session: AsyncSession = Depends(get_db),
+):
+    to_date = to_date or from_date
+    validate_availability_range(from_date, to_date)
+    if len(set(user_ids)) > MAX_USERS_PER_AVAILABILITY_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "No more than "
+                f"{MAX_USERS_PER_AVAILABILITY_BATCH} users can be requested"
+            )
+        )
+    availability_service = AvailabilityService(db_session)
+    availabilities = (
+        await availability_service.get_daily_availabilities_of_users(
+            user_ids=user_ids,
+            from_date=from_date,
+            to_date=to_date
+        )
+    )
+    missing_user_ids = set(user_ids) - {
+        availability.user_id for availability in availabilities
+    }
+    if missing_user_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Users with IDs {sorted(missing_user_ids)} not found"
+        )
+    return availabilities
+
+
+@router.get(
+    "/timeblocks/{user_id}/slots",
+    description=(
+        "Get the start and end times at which a reservation of "
+        "`duration_minutes` could be booked with the user on `on_date`. "
+        "Slots start every `step_minutes`, counted from midnight."
+    ),
+    response_model=list[BookableSlot]
+)
+async def get_bookable_slots_of_user(
+    user_id: int,
+    on_date: date,
+    duration_minutes: int = Query(60, ge=1, le=24 * 60),
+    step_minutes: int = Query(15, ge=1, le=24 * 60),
+    db_session: AsyncSession = Depends(get_db),
+):
     availability_service = AvailabilityService(db_session)
-    return await availability_service.get_available_single_timeblocks_of_user(
+    slots = await availability_service.get_bookable_slots_of_user(
         user_id=user_id,
-        on_date=on_date
+        on_date=on_date,
+        duration=timedelta(minutes=duration_minutes),
+        step=timedelta(minutes=step_minutes)
+    )
+    if slots is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"User with ID {user_id} not found"
+        )
+    return slots
+
+
+@router.get(
+    "/timeblocks/{user_id}/range",
+    description=(
+        "Get the individual, available timeblocks of a user "
+        "for every date between `from_date` and `to_date` (both included). "
+        "The response is streamed as NDJSON: one line per date, "
+        "with the `on_date` and its `timeblocks`."
+    ),
+    response_class=StreamingResponse,
+)
+async def get_available_single_timeblocks_of_user_between(
+    user_id: int,
+    from_date: date,
+    to_date: date,
+    db_session: AsyncSession = Depends(get_db),
+):
+    validate_availability_range(from_date, to_date)
+    availability_service = AvailabilityService(db_session)
+    daily_availabilities = (
+        await availability_service.get_daily_availabilities_of_user(
+            user_id=user_id,
+            from_date=from_date,
+            to_date=to_date
+        )
+    )
+    if daily_availabilities is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"User with ID {user_id} not found"
+        )
+    return StreamingResponse(
+        (
+            daily_availability.model_dump_json() + "\n"
+            for daily_availability in daily_availabilities
+        ),
+        media_type="application/x-ndjson"
     )
 
 
@@ -0,0 +1,102 @@
+from app.models.idempotency_key import IdempotencyKey
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def claim_idempotency_key(
+    db: AsyncSession,
+    user_id: int,
+    key: str,
+    fingerprint: str,
+    now: datetime,
+    ttl: timedelta,
+    abandoned_after: timedelta
+) -> tuple[IdempotencyKey | None, bool]:
+    '''
+    Inserts the key of the user, unless it's already there. Returns the row
+    and whether this call inserted it, or `(None, False)` if the row
+    vanished in between. Expired rows, and rows of requests that have been
+    running for longer than `abandoned_after` (their worker likely died),
+    are replaced.
+    '''
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            or_(
+                IdempotencyKey.expires_at <= now,
+                and_(
+                    IdempotencyKey.status_code.is_(None),
+                    IdempotencyKey.created_at <= now - abandoned_after
+                )
+            )
+        )
+    )
+    idempotency_key = IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        fingerprint=fingerprint,
+        created_at=now,
+        expires_at=now + ttl
+    )
+    db.add(idempotency_key)
+    try:
+        await db.commit()
+        return idempotency_key, True
+    except IntegrityError:
+        await db.rollback()
+    existing_idempotency_key = await db.scalar(
+        select(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    )
+    return existing_idempotency_key, False
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    idempotency_key_id: int,
+    status_code: int,
+    response_body: str
+):
+    '''
+    Stores the response in the transaction of the request, without
+    committing it: the request commits both at once. A response that is
+    already stored is kept.
+    '''
+    await db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.id == idempotency_key_id,
+            IdempotencyKey.status_code.is_(None)
+        )
+        .values(status_code=status_code, response_body=response_body)
+    )
+
+
+async def release_idempotency_key(db: AsyncSession, idempotency_key_id: int):
+    '''
+    Deletes the key of a failed request, so that it can be retried, unless
+    its response was committed before the failure.
+    '''
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(
+            IdempotencyKey.id == idempotency_key_id,
+            IdempotencyKey.status_code.is_(None)
+        )
+    )
+    await db.commit()
+
+
+async def delete_expired_idempotency_keys(
+    db: AsyncSession,
+    now: datetime
+) -> int:
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+    )
+    await db.commit()
+    return result.rowcount
@@ -94,7 +94,7 @@ async def get_filtered_private_lessons_paginated(
     if tutor_id is not None:
         filters.append(PrivateLesson.tutor_id == tutor_id)
     if not include_closed_lessons:
-        filters.append(PrivateLesson.offer_status != OfferStatus.CLOSED)
+        filters.append(PrivateLesson.offer_status == OfferStatus.OPEN)
 
     query = select(PrivateLesson).options(
         *PrivateLesson.get_eager_loading_options(course=True, tutor=True)
@@ -1,25 +1,77 @@
 from app.crud.private_lesson import get_private_lesson_by_id
+from app.crud.user import get_users_by_ids
+from app.crud.weekly_timeblocks import read_weekly_timeblocks_of_user
+from app.database import change_horizon
 from app.models.private_lesson import PrivateLesson
-from app.models.reservation import Reservation
+from app.models.reservation import (
+    Reservation,
+    RESERVATION_OVERLAP_ERROR_MARKER,
+)
+from app.models.reservation_tombstone import ReservationTombstone
 from app.schemas.private_lesson import OfferStatus
-from app.schemas.reservation import ReservationCreate, ReservationUpdate
+from app.schemas.reservation import (
+    DEFAULT_RESERVATIONS_PER_PAGE,
+    ReservationCalendarEntry,
+    ReservationCreate,
+    ReservationFieldset,
+    ReservationInterval,
+    ReservationPageParams,
+    ReservationStatus,
+    ReservationStatusDecisions,
+    ReservationUpdate,
+)
 from app.utilities.availability import AvailabilityService
+from app.utilities.availability_hooks import (
+    on_reservation_changed,
+    on_reservation_removed,
+)
+from app.utilities.idempotency import BeforeCommit
+from app.utilities.intervals import (
+    does_interval_overlap_merged_intervals,
+    merge_intervals,
+)
+from app.utilities.locks import (
+    lock_schedule_of_user,
+    lock_schedules_of_users,
+    RESERVATION_EXPIRY_JOB_ID,
+    try_lock_job,
+)
+from app.utilities.notifications import notify_reservation_event
+from app.utilities.weekly_timeblocks import (
+    are_start_time_and_end_time_inside_connected_timeblocks,
+)
+from contextlib import nullcontext
+from datetime import date, datetime, time, timedelta
 from fastapi import HTTPException
+from sqlalchemy import and_, case, delete, insert, literal, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, load_only
 
 
-async def validate_reservation(
+async def get_existing_private_lesson(
     db_session: AsyncSession,
-    reservation_data: ReservationCreate
-):
-    # Validate that private lesson exists:
-    private_lesson = await get_private_lesson_by_id(db_session, reservation_data.private_lesson_id)
+    private_lesson_id: int
+) -> PrivateLesson:
+    private_lesson = await get_private_lesson_by_id(db_session, private_lesson_id)
     if not private_lesson:
         raise HTTPException(
             status_code=404,
-            detail=f"Private lesson with ID {reservation_data.private_lesson_id} not found"
+            detail=f"Private lesson with ID {private_lesson_id} not found"
+        )
+    return private_lesson
+
+
+async def validate_reservation(
+    db_session: AsyncSession,
+    reservation_data: ReservationCreate,
+    private_lesson: PrivateLesson | None = None
+):
+    # Validate that private lesson exists:
+    if private_lesson is None:
+        private_lesson = await get_existing_private_lesson(
+            db_session, reservation_data.private_lesson_id
         )
 
     # Validate that the private lesson is not closed:
@@ -73,112 +125,671 @@ async def validate_reservation(
     #     )
 
 
-async def create_reservation(db: AsyncSession, reservation_data: ReservationCreate):
-    reservation = Reservation(**reservation_data.model_dump())
+async def commit_reservation_changes(db: AsyncSession):
+    '''
+    Commits, turning the database's rejection of overlapping accepted
+    reservations into a 409.
+    '''
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        raise_for_overlap_error(error)
+
+
+async def flush_reservation_changes(db: AsyncSession):
+    '''
+    Same as `commit_reservation_changes()`, without committing.
+    '''
+    try:
+        await db.flush()
+    except IntegrityError as error:
+        await db.rollback()
+        raise_for_overlap_error(error)
+
+
+def raise_for_overlap_error(error: IntegrityError):
+    if RESERVATION_OVERLAP_ERROR_MARKER in str(error.orig):
+        raise HTTPException(
+            status_code=409,
+            detail="The reservation overlaps an accepted reservation"
+        )
+    raise error
+
+
+async def create_reservation(
+    db: AsyncSession,
+    reservation_data: ReservationCreate,
+    before_commit: BeforeCommit | None = None
+):
+    reservation = Reservation(
+        **reservation_data.model_dump(),
+        tutor_id=(
+            select(PrivateLesson.tutor_id)
+            .where(PrivateLesson.id == reservation_data.private_lesson_id)
+            .scalar_subquery()
+        )
+    )
     db.add(reservation)
-    await db.commit()
+    if before_commit is not None:
+        await flush_reservation_changes(db)
+        await db.refresh(reservation)
+        await before_commit(reservation)
+    await commit_reservation_changes(db)
     await db.refresh(reservation)
+    if reservation.status == ReservationStatus.ACCEPTED:
+        private_lesson = await db.get(
+            PrivateLesson, reservation.private_lesson_id
+        )
+        on_reservation_changed(
+            reservation, private_lesson.tutor_id if private_lesson else None
+        )
+    await notify_reservation_event(reservation, "created")
     return reservation
 
 
 async def validate_and_create_reservation(
     db_session: AsyncSession,
-    reservation_data: ReservationCreate
+    reservation_data: ReservationCreate,
+    before_commit: BeforeCommit | None = None
 ):
-    await validate_reservation(db_session, reservation_data)
-    reservation = await create_reservation(db_session, reservation_data)
+    '''
+    Holds the schedule lock of the tutor from the validation until the
+    commit, so that concurrent bookings of the same tutor can't both pass
+    the validation before either of them is inserted.
+    '''
+    private_lesson = await get_existing_private_lesson(
+        db_session, reservation_data.private_lesson_id
+    )
+    async with lock_schedule_of_user(db_session, private_lesson.tutor_id):
+        await validate_reservation(
+            db_session, reservation_data, private_lesson
+        )
+        reservation = await create_reservation(
+            db_session, reservation_data, before_commit
+        )
     return reservation
 
 
-async def get_all_reservations(db: AsyncSession):
+async def validate_reservation_package(
+    db_session: AsyncSession,
+    private_lesson: PrivateLesson,
+    student_id: int,
+    intervals: list[ReservationInterval]
+):
+    '''
+    Same rules as `validate_reservation()`, applied to every interval of a
+    package at once: the tutor's timeblocks and the accepted reservations of
+    both users are read once for the whole package.
+    '''
+    if private_lesson.offer_status == OfferStatus.CLOSED:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot create reservation for a closed private lesson"
+        )
+
+    # Validate that the intervals are valid and don't overlap each other:
+    sorted_intervals = sorted(intervals, key=lambda i: i.start_time)
+    for previous, interval in zip([None] + sorted_intervals, sorted_intervals):
+        if interval.end_time <= interval.start_time:
+            raise HTTPException(
+                status_code=400,
+                detail=f"The reservation at {interval.start_time} ends before it starts"
+            )
+        if previous is not None and previous.end_time > interval.start_time:
+            raise HTTPException(
+                status_code=400,
+                detail=f"The reservations at {previous.start_time} and {interval.start_time} overlap"
+            )
+
+    # Validate that the tutor has timeblocks for every interval:
+    weekly_timeblocks = await read_weekly_timeblocks_of_user(
+        db_session, private_lesson.tutor_id
+    )
+    for interval in sorted_intervals:
+        if not are_start_time_and_end_time_inside_connected_timeblocks(
+            interval.start_time,
+            interval.end_time,
+            weekly_timeblocks
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Tutor is not available at {interval.start_time}"
+            )
+
+    # Validate that neither the tutor nor the student have accepted
+    # reservations during any interval, with a single query for both:
+    availability_service = AvailabilityService(db_session)
+    users = await get_users_by_ids(
+        db_session, [private_lesson.tutor_id, student_id]
+    )
+    busy_intervals_by_user = (
+        await availability_service.read_busy_intervals_of_users(
+            users,
+            sorted_intervals[0].start_time,
+            max(interval.end_time for interval in sorted_intervals)
+        )
+    )
+    for user_id, detail in [
+        (private_lesson.tutor_id, "Tutor is not available at {}"),
+        (student_id, "You already have an accepted reservation at {}"),
+    ]:
+        merged_busy_intervals = merge_intervals(busy_intervals_by_user[user_id])
+        for interval in sorted_intervals:
+            if does_interval_overlap_merged_intervals(
+                interval.start_time,
+                interval.end_time,
+                merged_busy_intervals
+            ):
+                raise HTTPException(
+                    status_code=400,
+                    detail=detail.format(interval.start_time)
+                )
+
+
+async def validate_and_create_reservation_package(
+    db_session: AsyncSession,
+    private_lesson_id: int,
+    student_id: int,
+    intervals: list[ReservationInterval]
+):
+    '''
+    Validates the whole package, and then inserts all of its reservations
+    with a single multi-row `INSERT` in a single transaction, holding the
+    schedule lock of the tutor (see `validate_and_create_reservation()`).
+    '''
+    private_lesson = await get_existing_private_lesson(
+        db_session, private_lesson_id
+    )
+    async with lock_schedule_of_user(db_session, private_lesson.tutor_id):
+        await validate_reservation_package(
+            db_session, private_lesson, student_id, intervals
+        )
+        result = await db_session.scalars(
+            insert(Reservation).returning(Reservation),
+            [
+                {
+                    "private_lesson_id": private_lesson_id,
+                    "student_id": student_id,
+                    "tutor_id": private_lesson.tutor_id,
+                    "status": ReservationStatus.PENDING,
+                    "start_time": interval.start_time,
+                    "end_time": interval.end_time,
+                }
+                for interval in intervals
+            ]
+        )
+        reservations = result.all()
+        await commit_reservation_changes(db_session)
+    for reservation in reservations:
+        await notify_reservation_event(reservation, "created")
+    return reservations
+
+
+def get_reservation_loading_options(
+    fieldset: ReservationFieldset | None = None
+):
+    '''
+    Loads only the columns and the related objects of the fieldset (all of
+    them without one).
+    '''
+    if fieldset is None or fieldset.is_complete():
+        return Reservation.get_eager_loading_options()
+    return [
+        load_only(*(
+            getattr(Reservation, field)
+            for field in fieldset.get_loaded_fields()
+        )),
+        *Reservation.get_eager_loading_options(
+            include=fieldset.get_include()
+        ),
+    ]
+
+
+def apply_reservation_filters(
+    query,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    status: ReservationStatus | None = None
+):
+    '''
+    Filters a query of reservations by status and by the date of
+    `start_time` (both dates included).
+    '''
+    if from_date is not None:
+        query = query.where(
+            Reservation.start_time >= datetime.combine(from_date, time.min)
+        )
+    if to_date is not None:
+        query = query.where(
+            Reservation.start_time < datetime.combine(
+                to_date + timedelta(days=1), time.min
+            )
+        )
+    if status is not None:
+        query = query.where(Reservation.status == status)
+    return query
+
+
+def apply_reservation_page_params(
+    query,
+    page_params: ReservationPageParams | None
+):
+    '''
+    Adds the filters, order and limit of a page to a query of reservations.
+    Without `page_params`, the query is returned unchanged.
+    '''
+    if page_params is None:
+        return query
+    if page_params.after is not None:
+        after_start_time, after_id = page_params.after
+        query = query.where(or_(
+            Reservation.start_time > after_start_time,
+            and_(
+                Reservation.start_time == after_start_time,
+                Reservation.id > after_id
+            )
+        ))
+    query = apply_reservation_filters(
+        query, page_params.from_date, page_params.to_date, page_params.status
+    )
+    return query.order_by(
+        Reservation.start_time, Reservation.id
+    ).limit(page_params.limit)
+
+
+async def get_all_reservations(
+    db: AsyncSession,
+    page_params: ReservationPageParams | None = None,
+    fieldset: ReservationFieldset | None = None
+):
     query = (
         select(Reservation)
-        .options(
-            selectinload(Reservation.student),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.course),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.tutor),
-        )
+        .options(*get_reservation_loading_options(fieldset))
     )
+    query = apply_reservation_page_params(query, page_params)
     result = await db.execute(query)
     return result.scalars().all()
 
+EXPORTED_RESERVATION_COLUMNS = (
+    Reservation.id,
+    Reservation.private_lesson_id,
+    Reservation.student_id,
+    Reservation.tutor_id,
+    Reservation.status,
+    Reservation.start_time,
+    Reservation.end_time,
+)
+
+
+async def stream_reservations(
+    db: AsyncSession,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    status: ReservationStatus | None = None,
+    batch_size: int = 1000
+):
+    '''
+    Yields the rows of `EXPORTED_RESERVATION_COLUMNS` of the reservations,
+    ordered like the pages, in lists of at most `batch_size`. The rows are
+    read through a server-side cursor, so memory doesn't grow with the
+    number of reservations.
+    '''
+    query = apply_reservation_filters(
+        select(*EXPORTED_RESERVATION_COLUMNS), from_date, to_date, status
+    )
+    result = await db.stream(
+        query
+        .order_by(Reservation.start_time, Reservation.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions():
+        yield rows
+
+
+async def get_reservation_calendar(
+    db: AsyncSession,
+    user_id: int,
+    user_role: str,
+    from_datetime: datetime,
+    to_datetime: datetime,
+    status: ReservationStatus | None = None
+):
+    '''
+    Rows of the `ReservationCalendarEntry` columns of the reservations of the
+    user that start in `[from_datetime, to_datetime)`, ordered by start. It
+    reads the columns directly, with a range scan on the
+    `(student_id | tutor_id, start_time)` index.
+    '''
+    if user_role == "student":
+        user_column = Reservation.student_id
+    elif user_role == "tutor":
+        user_column = Reservation.tutor_id
+    else:
+        return []
+    query = (
+        select(*(
+            getattr(Reservation, field)
+            for field in ReservationCalendarEntry.model_fields
+        ))
+        .where(
+            user_column == user_id,
+            Reservation.start_time >= from_datetime,
+            Reservation.start_time < to_datetime
+        )
+        .order_by(Reservation.start_time)
+    )
+    if status is not None:
+        query = query.where(Reservation.status == status)
+    return (await db.execute(query)).all()
+
+
+# Kinds of rows of the change feed, in the order in which they are sent when
+# they have the same change ID:
+CHANGED_RESERVATION = 0
+DELETED_RESERVATION = 1
+
+
+def select_changes_after(
+    model,
+    kind: int,
+    position: tuple[int, int, int, int],
+    horizon: int,
+    filters: list,
+    limit: int
+):
+    '''
+    The rows of the `model` of the `kind` that come after `position` in the
+    order `(change_id, kind, id)`, below the `horizon`.
+    '''
+    change_id, position_kind, id, _ = position
+    if kind < position_kind:
+        is_after_position = model.change_id > change_id
+    elif kind > position_kind:
+        is_after_position = model.change_id >= change_id
+    else:
+        is_after_position = or_(
+            model.change_id > change_id,
+            and_(model.change_id == change_id, model.id > id)
+        )
+    return (
+        select(model)
+        .where(*filters, is_after_position, model.change_id < horizon)
+        .order_by(model.change_id, model.id)
+        .limit(limit)
+    )
+
+
+async def get_reservation_changes(
+    db: AsyncSession,
+    user_id: int,
+    user_role: str,
+    position: tuple[int, int, int, int] | None = None,
+    limit: int = DEFAULT_RESERVATIONS_PER_PAGE
+) -> tuple[
+    list[Reservation],
+    list[ReservationTombstone],
+    tuple[int, int, int, int],
+    bool
+]:
+    '''
+    A page of the change feed of the user (of every reservation, for
+    admins): the reservations created or updated after `position`, and the
+    tombstones of the ones deleted after it, in the order of their change
+    IDs. Without `position`, the feed starts with every reservation, and
+    only the deletions made from then on. Also returns the position of the
+    end of the page, and whether there are more changes after it.
+
+    The position is `(change_id, kind, id, tombstones_from)`. Only the
+    changes below `change_horizon()` are read, so a transaction that
+    commits late can't leave its changes behind the position.
+    '''
+    horizon = await db.scalar(select(change_horizon()))
+    if position is None:
+        position = (-1, DELETED_RESERVATION, 0, horizon)
+    tombstones_from = position[3]
+    if user_role == "student":
+        reservation_filters = [Reservation.student_id == user_id]
+        tombstone_filters = [ReservationTombstone.student_id == user_id]
+    elif user_role == "tutor":
+        reservation_filters = [Reservation.tutor_id == user_id]
+        tombstone_filters = [ReservationTombstone.tutor_id == user_id]
+    else:
+        reservation_filters = []
+        tombstone_filters = []
+    tombstone_filters.append(
+        ReservationTombstone.change_id >= tombstones_from
+    )
+    # One more than the limit of each, to know whether there are more:
+    reservations = (await db.scalars(select_changes_after(
+        Reservation,
+        CHANGED_RESERVATION,
+        position,
+        horizon,
+        reservation_filters,
+        limit + 1
+    ))).all()
+    tombstones = (await db.scalars(select_changes_after(
+        ReservationTombstone,
+        DELETED_RESERVATION,
+        position,
+        horizon,
+        tombstone_filters,
+        limit + 1
+    ))).all()
+    changes = sorted(
+        [
+            (reservation.change_id, CHANGED_RESERVATION, reservation.id)
+            for reservation in reservations
+        ] + [
+            (tombstone.change_id, DELETED_RESERVATION, tombstone.id)
+            for tombstone in tombstones
+        ]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        position = (*changes[-1], tombstones_from)
+    sent_ids = {(kind, id) for _, kind, id in changes}
+    return (
+        [
+            reservation for reservation in reservations
+            if (CHANGED_RESERVATION, reservation.id) in sent_ids
+        ],
+        [
+            tombstone for tombstone in tombstones
+            if (DELETED_RESERVATION, tombstone.id) in sent_ids
+        ],
+        position,
+        has_more
+    )
+
+
 async def get_reservation_by_id(db: AsyncSession, reservation_id: int):
     result = await db.execute(
         select(Reservation).where(Reservation.id == reservation_id)
-        .options(
-            selectinload(Reservation.student),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.course),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.tutor),
-        )
+        .options(*Reservation.get_eager_loading_options())
     )
     return result.scalar_one_or_none()
 
-async def get_reservation_by_student_id(db: AsyncSession, student_id: int):
+async def get_reservation_by_student_id(
+    db: AsyncSession,
+    student_id: int,
+    page_params: ReservationPageParams | None = None,
+    fieldset: ReservationFieldset | None = None
+):
     query = (
         select(Reservation)
         .where(Reservation.student_id == student_id)
-        .options(
-            selectinload(Reservation.student),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.course),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.tutor),
-        )
+        .options(*get_reservation_loading_options(fieldset))
     )
+    query = apply_reservation_page_params(query, page_params)
     result = await db.execute(query)
     return result.scalars().all()
 
-async def get_reservation_by_tutor_id(db: AsyncSession, tutor_id: int):
-    lesson_ids = (
-        await db.execute(
-            select(PrivateLesson.id).where(PrivateLesson.tutor_id == tutor_id)
-        )
-    ).scalars().all()
-
+async def get_reservation_by_tutor_id(
+    db: AsyncSession,
+    tutor_id: int,
+    page_params: ReservationPageParams | None = None,
+    fieldset: ReservationFieldset | None = None
+):
     query = (
         select(Reservation)
-        .where(Reservation.private_lesson_id.in_(lesson_ids))
-        .options(
-            selectinload(Reservation.student),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.course),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.tutor),
-        )
+        .where(Reservation.tutor_id == tutor_id)
+        .options(*get_reservation_loading_options(fieldset))
     )
+    query = apply_reservation_page_params(query, page_params)
     result = await db.execute(query)
     return result.scalars().all()
 
 
-async def get_reservation_by_tutor_and_student(db: AsyncSession, tutor_id: int, student_id: int):
+async def get_reservation_by_tutor_and_student(
+    db: AsyncSession,
+    tutor_id: int,
+    student_id: int,
+    page_params: ReservationPageParams | None = None,
+    fieldset: ReservationFieldset | None = None
+):
     """Obtener una reserva específica entre un tutor y un estudiante"""
     query = (
         select(Reservation)
-        .join(PrivateLesson, Reservation.private_lesson_id == PrivateLesson.id)
         .where(
-            PrivateLesson.tutor_id == tutor_id,
+            Reservation.tutor_id == tutor_id,
             Reservation.student_id == student_id
         )
-        .options(
-            selectinload(Reservation.student),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.course),
-            selectinload(Reservation.private_lesson).joinedload(PrivateLesson.tutor),
-        )
+        .options(*get_reservation_loading_options(fieldset))
     )
+    query = apply_reservation_page_params(query, page_params)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+async def update_reservation_if(
+    db: AsyncSession,
+    reservation_id: int,
+    conditions: list,
+    values: dict
+) -> Reservation | None:
+    '''
+    Updates the reservation with a single `UPDATE ... WHERE ... RETURNING`
+    and commits, but only if it meets every condition. Returns `None` (and
+    changes nothing) if it doesn't exist or doesn't meet them.
+    '''
+    try:
+        reservation = (await db.scalars(
+            update(Reservation)
+            .where(Reservation.id == reservation_id, *conditions)
+            .values(**values)
+            .returning(Reservation)
+            .execution_options(synchronize_session=False)
+        )).one_or_none()
+    except IntegrityError as error:
+        await db.rollback()
+        raise_for_overlap_error(error)
+    if reservation is None:
+        await db.rollback()
+        return None
+    # Keep the returned values, instead of expiring them on commit:
+    db.expunge(reservation)
+    await commit_reservation_changes(db)
+    return reservation
+
+
+async def get_owners_of_reservation(db: AsyncSession, reservation_id: int):
+    '''
+    The student, the tutor and the lesson of the reservation, as a row, or
+    `None` if it doesn't exist. Only used to explain why an update failed.
+    '''
+    result = await db.execute(
+        select(
+            Reservation.student_id,
+            Reservation.private_lesson_id,
+            PrivateLesson.tutor_id
+        )
+        .outerjoin(Reservation.private_lesson)
+        .where(Reservation.id == reservation_id)
+    )
+    return result.one_or_none()
+
+
 async def update_reservation_data_tutor(
     db: AsyncSession,
     reservation_id: int,
     reservation_data: ReservationUpdate,
     user_id: int
 ):
-    reservation = await get_reservation_by_id(db, reservation_id)
-    if reservation is None:
+    '''
+    Checks the ownership in the `WHERE` of the update, so that the happy path
+    is a single statement. Only if it fails, the reservation is read again
+    to tell apart a missing reservation (`None`) from a forbidden change.
+    '''
+    is_status_allowed = (
+        not reservation_data.status or
+        reservation_data.status in ['accepted', 'rejected']
+    )
+    if is_status_allowed:
+        values = reservation_data.model_dump(exclude_none=True)
+        conditions = [
+            select(PrivateLesson.id).where(
+                PrivateLesson.id == Reservation.private_lesson_id,
+                PrivateLesson.tutor_id == user_id
+            ).exists()
+        ]
+        # Tutors whose busy time the update can change:
+        schedule_owner_ids = [user_id]
+        if "private_lesson_id" in values:
+            target_lesson = await get_existing_private_lesson(
+                db, values["private_lesson_id"]
+            )
+            if target_lesson.tutor_id != user_id:
+                raise HTTPException(
+                    status_code=403,
+                    detail="You can only move reservations to your own lessons"
+                )
+            values["tutor_id"] = target_lesson.tutor_id
+            schedule_owner_ids.append(target_lesson.tutor_id)
+            # In case the lesson changed tutor in the meantime:
+            conditions.append(
+                select(PrivateLesson.id).where(
+                    PrivateLesson.id == target_lesson.id,
+                    PrivateLesson.tutor_id == user_id
+                ).exists()
+            )
+        if reservation_data.student_id:
+            conditions.append(
+                Reservation.student_id == reservation_data.student_id
+            )
+        # Accepting or moving a reservation can change the busy time of the
+        # tutors, so it's serialized with the validation of new reservations:
+        does_change_busy_time = (
+            reservation_data.status == ReservationStatus.ACCEPTED or
+            "private_lesson_id" in values
+        )
+        async with (
+            lock_schedules_of_users(db, schedule_owner_ids)
+            if does_change_busy_time else nullcontext()
+        ):
+            reservation = await update_reservation_if(
+                db,
+                reservation_id,
+                conditions,
+                # An update without changes still checks the conditions:
+                values or {"status": Reservation.status}
+            )
+        if reservation is not None:
+            # Reservations are only moved between lessons of the same tutor,
+            # so only the tutor of the returned row is told:
+            on_reservation_changed(reservation, reservation.tutor_id)
+            await notify_reservation_event(reservation, "updated")
+            return reservation
+
+    owners = await get_owners_of_reservation(db, reservation_id)
+    if owners is None:
         return None
 
     # Ensure that the tutor_id of the reservation
     # matches the user_id in the update
-    private_lesson: PrivateLesson = reservation.private_lesson
-    if private_lesson.tutor_id != user_id:
+    if owners.tutor_id != user_id:
         raise HTTPException(
             status_code=403,
             detail="You can only update reservations for your own lessons"
@@ -188,7 +799,7 @@ async def update_reservation_data_tutor(
     # if the reservation is being updated by a tutor
     if (
         reservation_data.student_id and
-        reservation.student_id != reservation_data.student_id
+        owners.student_id != reservation_data.student_id
     ):
         raise HTTPException(
             status_code=403,
@@ -197,63 +808,199 @@ async def update_reservation_data_tutor(
 
     # Only allow updating the status
     # if the change is to 'accepted' or 'rejected'
-    if (
-        reservation_data.status and
-        reservation_data.status not in ['accepted', 'rejected']
-    ):
+    if not is_status_allowed:
         raise HTTPException(
             status_code=403,
             detail="You can only change the status to 'accepted' or 'rejected'"
         )
 
-    for field, value in reservation_data.model_dump().items():
-        if value is not None:
-            setattr(reservation, field, value)
+    # It changed between both statements:
+    return None
+
 
+async def update_reservation_statuses_of_tutor(
+    db: AsyncSession,
+    tutor_id: int,
+    decisions: ReservationStatusDecisions
+) -> tuple[list[Reservation], list[Reservation]]:
+    '''
+    Accepts and rejects many reservations of the tutor in one transaction,
+    with a single `UPDATE ... WHERE id IN (...) RETURNING`. Then, a second
+    `UPDATE` rejects every pending reservation of the tutor that overlaps
+    one of the accepted ones. Returns both lists of updated reservations.
+
+    If any of the reservations doesn't exist or isn't of a lesson of the
+    tutor, nothing is updated.
+    '''
+    reservation_ids = [*decisions.accept, *decisions.reject]
+    status_type = Reservation.__table__.c.status.type
+    async with lock_schedule_of_user(db, tutor_id):
+        try:
+            updated_reservations = (await db.scalars(
+                update(Reservation)
+                .where(
+                    Reservation.id.in_(reservation_ids),
+                    select(PrivateLesson.id).where(
+                        PrivateLesson.id == Reservation.private_lesson_id,
+                        PrivateLesson.tutor_id == tutor_id
+                    ).exists()
+                )
+                .values(status=case(
+                    (
+                        Reservation.id.in_(decisions.accept),
+                        literal(ReservationStatus.ACCEPTED, status_type)
+                    ),
+                    else_=literal(ReservationStatus.REJECTED, status_type)
+                ))
+                .returning(Reservation)
+            )).all()
+            missing_ids = set(reservation_ids) - {
+                reservation.id for reservation in updated_reservations
+            }
+            if missing_ids:
+                await db.rollback()
+                raise HTTPException(
+                    status_code=404,
+                    detail=(
+                        "Reservations not found or not of your lessons: "
+                        f"{', '.join(map(str, sorted(missing_ids)))}"
+                    )
+                )
+            auto_rejected_reservations = []
+            if decisions.accept:
+                accepted = aliased(Reservation)
+                auto_rejected_reservations = (await db.scalars(
+                    update(Reservation)
+                    .where(
+                        Reservation.tutor_id == tutor_id,
+                        Reservation.status == ReservationStatus.PENDING,
+                        select(accepted.id).where(
+                            accepted.id.in_(decisions.accept),
+                            accepted.start_time < Reservation.end_time,
+                            accepted.end_time > Reservation.start_time
+                        ).exists()
+                    )
+                    .values(status=ReservationStatus.REJECTED)
+                    .returning(Reservation)
+                )).all()
+        except IntegrityError as error:
+            await db.rollback()
+            raise_for_overlap_error(error)
+        await commit_reservation_changes(db)
+    for reservation in [*updated_reservations, *auto_rejected_reservations]:
+        on_reservation_changed(reservation, tutor_id)
+        await notify_reservation_event(reservation, "updated")
+    return updated_reservations, auto_rejected_reservations
+
+
+async def expire_pending_reservations(
+    db: AsyncSession,
+    now: datetime,
+    batch_size: int
+) -> list[Reservation] | None:
+    '''
+    Rejects, in a single `UPDATE ... RETURNING`, up to `batch_size` pending
+    reservations that started before `now`, oldest first, and commits.
+    Returns `None` without changing anything if another worker holds the
+    lock of the job.
+    '''
+    if not await try_lock_job(db, RESERVATION_EXPIRY_JOB_ID):
+        await db.rollback()
+        return None
+    expired_ids = (
+        select(Reservation.id)
+        .where(
+            Reservation.status == ReservationStatus.PENDING,
+            Reservation.start_time < now
+        )
+        .order_by(Reservation.start_time)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    expired_reservations = (await db.scalars(
+        update(Reservation)
+        .where(Reservation.id.in_(expired_ids))
+        .values(status=ReservationStatus.REJECTED)
+        .returning(Reservation)
+        .execution_options(synchronize_session=False)
+    )).all()
     await db.commit()
-    await db.refresh(reservation)
-    return reservation
+    for reservation in expired_reservations:
+        on_reservation_changed(reservation, reservation.tutor_id)
+        await notify_reservation_event(reservation, "updated")
+    return expired_reservations
 
 
 async def update_reservation_data_student(db: AsyncSession, reservation_id: int, reservation: ReservationUpdate, user_id: int):
-    db_reservation = await get_reservation_by_id(db, reservation_id)
-    if db_reservation is None:
+    '''
+    Like `update_reservation_data_tutor`, a single guarded update, with a
+    second read only to explain a failure. Students can only cancel their
+    reservations, so the status is the only column that changes.
+    '''
+    if reservation.status == 'rejected':
+        db_reservation = await update_reservation_if(
+            db,
+            reservation_id,
+            [
+                Reservation.student_id == user_id,
+                Reservation.private_lesson_id == reservation.private_lesson_id,
+            ],
+            {"status": ReservationStatus.REJECTED}
+        )
+        if db_reservation is not None:
+            on_reservation_changed(db_reservation, db_reservation.tutor_id)
+            await notify_reservation_event(db_reservation, "updated")
+            return db_reservation
+
+    owners = await get_owners_of_reservation(db, reservation_id)
+    if owners is None:
         return None
 
     # Ensure that the student_id of db_reservation matches the student_id in the reservation update
-    if db_reservation.student_id != user_id:
+    if owners.student_id != user_id:
         raise HTTPException(status_code=403, detail="Forbidden: You can only update your own reservations")
 
     # Don't allow changing the private lesson ID if the reservation is being updated by a student
-    if ('private_lesson_id' in reservation.model_dump() and db_reservation.private_lesson_id != reservation.private_lesson_id):
+    if owners.private_lesson_id != reservation.private_lesson_id:
         raise HTTPException(status_code=400, detail="Forbidden: You cannot change the private lesson or status")
 
     # Only allow updating the status if the change is to 'rejected'
-    if 'status' in reservation.model_dump() and reservation.status != 'rejected':
+    if reservation.status != 'rejected':
         raise HTTPException(status_code=400, detail="Forbidden: You can only change the status to 'rejected' to cancel the reservation")
 
-    for field, value in reservation.model_dump().items():
-        setattr(db_reservation, field, value)
-
-    await db.commit()
-    await db.refresh(db_reservation)
-    return db_reservation
+    # It changed between both statements:
+    return None
 
 async def delete_reservation(db: AsyncSession, reservation_id: int, user_id: int, user_role: str):
+    '''
+    Deletes the reservation with a single `DELETE ... RETURNING`, whose
+    `WHERE` also checks that it belongs to the user.
+    '''
     if user_role == "student":
-        query = select(Reservation).where(Reservation.id == reservation_id, Reservation.student_id == user_id)
+        belongs_to_user = Reservation.student_id == user_id
     elif user_role == "tutor":
-        lesson_ids = (
-            await db.execute(
-                select(PrivateLesson.id).where(PrivateLesson.tutor_id == user_id)
-            )
-        ).scalars().all()
-        query = select(Reservation).where(Reservation.id == reservation_id, Reservation.private_lesson_id.in_(lesson_ids))
+        belongs_to_user = select(PrivateLesson.id).where(
+            PrivateLesson.id == Reservation.private_lesson_id,
+            PrivateLesson.tutor_id == user_id
+        ).exists()
     else:
         return None
-    db_reservation = (await db.execute(query)).scalar_one_or_none()
+    db_reservation = (await db.execute(
+        delete(Reservation)
+        .where(Reservation.id == reservation_id, belongs_to_user)
+        .returning(Reservation)
+    )).scalar_one_or_none()
     if db_reservation is None:
         return None
-    await db.delete(db_reservation)
+    # The row is gone, so keep the returned values instead of expiring them:
+    db.expunge(db_reservation)
+    db.add(ReservationTombstone(
+        reservation_id=db_reservation.id,
+        student_id=db_reservation.student_id,
+        tutor_id=db_reservation.tutor_id
+    ))
     await db.commit()
+    on_reservation_removed(db_reservation, db_reservation.tutor_id)
+    await notify_reservation_event(db_reservation, "deleted")
     return True
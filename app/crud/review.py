@@ -1,6 +1,8 @@
+from app.models.private_lesson import PrivateLesson
 from app.models.review import Review
 from app.models.reservation import Reservation
 from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.utilities.idempotency import BeforeCommit
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -8,7 +10,11 @@ from sqlalchemy.orm import selectinload, joinedload
 from typing import List, Optional
 
 
-async def create_review(db: AsyncSession, review_data: ReviewCreate) -> Review:
+async def create_review(
+    db: AsyncSession,
+    review_data: ReviewCreate,
+    before_commit: Optional[BeforeCommit] = None
+) -> Review:
     """Crear una nueva review"""
     # Verificar que la reservación existe
     reservation = await db.get(Reservation, review_data.reservation_id)
@@ -30,6 +36,10 @@ async def create_review(db: AsyncSession, review_data: ReviewCreate) -> Review:
     
     review = Review(**review_data.model_dump())
     db.add(review)
+    if before_commit is not None:
+        await db.flush()
+        await db.refresh(review)
+        await before_commit(review)
     await db.commit()
     await db.refresh(review)
     return review
@@ -60,7 +70,6 @@ async def get_all_reviews(db: AsyncSession) -> List[Review]:
 
 async def get_reviews_by_tutor_id(db: AsyncSession, tutor_id: int) -> List[Review]:
     """Obtener todas las reviews de un tutor específico"""
-    from app.models.private_lesson import PrivateLesson
     result = await db.execute(
         select(Review)
         .join(Reservation)
@@ -127,27 +136,21 @@ async def delete_review(db: AsyncSession, review_id: int) -> bool:
 
 async def does_review_belong_to_user(db: AsyncSession, review_id: int, user_id: int, user_role: str) -> bool:
     """Verificar si una review pertenece a un usuario específico"""
-    result = await db.execute(
-        select(Review)
-        .where(Review.id == review_id)
-        .options(
-            selectinload(Review.reservation),
-        )
-    )
-    review = result.scalar_one_or_none()
-    if not review:
-        return False
-    
     if user_role == "student":
-        return review.reservation.student_id == user_id
+        belongs_to_user = Reservation.student_id == user_id
     elif user_role == "tutor":
-        # Para verificar si es tutor, necesitamos hacer una consulta adicional
-        from app.models.private_lesson import PrivateLesson
-        private_lesson_result = await db.execute(
-            select(PrivateLesson)
-            .where(PrivateLesson.id == review.reservation.private_lesson_id)
+        belongs_to_user = select(PrivateLesson.id).where(
+            PrivateLesson.id == Reservation.private_lesson_id,
+            PrivateLesson.tutor_id == user_id
+        ).exists()
+    else:
+        return False
+    result = await db.execute(
+        select(
+            select(Review.id)
+            .join(Reservation, Review.reservation_id == Reservation.id)
+            .where(Review.id == review_id, belongs_to_user)
+            .exists()
         )
-        private_lesson = private_lesson_result.scalar_one_or_none()
-        return private_lesson and private_lesson.tutor_id == user_id
-    
-    return False 
\ No newline at end of file
+    )
+    return result.scalar()
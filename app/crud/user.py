@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from app.crud.private_lesson import PrivateLessonCRUD
+from app.models.private_lesson import PrivateLesson
 from app.models.user import User
 from app.models.reservation import Reservation
 from app.models.review import Review
@@ -9,6 +10,11 @@ from app.models.weekly_timeblock import WeeklyTimeblock
 from app.schemas.reservation import ReservationStatus
 from app.schemas.user import UserCreate, UserUpdate
 from app.auth.auth_handler import get_password_hash
+from app.utilities.availability_hooks import (
+    on_reservation_removed,
+    on_user_removed,
+)
+from app.utilities.notifications import notify_reservation_event
 from datetime import datetime
 
 
@@ -41,6 +47,11 @@ async def get_user_by_id(db: AsyncSession, user_id: int):
     return result.scalar_one_or_none()
 
 
+async def get_users_by_ids(db: AsyncSession, user_ids: list[int]):
+    result = await db.execute(select(User).where(User.id.in_(user_ids)))
+    return result.scalars().all()
+
+
 async def get_full_data_of_user(
     db: AsyncSession,
     user_id: int,
@@ -135,6 +146,11 @@ async def delete_user(db: AsyncSession, user_id: int):
     if not user:
         return None
 
+    # Reservaciones aceptadas que se rechazan, para actualizar
+    # la disponibilidad de la otra parte:
+    rejected_accepted_reservations = []
+    rejected_reservations = []
+
     # Eliminar weekly timeblocks del usuario
     weekly_timeblocks = await db.execute(
         select(WeeklyTimeblock).where(WeeklyTimeblock.user_id == user_id)
@@ -169,8 +185,13 @@ async def delete_user(db: AsyncSession, user_id: int):
                     reservation.status == ReservationStatus.PENDING or
                     reservation.start_time > datetime.now()
                 ):
+                    if reservation.status == ReservationStatus.ACCEPTED:
+                        rejected_accepted_reservations.append(
+                            (reservation, user_id)
+                        )
                     reservation.status = ReservationStatus.REJECTED
                     db.add(reservation)
+                    rejected_reservations.append(reservation)
             # Eliminar la private lesson
             await private_lesson_crud.delete(lesson.id)
 
@@ -192,12 +213,25 @@ async def delete_user(db: AsyncSession, user_id: int):
                 reservation.status == ReservationStatus.PENDING or
                 reservation.start_time > datetime.now()
             ):
+                if reservation.status == ReservationStatus.ACCEPTED:
+                    lesson = await db.get(
+                        PrivateLesson, reservation.private_lesson_id
+                    )
+                    rejected_accepted_reservations.append(
+                        (reservation, lesson.tutor_id if lesson else None)
+                    )
                 reservation.status = ReservationStatus.REJECTED
                 db.add(reservation)
+                rejected_reservations.append(reservation)
 
     # Finalmente, eliminar el usuario
     await db.delete(user)
     await db.commit()
+    on_user_removed(user_id)
+    for reservation, tutor_id in rejected_accepted_reservations:
+        on_reservation_removed(reservation, tutor_id)
+    for reservation in rejected_reservations:
+        await notify_reservation_event(reservation, "updated")
 
     return True
 
@@ -218,6 +252,9 @@ class UserCRUD:
     async def read_by_id(self, user_id: int):
         return await get_user_by_id(self.db_session, user_id)
 
+    async def read_by_ids(self, user_ids: list[int]):
+        return await get_users_by_ids(self.db_session, user_ids)
+
     async def read_full_data_by_id(self, user_id: int, user_role: str):
         return await get_full_data_of_user(self.db_session, user_id, user_role)
 
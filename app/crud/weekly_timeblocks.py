@@ -3,6 +3,10 @@ from app.schemas.weekly_timeblock import (
     WeeklyTimeblockCreate,
     WeeklyTimeblockOut
 )
+from app.utilities.availability_hooks import (
+    on_weekly_timeblock_created,
+    on_weekly_timeblock_removed,
+)
 from app.utilities.weekly_timeblocks import map_int_weekday_to_enum_weekday
 from datetime import date, datetime
 from fastapi import HTTPException
@@ -38,6 +42,7 @@ async def create_weekly_timeblock(
     db.add(weekly_timeblock)
     await db.commit()
     await db.refresh(weekly_timeblock)
+    on_weekly_timeblock_created(weekly_timeblock)
     return weekly_timeblock
 
 
@@ -59,6 +64,38 @@ async def read_weekly_timeblocks_of_user(
     return result.scalars().all()
 
 
+async def read_weekly_timeblocks_of_user_between(
+    db: AsyncSession,
+    user_id: int,
+    from_date: date,
+    to_date: date,
+) -> list[WeeklyTimeblockOut]:
+    '''
+    Reads the weekly timeblocks of a user that are valid on at least one
+    date of the range (both ends included).
+    '''
+    return await read_weekly_timeblocks_of_users_between(
+        db, [user_id], from_date, to_date
+    )
+
+
+async def read_weekly_timeblocks_of_users_between(
+    db: AsyncSession,
+    user_ids: list[int],
+    from_date: date,
+    to_date: date,
+) -> list[WeeklyTimeblockOut]:
+    from_date = datetime(from_date.year, from_date.month, from_date.day)
+    to_date = datetime(to_date.year, to_date.month, to_date.day)
+    query = select(WeeklyTimeblock).where(
+        WeeklyTimeblock.user_id.in_(user_ids),
+        WeeklyTimeblock.valid_from <= to_date,
+        WeeklyTimeblock.valid_until >= from_date
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
 async def remove_weekly_timeblock_that_belongs_to_user(
     db_session: AsyncSession,
     weekly_timeblock_id: int,
@@ -83,3 +120,4 @@ async def remove_weekly_timeblock_that_belongs_to_user(
         )
     await db_session.delete(weekly_timeblock)
     await db_session.commit()
+    on_weekly_timeblock_removed(weekly_timeblock)
@@ -1,5 +1,14 @@
+from sqlalchemy import BigInteger, inspect
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import (
+    contains_eager,
+    DeclarativeBase,
+    joinedload,
+    selectinload,
+    sessionmaker,
+)
+from sqlalchemy.sql.functions import FunctionElement
 import os
 from dotenv import load_dotenv
 import asyncio
@@ -15,11 +24,92 @@ class Base(DeclarativeBase):
     '''
     Base class for all database models in TeacherUC.
     '''
-    pass
+
+    @classmethod
+    def get_eager_loading_options_of_paths(cls, paths, joined_paths=()):
+        '''
+        Loader options for dotted paths of relationships, such as
+        `"private_lesson.course"` (which also loads `private_lesson`).
+        Many-to-one relationships are joined in the same statement and
+        collections are loaded with a second `SELECT ... IN`. The paths in
+        `joined_paths` are already joined by the query, so they reuse it.
+        '''
+        loaders = {}
+        for path in paths:
+            names = path.split(".")
+            model = cls
+            for depth, name in enumerate(names, start=1):
+                relationships = inspect(model).relationships
+                if name not in relationships:
+                    raise ValueError(
+                        f"{model.__name__} has no relationship `{name}`"
+                    )
+                prefix = ".".join(names[:depth])
+                if prefix not in loaders:
+                    parent_loader = loaders.get(".".join(names[:depth - 1]))
+                    if prefix in joined_paths:
+                        loader = contains_eager
+                    elif relationships[name].uselist:
+                        loader = selectinload
+                    else:
+                        loader = joinedload
+                    if parent_loader is not None:
+                        loader = getattr(parent_loader, loader.__name__)
+                    loaders[prefix] = loader(getattr(model, name))
+                model = relationships[name].mapper.class_
+        return list(loaders.values())
+
+
+class current_change_id(FunctionElement):
+    '''
+    ID of the change that the current transaction is writing, for change
+    feeds. On PostgreSQL, it's the ID of the transaction, so it's known to
+    be committed (or rolled back) once it's below `change_horizon()`.
+    '''
+    type = BigInteger()
+    inherit_cache = True
+
+
+class change_horizon(FunctionElement):
+    '''
+    Every change ID below it belongs to a transaction that has finished, so
+    no row with a lower change ID can still show up. On PostgreSQL, it's the
+    oldest transaction that is still running.
+    '''
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_change_id, "postgresql")
+def compile_current_change_id_on_postgresql(element, compiler, **kwargs):
+    return "pg_current_xact_id()::text::bigint"
+
+
+@compiles(change_horizon, "postgresql")
+def compile_change_horizon_on_postgresql(element, compiler, **kwargs):
+    return "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+# SQLite (only used in the tests) has a single writer at a time, so its
+# change IDs are the milliseconds of its clock, followed by six digits of
+# the count of rows that the connection changed, which orders the changes
+# made within the same millisecond:
+SQLITE_MILLISECONDS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+
+@compiles(current_change_id)
+def compile_current_change_id(element, compiler, **kwargs):
+    return f"({SQLITE_MILLISECONDS} * 1000000 + total_changes() % 1000000)"
+
+
+@compiles(change_horizon)
+def compile_change_horizon(element, compiler, **kwargs):
+    return f"(({SQLITE_MILLISECONDS} + 1) * 1000000)"
+
 
 async def init_db():
     # Add all models to the following import:
-    from app.models import course, private_lesson, reservation, review, user, weekly_timeblock
+    from app.models import course, idempotency_key, private_lesson, reservation, reservation_tombstone, review, user, weekly_timeblock
 
     max_retries = 10
     retry_delay = 2  # segundos
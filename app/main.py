@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 from app.api.courses import router as courses_router
+from app.api.metrics import router as metrics_router
+from app.api.notifications import router as notifications_router
 from app.api.private_lessons import router as private_lessons_router
 from app.api.reservations import router as reservations_router
 from app.api.reviews import router as reviews_router
@@ -8,6 +10,8 @@ from app.api.user import router as user_router
 from app.api.weekly_timeblocks import router as weekly_timeblocks_router
 from app.database import init_db, SessionLocal
 from app.seeds.seed import seed_data
+from app.utilities.idempotency_key_cleanup import idempotency_key_cleanup_job
+from app.utilities.reservation_expiry import reservation_expiry_job
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -18,6 +22,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Headers that the browser lets the frontend read:
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 
@@ -34,6 +40,14 @@ async def on_startup():
             await seed_data(session)
         else:
             print("⏭️ Tabla 'user' no existe. Omitiendo seeds en startup.")
+    reservation_expiry_job.start()
+    idempotency_key_cleanup_job.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await reservation_expiry_job.stop()
+    await idempotency_key_cleanup_job.stop()
 
 
 @app.get("/")
@@ -42,6 +56,8 @@ def read_root():
 
 
 app.include_router(courses_router)
+app.include_router(metrics_router)
+app.include_router(notifications_router)
 app.include_router(private_lessons_router)
 app.include_router(reservations_router)
 app.include_router(reviews_router)
@@ -0,0 +1,31 @@
+from app.database import Base
+from datetime import datetime
+from sqlalchemy import Index, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class IdempotencyKey(Base):
+    '''
+    `Idempotency-Key` sent by a user with a request, the fingerprint of that
+    request and, once it succeeded or was rejected with a 4xx, its
+    response, so that retries with the same key get the stored response
+    instead of running again. While the first request runs, `status_code`
+    is `None`. Times are in UTC.
+    '''
+    __tablename__ = "idempotencykey"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key"),
+        Index("ix_idempotencykey_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    user_id: Mapped[int] = mapped_column()
+    key: Mapped[str] = mapped_column(String(255))
+    fingerprint: Mapped[str] = mapped_column(String(64))
+
+    status_code: Mapped[int] = mapped_column(nullable=True)
+    response_body: Mapped[str] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column()
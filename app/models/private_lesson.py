@@ -1,18 +1,22 @@
 from app.database import Base
 from app.schemas.private_lesson import OfferStatus
-from sqlalchemy import Enum, ForeignKey, Text
-from sqlalchemy.orm import (
-    joinedload,
-    Mapped,
-    mapped_column,
-    relationship,
-    selectinload
-)
+from sqlalchemy import Enum, ForeignKey, Index, Text, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
 
 class PrivateLesson(Base):
     __tablename__ = "privatelesson"
+    __table_args__ = (
+        Index("ix_privatelesson_tutor_id", "tutor_id"),
+        # Only open lessons are searched by course:
+        Index(
+            "ix_privatelesson_course_id_open",
+            "course_id",
+            postgresql_where=text("offer_status = 'OPEN'"),
+            sqlite_where=text("offer_status = 'OPEN'"),
+        ),
+    )
 
     # Primary key:
 
@@ -53,11 +57,12 @@ class PrivateLesson(Base):
         reservations=False,
         tutor=True
     ):
-        eager_loading_options = []
-        if course:
-            eager_loading_options.append(joinedload(cls.course))
-        if reservations:
-            eager_loading_options.append(selectinload(cls.reservations))
-        if tutor:
-            eager_loading_options.append(joinedload(cls.tutor))
-        return eager_loading_options
+        return cls.get_eager_loading_options_of_paths(
+            name
+            for name, is_loaded in (
+                ("course", course),
+                ("reservations", reservations),
+                ("tutor", tutor),
+            )
+            if is_loaded
+        )
@@ -1,12 +1,45 @@
-from app.database import Base
+from app.database import Base, current_change_id
 from app.schemas.reservation import ReservationStatus
 from datetime import datetime
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import BigInteger, DDL, Enum, event, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 class Reservation(Base):
     __tablename__ = "reservation"
+    __table_args__ = (
+        Index(
+            "ix_reservation_student_id_status_start_time",
+            "student_id", "status", "start_time"
+        ),
+        Index(
+            "ix_reservation_private_lesson_id_status_start_time",
+            "private_lesson_id", "status", "start_time"
+        ),
+        # Keyset pagination of every reservation:
+        Index("ix_reservation_start_time_id", "start_time", "id"),
+        # Busy time of tutors (see `RESERVATION_OVERLAP_ERROR_MARKER`):
+        Index(
+            "ix_reservation_tutor_id_start_time_accepted",
+            "tutor_id", "start_time",
+            postgresql_where=text("status = 'ACCEPTED'"),
+            sqlite_where=text("status = 'ACCEPTED'"),
+        ),
+        # Pending reservations that already started, to expire them:
+        Index(
+            "ix_reservation_start_time_pending",
+            "start_time",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+        # Calendars of students and tutors:
+        Index("ix_reservation_student_id_start_time", "student_id", "start_time"),
+        Index("ix_reservation_tutor_id_start_time", "tutor_id", "start_time"),
+        # Change feed of students, tutors and admins:
+        Index("ix_reservation_student_id_change_id", "student_id", "change_id"),
+        Index("ix_reservation_tutor_id_change_id", "tutor_id", "change_id"),
+        Index("ix_reservation_change_id", "change_id"),
+    )
 
     # Primary key:
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -24,9 +57,94 @@ class Reservation(Base):
         ForeignKey("user.id"),
         nullable=True,
     )
-    student = relationship("User", back_populates="reservations")
+    student = relationship(
+        "User",
+        back_populates="reservations",
+        foreign_keys=[student_id]
+    )
+
+    # Copy of `private_lesson.tutor_id`, so that the database can enforce
+    # that accepted reservations of the same tutor don't overlap:
+    tutor_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="SET NULL"),
+        nullable=True,
+    )
 
     # Attributes:
     status: Mapped[ReservationStatus] = mapped_column(Enum(ReservationStatus))
     start_time: Mapped[datetime] = mapped_column()
     end_time: Mapped[datetime] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    # Also set by bulk `UPDATE` statements, which apply `onupdate`:
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+    # Position of the last change in the change feed (see
+    # `current_change_id`), set by the database on every write:
+    change_id: Mapped[int] = mapped_column(
+        BigInteger,
+        default=current_change_id(),
+        onupdate=current_change_id()
+    )
+
+    # Utility methods:
+
+    @classmethod
+    def get_eager_loading_options(
+        cls,
+        include=("student", "private_lesson.course", "private_lesson.tutor")
+    ):
+        '''
+        Every relationship here is many-to-one, so they are all joined in the
+        same statement.
+        '''
+        return cls.get_eager_loading_options_of_paths(include)
+
+
+# Accepted reservations of the same tutor, or of the same student, must not
+# overlap. PostgreSQL enforces it with GiST-backed exclusion constraints over
+# `tsrange(start_time, end_time)`; SQLite (used by the tests) with triggers.
+# Both errors contain `RESERVATION_OVERLAP_ERROR_MARKER`.
+
+RESERVATION_OVERLAP_ERROR_MARKER = "reservation_no_overlap"
+
+event.listen(
+    Reservation.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(
+        dialect="postgresql"
+    )
+)
+
+for column in ("tutor_id", "student_id"):
+    event.listen(
+        Reservation.__table__,
+        "after_create",
+        DDL(
+            f"ALTER TABLE reservation "
+            f"ADD CONSTRAINT reservation_no_overlap_{column} "
+            f"EXCLUDE USING gist ("
+            f"{column} WITH =, "
+            f"tsrange(start_time, end_time, '[)') WITH &&"
+            f") WHERE (status = 'ACCEPTED')"
+        ).execute_if(dialect="postgresql")
+    )
+
+for operation, exclude_itself in (("INSERT", ""), ("UPDATE", "AND id != NEW.id")):
+    event.listen(
+        Reservation.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER reservation_no_overlap_on_{operation.lower()} "
+            f"BEFORE {operation} ON reservation "
+            f"WHEN NEW.status = 'ACCEPTED' AND EXISTS ("
+            f"SELECT 1 FROM reservation "
+            f"WHERE status = 'ACCEPTED' {exclude_itself} "
+            f"AND start_time < NEW.end_time AND end_time > NEW.start_time "
+            f"AND (tutor_id = NEW.tutor_id OR student_id = NEW.student_id)"
+            f") "
+            f"BEGIN SELECT RAISE(ABORT, '{RESERVATION_OVERLAP_ERROR_MARKER}'); "
+            f"END"
+        ).execute_if(dialect="sqlite")
+    )
@@ -0,0 +1,36 @@
+from app.database import Base, current_change_id
+from datetime import datetime
+from sqlalchemy import BigInteger, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ReservationTombstone(Base):
+    '''
+    Record of a deleted reservation, so that the change feed can tell the
+    clients to forget it. The columns have no foreign keys, because the
+    rows that they pointed to may be gone too.
+    '''
+    __tablename__ = "reservationtombstone"
+    __table_args__ = (
+        Index(
+            "ix_reservationtombstone_student_id_change_id",
+            "student_id", "change_id"
+        ),
+        Index(
+            "ix_reservationtombstone_tutor_id_change_id",
+            "tutor_id", "change_id"
+        ),
+        Index("ix_reservationtombstone_change_id", "change_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    reservation_id: Mapped[int] = mapped_column()
+    student_id: Mapped[int] = mapped_column(nullable=True)
+    tutor_id: Mapped[int] = mapped_column(nullable=True)
+
+    deleted_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    change_id: Mapped[int] = mapped_column(
+        BigInteger,
+        default=current_change_id()
+    )
@@ -9,7 +9,10 @@ class Review(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    reservation_id: Mapped[int] = mapped_column(ForeignKey("reservation.id"))
+    reservation_id: Mapped[int] = mapped_column(
+        ForeignKey("reservation.id"),
+        index=True
+    )
     reservation = relationship("Reservation")
 
     content: Mapped[str] = mapped_column(Text)
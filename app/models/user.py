@@ -22,5 +22,9 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.student)
 
     private_lessons = relationship("PrivateLesson", back_populates="tutor")
-    reservations = relationship("Reservation", back_populates="student")
+    reservations = relationship(
+        "Reservation",
+        back_populates="student",
+        foreign_keys="Reservation.student_id"
+    )
     weekly_timeblocks = relationship("WeeklyTimeblock", back_populates="user")
@@ -1,12 +1,18 @@
 from app.database import Base
 from app.schemas.weekday import Weekday
 from datetime import datetime, time
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 class WeeklyTimeblock(Base):
     __tablename__ = "weeklytimeblock"
+    __table_args__ = (
+        Index(
+            "ix_weeklytimeblock_user_id_weekday_valid_from_valid_until",
+            "user_id", "weekday", "valid_from", "valid_until"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -0,0 +1,18 @@
+from app.schemas.single_timeblock import SingleTimeblock
+from datetime import date, datetime
+from pydantic import BaseModel
+
+
+class DailyAvailability(BaseModel):
+    on_date: date
+    timeblocks: list[SingleTimeblock]
+
+
+class UserAvailability(BaseModel):
+    user_id: int
+    days: list[DailyAvailability]
+
+
+class BookableSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
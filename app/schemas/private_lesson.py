@@ -50,3 +50,10 @@ class PrivateLessonPage(BaseModel):
     page_size: int
     results: list[PrivateLessonOut]
     total: int
+
+
+class AvailablePrivateLessonPage(BaseModel):
+    page: int
+    page_size: int
+    results: list[PrivateLessonOut]
+    has_more: bool
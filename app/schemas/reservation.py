@@ -1,8 +1,9 @@
-from app.schemas.private_lesson import PrivateLessonExtendedOut
+from app.schemas.course import CourseOut
+from app.schemas.private_lesson import PrivateLessonExtendedOut, PrivateLessonOut
 from app.schemas.user import UserOut
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 
 
@@ -29,6 +30,8 @@ class ReservationCreate(ReservationBase):
 
 class ReservationOut(ReservationBase):
     id: int
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
 
 
 class ReservationExtendedOut(ReservationOut):
@@ -36,6 +39,179 @@ class ReservationExtendedOut(ReservationOut):
     private_lesson: PrivateLessonExtendedOut | None = None
 
 
+RESERVATION_FIELDS = (
+    "id",
+    "private_lesson_id",
+    "student_id",
+    "status",
+    "start_time",
+    "end_time",
+    "created_at",
+    "updated_at",
+)
+RESERVATION_INCLUDES = (
+    "student",
+    "private_lesson",
+    "private_lesson.course",
+    "private_lesson.tutor",
+)
+
+
+class ReservationFieldset(BaseModel):
+    '''
+    The `fields` (columns) and the related objects (`include`) that a read
+    returns of each reservation. Without `fields`, every column is returned.
+    Without `include`, every related object is returned, unless `fields`
+    is given, in which case none is.
+    '''
+    fields: tuple[str, ...] | None = None
+    include: tuple[str, ...] | None = None
+
+    @model_validator(mode="after")
+    def check_that_the_names_exist(self):
+        for names, known_names in (
+            (self.fields, RESERVATION_FIELDS),
+            (self.include, RESERVATION_INCLUDES),
+        ):
+            unknown_names = set(names or ()) - set(known_names)
+            if unknown_names:
+                raise ValueError(
+                    f"Unknown names: {', '.join(sorted(unknown_names))}; "
+                    f"expected some of: {', '.join(known_names)}"
+                )
+        return self
+
+    def get_fields(self) -> tuple[str, ...]:
+        return RESERVATION_FIELDS if self.fields is None else self.fields
+
+    def get_include(self) -> tuple[str, ...]:
+        if self.include is not None:
+            return self.include
+        return RESERVATION_INCLUDES if self.fields is None else ()
+
+    def get_loaded_fields(self) -> tuple[str, ...]:
+        '''
+        The fields to load from the database, which also include the ones
+        that pagination needs.
+        '''
+        return tuple(dict.fromkeys(("id", "start_time", *self.get_fields())))
+
+    def is_complete(self) -> bool:
+        return (
+            set(self.get_fields()) == set(RESERVATION_FIELDS)
+            and set(self.get_include()) == set(RESERVATION_INCLUDES)
+        )
+
+    def serialize(self, reservation) -> dict:
+        '''
+        A dict with only the requested keys, so that the response, with
+        `response_model_exclude_unset=True`, skips the rest.
+        '''
+        include = self.get_include()
+        serialized = {
+            field: getattr(reservation, field) for field in self.get_fields()
+        }
+        if "student" in include:
+            serialized["student"] = reservation.student
+        if any(path.startswith("private_lesson") for path in include):
+            private_lesson = reservation.private_lesson
+            serialized["private_lesson"] = None
+            if private_lesson is not None:
+                serialized_lesson = {
+                    field: getattr(private_lesson, field)
+                    for field in PrivateLessonOut.model_fields
+                }
+                for path in ("private_lesson.course", "private_lesson.tutor"):
+                    if path in include:
+                        name = path.split(".")[1]
+                        serialized_lesson[name] = getattr(private_lesson, name)
+                serialized["private_lesson"] = serialized_lesson
+        return serialized
+
+
+class PrivateLessonSparseOut(PrivateLessonOut):
+    course: CourseOut | None = None
+    tutor: UserOut | None = None
+
+
+class ReservationSparseOut(BaseModel):
+    '''
+    `ReservationExtendedOut` with every field optional, for responses
+    restricted by a `ReservationFieldset`.
+    '''
+    id: int | None = None
+    private_lesson_id: int | None = None
+    student_id: int | None = None
+    status: ReservationStatus | None = None
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    student: UserOut | None = None
+    private_lesson: PrivateLessonSparseOut | None = None
+
+    class Config:
+        from_attributes = True
+
+
+DEFAULT_RESERVATIONS_PER_PAGE = 100
+MAX_RESERVATIONS_PER_PAGE = 500
+
+
+class ReservationPageParams(BaseModel):
+    '''
+    Keyset pagination on `(start_time, id)`: a page holds the first `limit`
+    reservations, in that order, that come strictly after `after`.
+    `from_date` and `to_date` (both included) filter by `start_time`.
+    '''
+    after: tuple[datetime, int] | None = None
+    limit: int = DEFAULT_RESERVATIONS_PER_PAGE
+    from_date: date | None = None
+    to_date: date | None = None
+    status: ReservationStatus | None = None
+
+
+MAX_CALENDAR_DAYS = 93
+
+
+class ReservationCalendarEntry(BaseModel):
+    '''
+    Compact projection of a reservation for calendar views, without
+    related objects.
+    '''
+    id: int
+    private_lesson_id: int
+    student_id: int | None
+    tutor_id: int | None
+    status: ReservationStatus
+    start_time: datetime
+    end_time: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationTombstoneOut(BaseModel):
+    reservation_id: int
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationChanges(BaseModel):
+    '''
+    What changed since the `since` cursor of the request: the reservations
+    that were created or updated, and the IDs of the deleted ones. `cursor`
+    is the `since` of the next request, which should be sent right away if
+    `has_more` is true.
+    '''
+    changed: list[ReservationOut]
+    deleted: list[ReservationTombstoneOut]
+    cursor: str
+    has_more: bool
+
+
 class ReservationUpdate(BaseModel):
     private_lesson_id: Optional[int] = None
     student_id: Optional[int] = None
@@ -43,3 +219,79 @@ class ReservationUpdate(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ReservationStatusDecisions(BaseModel):
+    '''
+    IDs of reservations that a tutor accepts and rejects at once.
+    '''
+    accept: list[int] = Field([], max_length=MAX_RESERVATIONS_PER_PAGE)
+    reject: list[int] = Field([], max_length=MAX_RESERVATIONS_PER_PAGE)
+
+    @model_validator(mode="after")
+    def check_that_the_decisions_are_consistent(self):
+        if not self.accept and not self.reject:
+            raise ValueError("At least one reservation must be decided")
+        if set(self.accept) & set(self.reject):
+            raise ValueError(
+                "A reservation cannot be both accepted and rejected"
+            )
+        return self
+
+
+class ReservationStatusDecisionsResult(BaseModel):
+    updated: list[ReservationOut]
+    auto_rejected: list[ReservationOut]
+
+
+MAX_RESERVATIONS_PER_PACKAGE = 100
+
+
+class ReservationInterval(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+
+class ReservationRecurrence(BaseModel):
+    '''
+    `count` occurrences of the same interval, the first one starting at
+    `start_time` and each of the next ones `every_days` after the previous.
+    '''
+    start_time: datetime
+    end_time: datetime
+    every_days: int = Field(7, ge=1)
+    count: int = Field(ge=1, le=MAX_RESERVATIONS_PER_PACKAGE)
+
+    def get_intervals(self) -> list[ReservationInterval]:
+        return [
+            ReservationInterval(
+                start_time=self.start_time + timedelta(days=i * self.every_days),
+                end_time=self.end_time + timedelta(days=i * self.every_days),
+            )
+            for i in range(self.count)
+        ]
+
+
+class ReservationPackageCreate(BaseModel):
+    '''
+    Either a list of `intervals` or a `recurrence`, but not both.
+    '''
+    intervals: list[ReservationInterval] | None = Field(
+        None,
+        min_length=1,
+        max_length=MAX_RESERVATIONS_PER_PACKAGE
+    )
+    recurrence: ReservationRecurrence | None = None
+
+    @model_validator(mode="after")
+    def check_that_there_is_exactly_one_source(self):
+        if (self.intervals is None) == (self.recurrence is None):
+            raise ValueError(
+                "Exactly one of `intervals` and `recurrence` must be given"
+            )
+        return self
+
+    def get_intervals(self) -> list[ReservationInterval]:
+        if self.recurrence is not None:
+            return self.recurrence.get_intervals()
+        return self.intervals
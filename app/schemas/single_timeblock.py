@@ -1,6 +1,7 @@
 from app.models.weekly_timeblock import WeeklyTimeblock
 from app.schemas.weekday import Weekday
 from app.utilities.weekdays import map_enum_weekday_to_int_weekday
+from bisect import bisect_right
 from datetime import time
 from pydantic import BaseModel
 
@@ -45,49 +46,62 @@ class SingleTimeblock(BaseModel):
             for wt in weekly_timeblocks
         ]
 
+    @staticmethod
+    def merge_connected_timeblocks(
+        timeblocks: list['SingleTimeblock']
+    ) -> list['SingleTimeblock']:
+        '''
+        Sorts the timeblocks once and coalesces the adjacent or overlapping
+        ones, so that each returned timeblock is a connected component.
+        '''
+        merged: list[SingleTimeblock] = []
+        for block in sorted(
+            timeblocks,
+            key=lambda t: (t.weekday_index, t.start_hour)
+        ):
+            if merged and SingleTimeblock.are_adjacent(merged[-1], block):
+                if block.end_hour > merged[-1].end_hour:
+                    merged[-1].end_hour = block.end_hour
+            else:
+                merged.append(block.model_copy())
+        return merged
+
+    @staticmethod
+    def find_connected_timeblock_index(
+        merged_timeblocks: list['SingleTimeblock'],
+        weekday_index: int,
+        hour: time
+    ) -> int | None:
+        '''
+        Binary searches the output of `merge_connected_timeblocks()` for the
+        connected component that contains the instant, if there is one.
+        '''
+        index = bisect_right(
+            merged_timeblocks,
+            (weekday_index, hour),
+            key=lambda t: (t.weekday_index, t.start_hour)
+        ) - 1
+        if index < 0:
+            return None
+        block = merged_timeblocks[index]
+        if block.weekday_index != weekday_index or block.end_hour < hour:
+            return None
+        return index
+
     @staticmethod
     def are_timeblocks_connected(
         timeblock_1: 'SingleTimeblock',
         timeblock_2: 'SingleTimeblock',
         all_timeblocks: list['SingleTimeblock']
     ):
-        # We'll work with sorted timeblocks:
-        all_timeblocks = sorted(
-            all_timeblocks,
-            key=lambda t: (t.weekday_index, t.start_hour)
+        merged = SingleTimeblock.merge_connected_timeblocks(all_timeblocks)
+        timeblock_1_index = SingleTimeblock.find_connected_timeblock_index(
+            merged, timeblock_1.weekday_index, timeblock_1.start_hour
+        )
+        timeblock_2_index = SingleTimeblock.find_connected_timeblock_index(
+            merged, timeblock_2.weekday_index, timeblock_2.start_hour
+        )
+        return (
+            timeblock_1_index is not None and
+            timeblock_1_index == timeblock_2_index
         )
-        # Initialize a half matrix to store the results of the connections:
-        connected: dict[int, dict[int, bool]] = {}
-        for i in range(len(all_timeblocks)):
-            connected[i] = {}
-            for j in range(i, len(all_timeblocks)):
-                connected[i][j] = None
-        # Base case 1: if the two timeblocks are the same, they are connected.
-        for i in range(len(all_timeblocks)):
-            connected[i][i] = True
-        # Base case 2: if the two timeblocks are adjacent, they are connected.
-        for i in range(len(all_timeblocks)):
-            for j in range(i + 1, len(all_timeblocks)):
-                if SingleTimeblock.are_adjacent(
-                    all_timeblocks[i],
-                    all_timeblocks[j]
-                ):
-                    connected[i][j] = True
-        # Recursive case: if the two timeblocks are connected through
-        # other timeblocks, they are connected.
-        # This takes advantage of the fact that the timeblocks are sorted.
-        for i in range(len(all_timeblocks)):
-            for j in range(i + 1, len(all_timeblocks)):
-                if connected[i][j] is None:
-                    for k in range(i + 1, j):
-                        if connected[i][k] and connected[k][j]:
-                            connected[i][j] = True
-                            break
-                    if connected[i][j] is None:
-                        connected[i][j] = False
-        # Final result:
-        timeblock_1_index = all_timeblocks.index(timeblock_1)
-        timeblock_2_index = all_timeblocks.index(timeblock_2)
-        if timeblock_1_index <= timeblock_2_index:
-            return connected[timeblock_1_index][timeblock_2_index]
-        return connected[timeblock_2_index][timeblock_1_index]
@@ -131,6 +131,7 @@ async def seed_data(session: AsyncSession):
             reservation = Reservation(
                 student_id=student.id,
                 private_lesson_id=lesson.id,
+                tutor_id=lesson.tutor_id,
                 status=ReservationStatus.PENDING,
                 start_time=datetime(now.year, now.month, now.day, 8, 20) + timedelta(days=1),
                 end_time=datetime(now.year, now.month, now.day, 9, 30) + timedelta(days=1),
@@ -1,17 +1,141 @@
 from app.crud.user import UserCRUD
-from app.crud.weekly_timeblocks import read_weekly_timeblocks_of_user
+from app.crud.weekly_timeblocks import (
+    read_weekly_timeblocks_of_user,
+    read_weekly_timeblocks_of_user_between,
+    read_weekly_timeblocks_of_users_between,
+)
 from app.models.private_lesson import PrivateLesson
 from app.models.reservation import Reservation
 from app.models.user import User
+from app.models.weekly_timeblock import WeeklyTimeblock
+from app.schemas.availability import (
+    BookableSlot,
+    DailyAvailability,
+    UserAvailability,
+)
+from app.schemas.private_lesson import OfferStatus
 from app.schemas.reservation import ReservationStatus
 from app.schemas.user import UserRole
 from app.schemas.single_timeblock import SingleTimeblock
+from app.schemas.weekly_timeblock import WeeklyTimeblockOut
+from app.utilities.availability_calendar import (
+    availability_cache,
+    availability_calendar,
+    CalendarDay,
+)
+from app.utilities.intervals import (
+    does_interval_overlap_merged_intervals,
+    Interval,
+    iterate_slots,
+    merge_intervals,
+    subtract_intervals,
+)
+from app.utilities.week_grid import (
+    get_end_datetime,
+    get_week_start,
+    is_aligned,
+    WeekGrid,
+)
 from app.utilities.weekly_timeblocks import (
-    are_start_time_and_end_time_inside_connected_timeblocks
+    are_start_time_and_end_time_inside_connected_timeblocks,
+    is_weekly_timeblock_valid_on_date,
 )
-from datetime import date, datetime
-from sqlalchemy import and_, or_, select
+from app.utilities.weekdays import map_int_weekday_to_enum_weekday
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from typing import Iterator
+
+
+def select_accepted_reservations_overlapping(
+    user_id: int,
+    user_role: UserRole,
+    from_datetime: datetime,
+    to_datetime: datetime,
+    *columns,
+):
+    '''
+    Builds a query for the accepted reservations of a user (as the tutor of
+    the private lesson or as the student) that overlap the given range.
+    '''
+    query = select(*columns).where(
+        Reservation.status == ReservationStatus.ACCEPTED,
+        Reservation.start_time < to_datetime,
+        Reservation.end_time > from_datetime,
+    )
+    if user_role == UserRole.tutor:
+        return query.where(Reservation.tutor_id == user_id)
+    return query.where(Reservation.student_id == user_id)
+
+
+def get_available_single_timeblocks_on_date(
+    on_date: date,
+    weekly_timeblocks: list[WeeklyTimeblock],
+    busy_intervals: list[Interval],
+    are_timeblocks_required_to_be_connected: bool,
+) -> list[SingleTimeblock]:
+    '''
+    Computes, in memory, which of the `weekly_timeblocks` of a day are free,
+    given the `busy_intervals` (accepted reservations) of their owner.
+    '''
+    merged_busy_intervals = merge_intervals(busy_intervals)
+    available_blocks = []
+    for weekly_timeblock in weekly_timeblocks:
+        from_datetime = datetime.combine(on_date, weekly_timeblock.start_hour)
+        to_datetime = datetime.combine(on_date, weekly_timeblock.end_hour)
+        if (
+            are_timeblocks_required_to_be_connected and
+            not are_start_time_and_end_time_inside_connected_timeblocks(
+                from_datetime,
+                to_datetime,
+                weekly_timeblocks
+            )
+        ):
+            continue
+        if does_interval_overlap_merged_intervals(
+            from_datetime,
+            to_datetime,
+            merged_busy_intervals
+        ):
+            continue
+        available_blocks.append(
+            SingleTimeblock.from_weekly_timeblock(weekly_timeblock)
+        )
+    return available_blocks
+
+
+def iterate_daily_availabilities(
+    from_date: date,
+    to_date: date,
+    weekly_timeblocks: list[WeeklyTimeblock],
+    busy_intervals: list[Interval],
+    are_timeblocks_required_to_be_connected: bool,
+) -> Iterator[DailyAvailability]:
+    '''
+    Expands the `weekly_timeblocks` over every date of the range (both ends
+    included) and yields the available timeblocks of each day.
+    '''
+    merged_busy_intervals = merge_intervals(busy_intervals)
+    on_date = from_date
+    while on_date <= to_date:
+        yield DailyAvailability(
+            on_date=on_date,
+            timeblocks=get_available_single_timeblocks_on_date(
+                on_date,
+                [
+                    weekly_timeblock
+                    for weekly_timeblock in weekly_timeblocks
+                    if is_weekly_timeblock_valid_on_date(
+                        weekly_timeblock, on_date
+                    )
+                ],
+                merged_busy_intervals,
+                are_timeblocks_required_to_be_connected
+            )
+        )
+        on_date += timedelta(days=1)
 
 
 class AvailabilityService:
@@ -23,20 +147,364 @@ class AvailabilityService:
         self,
         user_id: int,
         on_date: date
-    ):
+    ) -> list[SingleTimeblock] | None:
+        '''
+        Cached in `availability_cache`; on a miss, reads the day from the
+        in-process `availability_calendar`, loading it from the database
+        only when it's not there.
+        Returns `None` if the user doesn't exist.
+        '''
+        return await availability_cache.get_or_compute(
+            (user_id, on_date),
+            lambda: self.__compute_available_single_timeblocks_of_user(
+                user_id, on_date
+            )
+        )
+
+    async def __compute_available_single_timeblocks_of_user(
+        self,
+        user_id: int,
+        on_date: date
+    ) -> list[SingleTimeblock] | None:
+        calendar_day = await self.__get_calendar_day(user_id, on_date)
+        if calendar_day is None:
+            return None
+        return get_available_single_timeblocks_on_date(
+            on_date,
+            calendar_day.get_weekly_timeblocks(),
+            calendar_day.get_busy_intervals(),
+            are_timeblocks_required_to_be_connected=(
+                calendar_day.user_role == UserRole.tutor
+            )
+        )
+
+    async def get_bookable_slots_of_user(
+        self,
+        user_id: int,
+        on_date: date,
+        duration: timedelta,
+        step: timedelta,
+    ) -> list[BookableSlot] | None:
+        '''
+        Start and end times of the reservations (of the given `duration`,
+        starting every `step` from midnight) that would fit in the free time
+        of the user on a date: the connected components of their timeblocks
+        minus their accepted reservations.
+        Returns `None` if the user doesn't exist.
+        '''
+        calendar_day = await self.__get_calendar_day(user_id, on_date)
+        if calendar_day is None:
+            return None
+        weekly_timeblocks = calendar_day.get_weekly_timeblocks()
+        busy_intervals = calendar_day.get_busy_intervals()
+        if is_aligned(duration) and is_aligned(step):
+            # The slots are aligned to the 5-minute grid, so the grid gives
+            # the same slots as the exact intervals below:
+            week_start = get_week_start(on_date)
+            free_grid = (
+                WeekGrid.from_weekly_timeblocks(week_start, weekly_timeblocks) -
+                WeekGrid.from_busy_intervals(week_start, busy_intervals)
+            )
+            slots = free_grid.iterate_slots(week_start, duration, step)
+        else:
+            timeblock_intervals = merge_intervals([
+                (
+                    datetime.combine(on_date, weekly_timeblock.start_hour),
+                    get_end_datetime(on_date, weekly_timeblock.end_hour),
+                )
+                for weekly_timeblock in weekly_timeblocks
+            ])
+            free_intervals = subtract_intervals(
+                timeblock_intervals,
+                merge_intervals(busy_intervals)
+            )
+            slots = iterate_slots(free_intervals, duration, step)
+        return [
+            BookableSlot(start_time=start_time, end_time=end_time)
+            for start_time, end_time in slots
+        ]
+
+    async def __get_calendar_day(
+        self,
+        user_id: int,
+        on_date: date
+    ) -> CalendarDay | None:
+        calendar_day = availability_calendar.get_day(user_id, on_date)
+        if calendar_day is None:
+            calendar_day = await self.__load_calendar_day(user_id, on_date)
+        return calendar_day
+
+    async def __load_calendar_day(
+        self,
+        user_id: int,
+        on_date: date
+    ) -> CalendarDay | None:
+        version = availability_calendar.get_version()
+        user: User = await self.user_crud.read_by_id(user_id)
+        if user is None:
+            return None
         weekly_timeblocks = await read_weekly_timeblocks_of_user(
             self.db_session, user_id, on_date
         )
-        blocks = SingleTimeblock.from_weekly_timeblocks(weekly_timeblocks)
-        available_blocks = []
-        for block in blocks:
-            if await self.is_user_available_on_datetime_range(
+        from_datetime = datetime.combine(on_date, time.min)
+        result = await self.db_session.execute(
+            select_accepted_reservations_overlapping(
+                user.id,
+                user.role,
+                from_datetime,
+                from_datetime + timedelta(days=1),
+                Reservation.id,
+                Reservation.start_time,
+                Reservation.end_time
+            )
+        )
+        calendar_day = CalendarDay(
+            user_role=user.role,
+            weekly_timeblocks=[
+                WeeklyTimeblockOut.model_validate(weekly_timeblock)
+                for weekly_timeblock in weekly_timeblocks
+            ],
+            busy_intervals={
+                reservation_id: (start_time, end_time)
+                for reservation_id, start_time, end_time in result.all()
+            }
+        )
+        availability_calendar.store_day(
+            user_id, on_date, calendar_day, version
+        )
+        return calendar_day
+
+    async def get_daily_availabilities_of_user(
+        self,
+        user_id: int,
+        from_date: date,
+        to_date: date
+    ) -> Iterator[DailyAvailability] | None:
+        '''
+        Reads everything that is needed in (at most) three queries, and
+        returns an iterator that computes each day lazily, in memory, or
+        `None` if the user doesn't exist.
+        '''
+        user: User = await self.user_crud.read_by_id(user_id)
+        if user is None:
+            return None
+        weekly_timeblocks = await read_weekly_timeblocks_of_user_between(
+            self.db_session, user_id, from_date, to_date
+        )
+        busy_intervals = []
+        if weekly_timeblocks:
+            busy_intervals = await self.read_busy_intervals_of_user(
+                user,
+                datetime.combine(from_date, time.min),
+                datetime.combine(to_date + timedelta(days=1), time.min)
+            )
+        return iterate_daily_availabilities(
+            from_date,
+            to_date,
+            weekly_timeblocks,
+            busy_intervals,
+            are_timeblocks_required_to_be_connected=(
+                user.role == UserRole.tutor
+            )
+        )
+
+    async def get_daily_availabilities_of_users(
+        self,
+        user_ids: list[int],
+        from_date: date,
+        to_date: date
+    ) -> list[UserAvailability]:
+        '''
+        Batch version of `get_daily_availabilities_of_user()`, which still
+        uses three queries in total, no matter how many users are requested.
+        Users that don't exist are left out of the result.
+        '''
+        users: list[User] = await self.user_crud.read_by_ids(user_ids)
+        weekly_timeblocks_by_user = defaultdict(list)
+        for weekly_timeblock in await read_weekly_timeblocks_of_users_between(
+            self.db_session, user_ids, from_date, to_date
+        ):
+            weekly_timeblocks_by_user[weekly_timeblock.user_id].append(
+                weekly_timeblock
+            )
+        busy_intervals_by_user = defaultdict(list)
+        users_with_weekly_timeblocks = [
+            user for user in users if weekly_timeblocks_by_user[user.id]
+        ]
+        if users_with_weekly_timeblocks:
+            busy_intervals_by_user = await self.read_busy_intervals_of_users(
+                users_with_weekly_timeblocks,
+                datetime.combine(from_date, time.min),
+                datetime.combine(to_date + timedelta(days=1), time.min)
+            )
+        users_by_id = {user.id: user for user in users}
+        return [
+            UserAvailability(
                 user_id=user_id,
-                from_datetime=datetime.combine(on_date, block.start_hour),
-                to_datetime=datetime.combine(on_date, block.end_hour),
-            ):
-                available_blocks.append(block)
-        return available_blocks
+                days=list(iterate_daily_availabilities(
+                    from_date,
+                    to_date,
+                    weekly_timeblocks_by_user[user_id],
+                    busy_intervals_by_user[user_id],
+                    are_timeblocks_required_to_be_connected=(
+                        users_by_id[user_id].role == UserRole.tutor
+                    )
+                ))
+            )
+            for user_id in dict.fromkeys(user_ids)
+            if user_id in users_by_id
+        ]
+
+    async def read_busy_intervals_of_users(
+        self,
+        users: list[User],
+        from_datetime: datetime,
+        to_datetime: datetime
+    ) -> dict[int, list[Interval]]:
+        '''
+        Batch version of `read_busy_intervals_of_user()`: one query for all
+        of the users, grouped by user ID.
+        '''
+        tutor_ids = {
+            user.id for user in users if user.role == UserRole.tutor
+        }
+        student_ids = {
+            user.id for user in users if user.role != UserRole.tutor
+        }
+        query = select(
+            Reservation.tutor_id,
+            Reservation.student_id,
+            Reservation.start_time,
+            Reservation.end_time,
+        ).where(
+            Reservation.status == ReservationStatus.ACCEPTED,
+            Reservation.start_time < to_datetime,
+            Reservation.end_time > from_datetime,
+            or_(
+                Reservation.tutor_id.in_(tutor_ids),
+                Reservation.student_id.in_(student_ids),
+            )
+        )
+        busy_intervals_by_user = defaultdict(list)
+        result = await self.db_session.execute(query)
+        for tutor_id, student_id, start_time, end_time in result.all():
+            if tutor_id in tutor_ids:
+                busy_intervals_by_user[tutor_id].append((start_time, end_time))
+            if student_id in student_ids:
+                busy_intervals_by_user[student_id].append(
+                    (start_time, end_time)
+                )
+        return busy_intervals_by_user
+
+    async def read_busy_intervals_of_user(
+        self,
+        user: User,
+        from_datetime: datetime,
+        to_datetime: datetime
+    ) -> list[Interval]:
+        '''
+        Returns the `(start_time, end_time)` of every accepted reservation
+        of the user that overlaps the range, in a single query.
+        '''
+        query = select_accepted_reservations_overlapping(
+            user.id, user.role, from_datetime, to_datetime,
+            Reservation.start_time, Reservation.end_time
+        )
+        result = await self.db_session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_private_lessons_available_on_datetime_range(
+        self,
+        course_id: int,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        page: int = 1,
+        page_size: int = 10,
+    ):
+        '''
+        Open private lessons of the course whose tutor is available on the
+        whole range, one page at a time.
+
+        Everything is resolved in a single query, which reads at most
+        `page_size + 1` lessons: the tutor has a timeblock that contains
+        `from_datetime`, no gap in their timeblocks before `to_datetime`,
+        and no accepted reservations in the range. Counting every available
+        lesson would mean checking all of them, so the page tells whether
+        there are more instead of a total.
+        '''
+        offset = (page - 1) * page_size
+        # Timeblocks are connected within a day only:
+        if from_datetime.date() != to_datetime.date():
+            return {
+                "page": page,
+                "page_size": page_size,
+                "results": [],
+                "has_more": False,
+            }
+        weekday = map_int_weekday_to_enum_weekday(from_datetime.weekday())
+        from_hour = from_datetime.time()
+        to_hour = to_datetime.time()
+
+        def select_timeblocks_on_date(weekly_timeblock, user_id):
+            return select(weekly_timeblock.id).where(
+                weekly_timeblock.user_id == user_id,
+                weekly_timeblock.weekday == weekday,
+                weekly_timeblock.valid_from <= from_datetime,
+                weekly_timeblock.valid_until >= from_datetime,
+            )
+
+        has_timeblock_at_start = select_timeblocks_on_date(
+            WeeklyTimeblock, PrivateLesson.tutor_id
+        ).where(
+            WeeklyTimeblock.start_hour <= from_hour,
+            WeeklyTimeblock.end_hour >= from_hour,
+        ).exists()
+        # The timeblocks cover the whole range if one of them contains its
+        # start, and every timeblock that ends inside of it is continued by
+        # another one (that starts before or when it ends):
+        ending_timeblock = aliased(WeeklyTimeblock)
+        continuing_timeblock = aliased(WeeklyTimeblock)
+        has_gap = select_timeblocks_on_date(
+            ending_timeblock, PrivateLesson.tutor_id
+        ).where(
+            ending_timeblock.end_hour >= from_hour,
+            ending_timeblock.end_hour < to_hour,
+            ~select_timeblocks_on_date(
+                continuing_timeblock, ending_timeblock.user_id
+            ).where(
+                continuing_timeblock.start_hour <= ending_timeblock.end_hour,
+                continuing_timeblock.end_hour > ending_timeblock.end_hour,
+            ).exists()
+        ).exists()
+        has_accepted_reservation = select(Reservation.id).where(
+            Reservation.tutor_id == PrivateLesson.tutor_id,
+            Reservation.status == ReservationStatus.ACCEPTED,
+            Reservation.start_time < to_datetime,
+            Reservation.end_time > from_datetime,
+        ).exists()
+        query = select(PrivateLesson).where(
+            PrivateLesson.course_id == course_id,
+            PrivateLesson.offer_status == OfferStatus.OPEN,
+            has_timeblock_at_start,
+            ~has_gap,
+            ~has_accepted_reservation,
+        ).order_by(
+            PrivateLesson.id
+        ).offset(
+            offset
+        ).limit(
+            # One more than the page, to know whether there are more:
+            page_size + 1
+        ).options(
+            *PrivateLesson.get_eager_loading_options(course=True, tutor=True)
+        )
+        lessons = (await self.db_session.execute(query)).scalars().all()
+        return {
+            "page": page,
+            "page_size": page_size,
+            "results": lessons[:page_size],
+            "has_more": len(lessons) > page_size,
+        }
 
     async def is_user_available_on_datetime_range(
         self,
@@ -63,48 +531,22 @@ class AvailabilityService:
         from_datetime: datetime,
         to_datetime: datetime
     ):
-        user: User = await self.user_crud.read_full_data_by_id(
-            user_id, UserRole.tutor
+        weekly_timeblocks = await read_weekly_timeblocks_of_user(
+            self.db_session, user_id
         )
         # If the tutor has no valid WeeklyTimeblocks that cover the whole
         # range, then the tutor is not available.
         if not are_start_time_and_end_time_inside_connected_timeblocks(
             from_datetime,
             to_datetime,
-            user.weekly_timeblocks
+            weekly_timeblocks
         ):
             return False
         # If the tutor has an accepted reservation in any time within the
         # range, then the tutor is not available.
-        lessons: list[PrivateLesson] = user.private_lessons
-        for lesson in lessons:
-            reservations = await self.db_session.execute(
-                select(Reservation).where(
-                    Reservation.private_lesson_id == lesson.id,
-                    Reservation.status == ReservationStatus.ACCEPTED,
-                    or_(
-                        and_(
-                            from_datetime <= Reservation.start_time,
-                            Reservation.start_time < to_datetime,
-                            to_datetime <= Reservation.end_time
-                        ),
-                        and_(
-                            Reservation.start_time <= from_datetime,
-                            to_datetime <= Reservation.end_time
-                        ),
-                        and_(
-                            Reservation.start_time <= from_datetime,
-                            from_datetime < Reservation.end_time,
-                            Reservation.end_time <= to_datetime
-                        )
-                    )
-                )
-            )
-            reservations = reservations.scalars().all()
-            if len(reservations) > 0:
-                return False
-        # Otherwise, the tutor is available.
-        return True
+        return not await self.__does_accepted_reservation_exist(
+            user_id, UserRole.tutor, from_datetime, to_datetime
+        )
 
     async def __is_student_available_on_datetime_range(
         self,
@@ -114,29 +556,21 @@ class AvailabilityService:
     ):
         # If the student has an accepted reservation in any time within the
         # range, they are not available.
-        reservations = await self.db_session.execute(
-            select(Reservation).where(
-                Reservation.student_id == user_id,
-                Reservation.status == ReservationStatus.ACCEPTED,
-                or_(
-                    and_(
-                        from_datetime <= Reservation.start_time,
-                        Reservation.start_time < to_datetime,
-                        to_datetime <= Reservation.end_time
-                    ),
-                    and_(
-                        Reservation.start_time <= from_datetime,
-                        to_datetime <= Reservation.end_time
-                    ),
-                    and_(
-                        Reservation.start_time <= from_datetime,
-                        from_datetime < Reservation.end_time,
-                        Reservation.end_time <= to_datetime
-                    )
-                )
-            )
+        return not await self.__does_accepted_reservation_exist(
+            user_id, UserRole.student, from_datetime, to_datetime
         )
-        if reservations.scalars().first():
-            return False
-        # Otherwise, the student is available.
-        return True
+
+    async def __does_accepted_reservation_exist(
+        self,
+        user_id: int,
+        user_role: UserRole,
+        from_datetime: datetime,
+        to_datetime: datetime,
+    ) -> bool:
+        query = select(
+            select_accepted_reservations_overlapping(
+                user_id, user_role, from_datetime, to_datetime,
+                Reservation.id
+            ).exists()
+        )
+        return (await self.db_session.execute(query)).scalar()
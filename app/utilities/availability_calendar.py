@@ -0,0 +1,175 @@
+from app.models.weekly_timeblock import WeeklyTimeblock
+from app.schemas.reservation import ReservationStatus
+from app.schemas.user import UserRole
+from app.schemas.weekly_timeblock import WeeklyTimeblockOut
+from app.utilities.cache import AsyncTTLCache
+from app.utilities.intervals import Interval
+from app.utilities.weekly_timeblocks import is_weekly_timeblock_valid_on_date
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+
+
+class CalendarDay:
+    '''
+    Everything that is needed to compute the availability of a user on a
+    date: their weekly timeblocks valid on that date and the accepted
+    reservations (by ID) that overlap it.
+    '''
+
+    def __init__(
+        self,
+        user_role: UserRole,
+        weekly_timeblocks: list[WeeklyTimeblockOut],
+        busy_intervals: dict[int, Interval],
+    ):
+        self.user_role = user_role
+        self.weekly_timeblocks = {wt.id: wt for wt in weekly_timeblocks}
+        self.busy_intervals = busy_intervals
+        self.stored_at = monotonic()
+
+    def get_weekly_timeblocks(self) -> list[WeeklyTimeblockOut]:
+        return sorted(self.weekly_timeblocks.values(), key=lambda wt: wt.id)
+
+    def get_busy_intervals(self) -> list[Interval]:
+        return list(self.busy_intervals.values())
+
+
+class AvailabilityCalendar:
+    '''
+    In-process, materialized calendar of `CalendarDay`s per user and date.
+
+    Days are loaded lazily by `AvailabilityService`, and then kept up to
+    date incrementally by the write paths of weekly timeblocks and
+    reservations (see `app.utilities.availability_hooks`). Writes made by
+    other processes can't be seen, so days also expire after `max_age`.
+    '''
+
+    def __init__(self, max_users: int = 1000, max_age: float = 300):
+        self.max_users = max_users
+        self.max_age = max_age
+        self.__days_by_user: OrderedDict[int, dict[date, CalendarDay]] = (
+            OrderedDict()
+        )
+        self.__users_by_reservation: dict[int, set[int]] = {}
+        self.__version = 0
+
+    # Reads
+
+    def get_version(self) -> int:
+        '''
+        Must be read before loading a day from the database, and passed to
+        `store_day()`, so that a day loaded while a write was happening is
+        not stored.
+        '''
+        return self.__version
+
+    def get_day(self, user_id: int, on_date: date) -> CalendarDay | None:
+        days = self.__days_by_user.get(user_id)
+        if days is None:
+            return None
+        day = days.get(on_date)
+        if day is None:
+            return None
+        if monotonic() - day.stored_at > self.max_age:
+            del days[on_date]
+            return None
+        self.__days_by_user.move_to_end(user_id)
+        return day
+
+    def store_day(
+        self,
+        user_id: int,
+        on_date: date,
+        day: CalendarDay,
+        version: int,
+    ):
+        if version != self.__version:
+            return
+        if user_id not in self.__days_by_user:
+            self.__days_by_user[user_id] = {}
+            if len(self.__days_by_user) > self.max_users:
+                self.__forget_days_of_user(
+                    next(iter(self.__days_by_user))
+                )
+        self.__days_by_user.move_to_end(user_id)
+        self.__days_by_user[user_id][on_date] = day
+        for reservation_id in day.busy_intervals:
+            self.__users_by_reservation.setdefault(
+                reservation_id, set()
+            ).add(user_id)
+
+    # Incremental updates
+
+    def add_weekly_timeblock(self, weekly_timeblock: WeeklyTimeblock):
+        self.__version += 1
+        days = self.__days_by_user.get(weekly_timeblock.user_id, {})
+        weekly_timeblock = WeeklyTimeblockOut.model_validate(weekly_timeblock)
+        for on_date, day in days.items():
+            if is_weekly_timeblock_valid_on_date(weekly_timeblock, on_date):
+                day.weekly_timeblocks[weekly_timeblock.id] = weekly_timeblock
+
+    def remove_weekly_timeblock(self, weekly_timeblock: WeeklyTimeblock):
+        self.__version += 1
+        for day in self.__days_by_user.get(
+            weekly_timeblock.user_id, {}
+        ).values():
+            day.weekly_timeblocks.pop(weekly_timeblock.id, None)
+
+    def update_reservation(
+        self,
+        reservation_id: int,
+        user_ids: list[int],
+        status: ReservationStatus,
+        start_time: datetime,
+        end_time: datetime,
+    ):
+        '''
+        Applies the current state of a reservation to the days of its tutor
+        and student (`user_ids`): it's busy time only if it's accepted.
+        '''
+        self.remove_reservation(reservation_id)
+        if status != ReservationStatus.ACCEPTED:
+            return
+        for user_id in user_ids:
+            for on_date, day in self.__days_by_user.get(user_id, {}).items():
+                day_start = datetime.combine(on_date, time.min)
+                if (
+                    start_time < day_start + timedelta(days=1) and
+                    end_time > day_start
+                ):
+                    day.busy_intervals[reservation_id] = (start_time, end_time)
+                    self.__users_by_reservation.setdefault(
+                        reservation_id, set()
+                    ).add(user_id)
+
+    def remove_reservation(self, reservation_id: int):
+        self.__version += 1
+        for user_id in self.__users_by_reservation.pop(reservation_id, ()):
+            for day in self.__days_by_user.get(user_id, {}).values():
+                day.busy_intervals.pop(reservation_id, None)
+
+    def forget_user(self, user_id: int):
+        self.__version += 1
+        self.__forget_days_of_user(user_id)
+
+    def clear(self):
+        self.__version += 1
+        self.__days_by_user.clear()
+        self.__users_by_reservation.clear()
+
+    def __forget_days_of_user(self, user_id: int):
+        for day in self.__days_by_user.pop(user_id, {}).values():
+            for reservation_id in day.busy_intervals:
+                user_ids = self.__users_by_reservation.get(reservation_id)
+                if user_ids is not None:
+                    user_ids.discard(user_id)
+                    if not user_ids:
+                        del self.__users_by_reservation[reservation_id]
+
+
+availability_calendar = AvailabilityCalendar()
+
+# Results of `AvailabilityService.get_available_single_timeblocks_of_user()`,
+# keyed by `(user_id, on_date)`:
+availability_cache = AsyncTTLCache(max_size=10000, ttl=60)
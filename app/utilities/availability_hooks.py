@@ -0,0 +1,72 @@
+'''
+Functions that the write paths (CRUD modules) call after committing a change
+that can affect the availability of a user.
+'''
+from app.models.reservation import Reservation
+from app.models.weekly_timeblock import WeeklyTimeblock
+from app.utilities.availability_calendar import (
+    availability_cache,
+    availability_calendar,
+)
+from datetime import datetime, time, timedelta
+
+
+def on_weekly_timeblock_created(weekly_timeblock: WeeklyTimeblock):
+    availability_calendar.add_weekly_timeblock(weekly_timeblock)
+    _invalidate_cached_dates_of_user(weekly_timeblock.user_id)
+
+
+def on_weekly_timeblock_removed(weekly_timeblock: WeeklyTimeblock):
+    availability_calendar.remove_weekly_timeblock(weekly_timeblock)
+    _invalidate_cached_dates_of_user(weekly_timeblock.user_id)
+
+
+def on_reservation_changed(reservation: Reservation, tutor_id: int | None):
+    user_ids = _get_user_ids_of_reservation(reservation, tutor_id)
+    availability_calendar.update_reservation(
+        reservation.id,
+        user_ids,
+        reservation.status,
+        reservation.start_time,
+        reservation.end_time,
+    )
+    _invalidate_cached_dates_of_reservation(reservation, user_ids)
+
+
+def on_reservation_removed(reservation: Reservation, tutor_id: int | None):
+    availability_calendar.remove_reservation(reservation.id)
+    _invalidate_cached_dates_of_reservation(
+        reservation,
+        _get_user_ids_of_reservation(reservation, tutor_id)
+    )
+
+
+def on_user_removed(user_id: int):
+    availability_calendar.forget_user(user_id)
+    _invalidate_cached_dates_of_user(user_id)
+
+
+def _get_user_ids_of_reservation(
+    reservation: Reservation,
+    tutor_id: int | None
+) -> list[int]:
+    return [
+        user_id
+        for user_id in (tutor_id, reservation.student_id)
+        if user_id is not None
+    ]
+
+
+def _invalidate_cached_dates_of_user(user_id: int):
+    availability_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
+def _invalidate_cached_dates_of_reservation(
+    reservation: Reservation,
+    user_ids: list[int]
+):
+    on_date = reservation.start_time.date()
+    while datetime.combine(on_date, time.min) < reservation.end_time:
+        for user_id in user_ids:
+            availability_cache.invalidate((user_id, on_date))
+        on_date += timedelta(days=1)
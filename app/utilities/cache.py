@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+import asyncio
+
+
+class _Flight:
+    '''
+    A computation in progress for a key, shared by every caller that asks
+    for that key before it finishes.
+    '''
+
+    def __init__(self):
+        self.future = asyncio.get_running_loop().create_future()
+        self.is_invalidated = False
+
+
+class _LeaderCancelled(Exception):
+    '''
+    The caller that was computing the value was cancelled (for example,
+    because its client disconnected), so the callers that were waiting for
+    it compute the value themselves.
+    '''
+
+
+class AsyncTTLCache:
+    '''
+    LRU cache whose entries expire after `ttl` seconds, with single-flight
+    protection: concurrent misses on the same key run `compute` only once.
+    `None` values are returned but never stored.
+    '''
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__entries: OrderedDict[Hashable, tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self.__flights: dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+    ):
+        entry = self.__entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > monotonic():
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                return value
+            del self.__entries[key]
+        flight = self.__flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight.future)
+            except _LeaderCancelled:
+                return await self.get_or_compute(key, compute)
+        self.misses += 1
+        flight = _Flight()
+        self.__flights[key] = flight
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            flight.future.set_exception(_LeaderCancelled())
+            flight.future.exception()
+            raise
+        except BaseException as exception:
+            flight.future.set_exception(exception)
+            # Nobody else may be waiting, so mark the exception as retrieved:
+            flight.future.exception()
+            raise
+        finally:
+            if self.__flights.get(key) is flight:
+                del self.__flights[key]
+        flight.future.set_result(value)
+        if value is not None and not flight.is_invalidated:
+            self.__store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        if self.__entries.pop(key, None) is not None:
+            self.invalidations += 1
+        flight = self.__flights.get(key)
+        if flight is not None:
+            flight.is_invalidated = True
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        '''
+        Removes the entries whose key matches the predicate, and prevents
+        the computations in progress for those keys from being stored.
+        '''
+        for key in [key for key in self.__entries if predicate(key)]:
+            del self.__entries[key]
+            self.invalidations += 1
+        for key, flight in self.__flights.items():
+            if predicate(key):
+                flight.is_invalidated = True
+
+    def clear(self):
+        self.__entries.clear()
+        for flight in self.__flights.values():
+            flight.is_invalidated = True
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "size": len(self.__entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def __store(self, key: Hashable, value: Any):
+        self.__entries[key] = (monotonic() + self.ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,174 @@
+'''
+Support for the `Idempotency-Key` header, so that clients can retry a
+request that timed out without running it twice.
+
+The first request with a key runs normally and stores its response. Retries
+with the same key (of the same user, within `IDEMPOTENCY_KEY_TTL_SECONDS`)
+get the stored response, marked with `Idempotent-Replayed: true`, without
+running the request again. Reusing a key for a different request is a 422,
+and retrying while the first request still runs is a 409. The response is
+committed together with the changes of the request. Requests rejected with
+a 4xx store their error like any other response, so retries get the same
+answer. Requests that fail with a 5xx or an unexpected error release the
+key instead, so that retries run again.
+
+Expiry times are in UTC (`datetime.utcnow()`), both when they are written
+and when `IdempotencyKeyCleanupJob` deletes the expired keys.
+'''
+from app.crud.idempotency_key import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+)
+from app.models.idempotency_key import IdempotencyKey
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable
+import hashlib
+import json
+import os
+
+
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv(
+    "IDEMPOTENCY_KEY_TTL_SECONDS", 24 * 60 * 60
+))
+# Requests that run for longer than this are considered dead, so that their
+# keys can be claimed again:
+ABANDONED_IDEMPOTENCY_KEY_SECONDS = 60
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+BeforeCommit = Callable[[Any], Awaitable[None]]
+
+
+async def get_request_fingerprint(request: Request) -> str:
+    '''
+    Hash of the method, path, query parameters and body of the request.
+    '''
+    fingerprint = hashlib.sha256()
+    fingerprint.update(request.method.encode())
+    fingerprint.update(b"\n")
+    fingerprint.update(request.url.path.encode())
+    fingerprint.update(b"\n")
+    fingerprint.update(
+        json.dumps(sorted(request.query_params.multi_items())).encode()
+    )
+    fingerprint.update(b"\n")
+    fingerprint.update(await request.body())
+    return fingerprint.hexdigest()
+
+
+class IdempotentRequest:
+    '''
+    Runs a request at most once per key, replaying the stored response of
+    the first run to the retries. Without a key, it just runs the request.
+
+    The key is only claimed when the request runs, so that requests
+    rejected before (e.g. by the authorization of the endpoint) don't hold
+    it. The handler gets a `before_commit(result)` callback, to call before
+    it commits, which stores the response in the transaction of the
+    request: either both are committed, or neither.
+    '''
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        request: Request | None = None,
+        user_id: int | None = None,
+        key: str | None = None
+    ):
+        self.db = db
+        self.request = request
+        self.user_id = user_id
+        self.key = key
+
+    async def run(
+        self,
+        handle: Callable[[BeforeCommit | None], Awaitable[Any]],
+        response_model: type[BaseModel],
+        status_code: int = 200
+    ):
+        '''
+        Returns the result of `handle(before_commit)`, storing it as
+        `response_model` with `status_code`, or the stored response of a
+        previous run.
+        '''
+        if self.key is None:
+            return await handle(None)
+        idempotency_key, is_claimed = await self.claim()
+        if not is_claimed:
+            return JSONResponse(
+                content=json.loads(idempotency_key.response_body),
+                status_code=idempotency_key.status_code,
+                headers={"Idempotent-Replayed": "true"}
+            )
+        # A rollback expires the row, so its ID is read beforehand:
+        idempotency_key_id = idempotency_key.id
+
+        async def before_commit(result: Any):
+            await complete_idempotency_key(
+                self.db,
+                idempotency_key_id,
+                status_code,
+                json.dumps(jsonable_encoder(
+                    response_model.model_validate(result)
+                ))
+            )
+
+        try:
+            return await handle(before_commit)
+        except HTTPException as error:
+            await self.db.rollback()
+            if error.status_code < 400 or error.status_code >= 500:
+                await release_idempotency_key(self.db, idempotency_key_id)
+                raise
+            # The client's request was rejected, and it would be rejected
+            # again or, worse, accepted once the state changes:
+            await complete_idempotency_key(
+                self.db,
+                idempotency_key_id,
+                error.status_code,
+                json.dumps({"detail": jsonable_encoder(error.detail)})
+            )
+            await self.db.commit()
+            raise
+        except Exception:
+            # Only releases the key if the response wasn't committed, so
+            # that failures after the commit are replayed, not run again:
+            await self.db.rollback()
+            await release_idempotency_key(self.db, idempotency_key_id)
+            raise
+
+    async def claim(self) -> tuple[IdempotencyKey, bool]:
+        '''
+        Claims the key of the user for the request, or finds the stored
+        response of a previous request with the key.
+        '''
+        fingerprint = await get_request_fingerprint(self.request)
+        idempotency_key, is_claimed = await claim_idempotency_key(
+            self.db,
+            self.user_id,
+            self.key,
+            fingerprint,
+            datetime.utcnow(),
+            timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS),
+            timedelta(seconds=ABANDONED_IDEMPOTENCY_KEY_SECONDS)
+        )
+        if idempotency_key is not None and (
+            idempotency_key.fingerprint != fingerprint
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail="The Idempotency-Key was already used for another request"
+            )
+        if idempotency_key is None or (
+            not is_claimed and idempotency_key.status_code is None
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still running"
+            )
+        return idempotency_key, is_claimed
@@ -0,0 +1,103 @@
+'''
+Periodic job that deletes the expired idempotency keys (see
+`app.utilities.idempotency`), so that their table doesn't grow forever.
+
+It runs in every worker process, every
+`IDEMPOTENCY_KEY_CLEANUP_INTERVAL_SECONDS` (0 disables it). Deleting the
+same keys twice is harmless, so it doesn't take a lock.
+'''
+from app.crud.idempotency_key import delete_expired_idempotency_keys
+from app.database import SessionLocal
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from time import perf_counter
+import asyncio
+import logging
+import os
+
+
+DEFAULT_INTERVAL_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyCleanupJob:
+    def __init__(
+        self,
+        session_maker: sessionmaker[AsyncSession],
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS
+    ):
+        self.session_maker = session_maker
+        self.interval_seconds = interval_seconds
+        self.__task: asyncio.Task | None = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.deleted_idempotency_keys = 0
+        self.last_run_deleted_idempotency_keys = 0
+        self.last_run_duration_seconds = 0.0
+        self.total_duration_seconds = 0.0
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        '''
+        Deletes the keys that expired before `now` (in UTC, like their
+        expiry times), and returns how many it deleted.
+        '''
+        if now is None:
+            now = datetime.utcnow()
+        started_at = perf_counter()
+        async with self.session_maker() as session:
+            deleted_idempotency_keys = await delete_expired_idempotency_keys(
+                session, now
+            )
+        duration_seconds = perf_counter() - started_at
+        self.runs += 1
+        self.deleted_idempotency_keys += deleted_idempotency_keys
+        self.last_run_deleted_idempotency_keys = deleted_idempotency_keys
+        self.last_run_duration_seconds = duration_seconds
+        self.total_duration_seconds += duration_seconds
+        return deleted_idempotency_keys
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.failed_runs += 1
+                logger.exception("Deleting expired idempotency keys failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self.interval_seconds <= 0 or self.__task is not None:
+            return
+        self.__task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    def get_stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "deleted_idempotency_keys": self.deleted_idempotency_keys,
+            "last_run_deleted_idempotency_keys": (
+                self.last_run_deleted_idempotency_keys
+            ),
+            "last_run_duration_seconds": self.last_run_duration_seconds,
+            "total_duration_seconds": self.total_duration_seconds,
+        }
+
+
+idempotency_key_cleanup_job = IdempotencyKeyCleanupJob(
+    SessionLocal,
+    interval_seconds=float(os.getenv(
+        "IDEMPOTENCY_KEY_CLEANUP_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS
+    )),
+)
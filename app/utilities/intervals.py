@@ -0,0 +1,88 @@
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+from typing import Iterator
+
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: list[Interval]) -> list[Interval]:
+    '''
+    Sorts the intervals and coalesces the ones that overlap or touch,
+    so that the result is a list of disjoint intervals sorted by start.
+    '''
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def does_interval_overlap_merged_intervals(
+    start: datetime,
+    end: datetime,
+    merged_intervals: list[Interval],
+) -> bool:
+    '''
+    Checks whether `[start, end)` overlaps any of the `merged_intervals`,
+    which must be the output of `merge_intervals()`.
+    '''
+    # The only candidate is the last interval that starts before `end`:
+    index = bisect_right(merged_intervals, (end,)) - 1
+    if index < 0:
+        return False
+    return merged_intervals[index][1] > start
+
+
+def subtract_intervals(
+    merged_intervals: list[Interval],
+    merged_subtrahend: list[Interval],
+) -> list[Interval]:
+    '''
+    Removes the `merged_subtrahend` from the `merged_intervals`, in a single
+    sweep over both lists (which must be outputs of `merge_intervals()`).
+    '''
+    result: list[Interval] = []
+    index = 0
+    for start, end in merged_intervals:
+        # Skip the subtrahend intervals that end before this one starts:
+        while (
+            index < len(merged_subtrahend) and
+            merged_subtrahend[index][1] <= start
+        ):
+            index += 1
+        current_index = index
+        while (
+            current_index < len(merged_subtrahend) and
+            merged_subtrahend[current_index][0] < end
+        ):
+            busy_start, busy_end = merged_subtrahend[current_index]
+            if busy_start > start:
+                result.append((start, busy_start))
+            start = max(start, busy_end)
+            current_index += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def iterate_slots(
+    merged_intervals: list[Interval],
+    duration: timedelta,
+    step: timedelta,
+) -> Iterator[Interval]:
+    '''
+    Yields every `[start, start + duration)` that fits inside one of the
+    `merged_intervals`, with `start` aligned to multiples of `step` counted
+    from the midnight of its day.
+    '''
+    for start, end in merged_intervals:
+        midnight = datetime.combine(start.date(), time.min)
+        steps_since_midnight = -(-(start - midnight) // step)
+        slot_start = midnight + steps_since_midnight * step
+        while slot_start + duration <= end:
+            yield (slot_start, slot_start + duration)
+            slot_start += step
@@ -0,0 +1,83 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable
+from weakref import WeakValueDictionary
+import asyncio
+
+
+# First key of the two-key PostgreSQL advisory locks taken on the schedule of
+# a user (the second key is the user ID), so that they don't collide with
+# other advisory locks:
+SCHEDULE_LOCK_NAMESPACE = 1
+# Same, for the advisory locks taken by periodic jobs (the second key is the
+# ID of the job):
+JOB_LOCK_NAMESPACE = 2
+
+# IDs of the periodic jobs:
+RESERVATION_EXPIRY_JOB_ID = 1
+
+_in_process_schedule_locks: WeakValueDictionary[int, asyncio.Lock] = (
+    WeakValueDictionary()
+)
+
+
+@asynccontextmanager
+async def lock_schedule_of_user(db_session: AsyncSession, user_id: int):
+    '''
+    Serializes the writes that check the schedule of a user and then change
+    it, such as validating and inserting a reservation of a tutor.
+
+    On PostgreSQL, it takes a transaction-level advisory lock, which is held
+    until the session commits or rolls back, so the commit must happen inside
+    the `async with`. Other databases (SQLite in the tests) fall back to an
+    in-process `asyncio.Lock` per user, which only protects a single process.
+    '''
+    if db_session.get_bind().dialect.name == "postgresql":
+        await db_session.execute(select(
+            func.pg_advisory_xact_lock(SCHEDULE_LOCK_NAMESPACE, user_id)
+        ))
+        yield
+        return
+    lock = _in_process_schedule_locks.get(user_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _in_process_schedule_locks[user_id] = lock
+    async with lock:
+        yield
+
+
+@asynccontextmanager
+async def lock_schedules_of_users(
+    db_session: AsyncSession,
+    user_ids: Iterable[int]
+):
+    '''
+    Same as `lock_schedule_of_user()`, for the schedules of several users.
+    The locks are taken by ascending user ID, so that two writes that lock
+    the same users can't deadlock each other.
+    '''
+    async with AsyncExitStack() as stack:
+        for user_id in sorted(set(user_ids)):
+            await stack.enter_async_context(
+                lock_schedule_of_user(db_session, user_id)
+            )
+        yield
+
+
+async def try_lock_job(db_session: AsyncSession, job_id: int) -> bool:
+    '''
+    Without waiting, tries to take the lock of a periodic job for the
+    current transaction, so that only one worker runs each batch of the job.
+    Returns whether it was taken.
+
+    On PostgreSQL, it's a transaction-level advisory lock, released when the
+    session commits or rolls back. Other databases (SQLite in the tests)
+    have a single worker, so the lock is always taken.
+    '''
+    if db_session.get_bind().dialect.name != "postgresql":
+        return True
+    result = await db_session.execute(select(
+        func.pg_try_advisory_xact_lock(JOB_LOCK_NAMESPACE, job_id)
+    ))
+    return bool(result.scalar())
@@ -0,0 +1,186 @@
+'''
+Publish/subscribe of notifications to users, so that clients are pushed
+the changes to their reservations (through the WebSocket and SSE endpoints
+of `app.api.notifications`) instead of polling for them.
+
+`LocalBroker` only reaches the subscribers of the same process. With more
+than one worker, replace it (`set_notification_broker()`) with a
+`NotificationBroker` backed by an external broker, such as Redis pub/sub
+or PostgreSQL `LISTEN`/`NOTIFY`.
+'''
+from abc import ABC, abstractmethod
+from app.models.reservation import Reservation
+from app.schemas.reservation import ReservationOut
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+import asyncio
+import json
+import time
+
+
+# Notifications that a slow subscriber hasn't read yet; newer ones are
+# dropped, since clients can catch up through `/reservations/changes`:
+MAX_PENDING_NOTIFICATIONS = 100
+
+
+class Subscription:
+    '''
+    Notifications to one user, in the order they were published, read with
+    `async for`.
+    '''
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(
+            MAX_PENDING_NOTIFICATIONS
+        )
+        self.dropped = 0
+
+    def put(self, notification: dict):
+        '''
+        Thread-safe: the publisher may run in another event loop.
+        '''
+        def put_nowait():
+            try:
+                self.queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+        try:
+            is_same_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            is_same_loop = False
+        if is_same_loop:
+            put_nowait()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(put_nowait)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        return await self.queue.get()
+
+
+class NotificationBroker(ABC):
+    @abstractmethod
+    async def publish(self, user_ids: list[int], notification: dict):
+        ...
+
+    @abstractmethod
+    def subscribe(
+        self,
+        user_id: int
+    ) -> AbstractAsyncContextManager[Subscription]:
+        '''
+        A `Subscription` to the notifications of the user, which ends when
+        the context manager exits.
+        '''
+        ...
+
+
+class LocalBroker(NotificationBroker):
+    def __init__(self):
+        self.__subscriptions: dict[int, set[Subscription]] = {}
+
+    async def publish(self, user_ids: list[int], notification: dict):
+        for user_id in set(user_ids):
+            for subscription in list(self.__subscriptions.get(user_id, ())):
+                subscription.put(notification)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        subscription = Subscription(user_id)
+        self.__subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self.__subscriptions[user_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.__subscriptions[user_id]
+
+
+notification_broker: NotificationBroker = LocalBroker()
+
+
+def set_notification_broker(broker: NotificationBroker):
+    global notification_broker
+    notification_broker = broker
+
+
+def get_notification_broker() -> NotificationBroker:
+    return notification_broker
+
+
+async def notify_reservation_event(reservation: Reservation, event: str):
+    '''
+    Tells the student and the tutor of the reservation that it was
+    `"created"`, `"updated"` or `"deleted"`. Called by the CRUD functions
+    after committing.
+    '''
+    await notification_broker.publish(
+        [
+            user_id
+            for user_id in (reservation.student_id, reservation.tutor_id)
+            if user_id is not None
+        ],
+        {
+            "type": f"reservation.{event}",
+            "reservation": ReservationOut.model_validate(
+                reservation
+            ).model_dump(mode="json"),
+        }
+    )
+
+
+def get_seconds_until_expiry(payload: dict) -> float | None:
+    '''
+    Seconds until the `exp` of a decoded JWT, or `None` if it has none.
+    Connections opened with the token are closed when they run out.
+    '''
+    expires_at = payload.get("exp")
+    if expires_at is None:
+        return None
+    return expires_at - time.time()
+
+
+async def iterate_server_sent_events(
+    user_id: int,
+    keep_alive_seconds: float = 15,
+    expires_in_seconds: float | None = None
+):
+    '''
+    The notifications of the user as a `text/event-stream`, with a comment
+    line every `keep_alive_seconds` without notifications, so that proxies
+    don't close the idle connection.
+
+    After `expires_in_seconds` (the lifetime left of the token), it sends a
+    `token.expired` event and ends, so that the client reconnects with a
+    new token.
+    '''
+    expires_at = None
+    if expires_in_seconds is not None:
+        expires_at = time.monotonic() + expires_in_seconds
+    async with notification_broker.subscribe(user_id) as subscription:
+        yield ": connected\n\n"
+        while True:
+            timeout = keep_alive_seconds
+            if expires_at is not None:
+                remaining_seconds = expires_at - time.monotonic()
+                if remaining_seconds <= 0:
+                    yield "event: token.expired\ndata: {}\n\n"
+                    return
+                timeout = min(timeout, remaining_seconds)
+            try:
+                notification = await asyncio.wait_for(
+                    anext(subscription), timeout
+                )
+            except asyncio.TimeoutError:
+                if timeout == keep_alive_seconds:
+                    yield ": keep-alive\n\n"
+                continue
+            yield (
+                f"event: {notification['type']}\n"
+                f"data: {json.dumps(notification)}\n\n"
+            )
@@ -0,0 +1,46 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+
+def encode_cursor(start_time: datetime, id: int) -> str:
+    '''
+    Opaque cursor for keyset pagination on `(start_time, id)`.
+    '''
+    raw_cursor = f"{start_time.isoformat()}|{id}"
+    return urlsafe_b64encode(raw_cursor.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    '''
+    Inverse of `encode_cursor()`. Raises `ValueError` if the cursor is not
+    one of its outputs.
+    '''
+    try:
+        raw_cursor = urlsafe_b64decode(cursor.encode()).decode()
+        start_time, id = raw_cursor.split("|")
+        return datetime.fromisoformat(start_time), int(id)
+    except (UnicodeError, ValueError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+
+
+def encode_change_cursor(position: tuple[int, ...]) -> str:
+    '''
+    Opaque cursor for feeds of changes, made of integers.
+    '''
+    raw_cursor = "|".join(str(part) for part in position)
+    return urlsafe_b64encode(raw_cursor.encode()).decode()
+
+
+def decode_change_cursor(cursor: str, length: int) -> tuple[int, ...]:
+    '''
+    Inverse of `encode_change_cursor()`, for cursors of `length` integers.
+    Raises `ValueError` if the cursor is not one of its outputs.
+    '''
+    try:
+        raw_cursor = urlsafe_b64decode(cursor.encode()).decode()
+        position = tuple(int(part) for part in raw_cursor.split("|"))
+    except (UnicodeError, ValueError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+    if len(position) != length:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
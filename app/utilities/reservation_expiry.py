@@ -0,0 +1,124 @@
+'''
+Periodic job that rejects the pending reservations whose start time has
+passed, so that they don't stay pending forever.
+
+It runs in every worker process, in batches of `RESERVATION_EXPIRY_BATCH_SIZE`
+reservations every `RESERVATION_EXPIRY_INTERVAL_SECONDS` (0 disables it).
+Each batch takes the lock of the job (see `app.utilities.locks`), so only
+one worker at a time expires reservations.
+'''
+from app.crud.reservation import expire_pending_reservations
+from app.database import SessionLocal
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from time import perf_counter
+import asyncio
+import logging
+import os
+
+
+DEFAULT_INTERVAL_SECONDS = 300
+DEFAULT_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationExpiryJob:
+    def __init__(
+        self,
+        session_maker: sessionmaker[AsyncSession],
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self.session_maker = session_maker
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.__task: asyncio.Task | None = None
+        self.runs = 0
+        self.skipped_runs = 0
+        self.failed_runs = 0
+        self.expired_reservations = 0
+        self.last_run_expired_reservations = 0
+        self.last_run_duration_seconds = 0.0
+        self.total_duration_seconds = 0.0
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        '''
+        Expires batches until there is nothing left to expire (or another
+        worker holds the lock), and returns how many reservations it
+        expired.
+        '''
+        if now is None:
+            now = datetime.now()
+        started_at = perf_counter()
+        expired_reservations = 0
+        is_skipped = False
+        while True:
+            async with self.session_maker() as session:
+                batch = await expire_pending_reservations(
+                    session, now, self.batch_size
+                )
+            if batch is None:
+                is_skipped = True
+                break
+            expired_reservations += len(batch)
+            if len(batch) < self.batch_size:
+                break
+        duration_seconds = perf_counter() - started_at
+        self.runs += 1
+        if is_skipped and expired_reservations == 0:
+            self.skipped_runs += 1
+        self.expired_reservations += expired_reservations
+        self.last_run_expired_reservations = expired_reservations
+        self.last_run_duration_seconds = duration_seconds
+        self.total_duration_seconds += duration_seconds
+        return expired_reservations
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.failed_runs += 1
+                logger.exception("Expiring pending reservations failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self.interval_seconds <= 0 or self.__task is not None:
+            return
+        self.__task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    def get_stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped_runs": self.skipped_runs,
+            "failed_runs": self.failed_runs,
+            "expired_reservations": self.expired_reservations,
+            "last_run_expired_reservations": (
+                self.last_run_expired_reservations
+            ),
+            "last_run_duration_seconds": self.last_run_duration_seconds,
+            "total_duration_seconds": self.total_duration_seconds,
+        }
+
+
+reservation_expiry_job = ReservationExpiryJob(
+    SessionLocal,
+    interval_seconds=float(os.getenv(
+        "RESERVATION_EXPIRY_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS
+    )),
+    batch_size=int(os.getenv(
+        "RESERVATION_EXPIRY_BATCH_SIZE", DEFAULT_BATCH_SIZE
+    )),
+)
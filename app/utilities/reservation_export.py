@@ -0,0 +1,60 @@
+'''
+Encodings of the batches of rows yielded by `stream_reservations`, written
+one batch at a time so that a `StreamingResponse` never holds more than one.
+'''
+from datetime import datetime
+from enum import Enum
+from io import StringIO
+from typing import AsyncIterator, Sequence
+import csv
+import json
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _get_exported_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def encode_as_ndjson(
+    batches: AsyncIterator[Sequence[Sequence]],
+    field_names: Sequence[str]
+) -> AsyncIterator[str]:
+    '''
+    One JSON object per line.
+    '''
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(
+                field_names, map(_get_exported_value, row)
+            ))) + "\n"
+            for row in rows
+        )
+
+
+async def encode_as_csv(
+    batches: AsyncIterator[Sequence[Sequence]],
+    field_names: Sequence[str]
+) -> AsyncIterator[str]:
+    '''
+    A header line with the field names, then one line per row.
+    '''
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(field_names)
+    yield buffer.getvalue()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            map(_get_exported_value, row) for row in rows
+        )
+        yield buffer.getvalue()
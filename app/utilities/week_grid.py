@@ -0,0 +1,265 @@
+from app.models.weekly_timeblock import WeeklyTimeblock
+from app.schemas.single_timeblock import SingleTimeblock
+from app.schemas.weekly_timeblock import WeeklyTimeblockOut
+from app.utilities.intervals import Interval, merge_intervals
+from app.utilities.weekdays import (
+    map_enum_weekday_to_int_weekday,
+    map_int_weekday_to_enum_weekday,
+)
+from app.utilities.weekly_timeblocks import is_weekly_timeblock_valid_on_date
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+
+SLOT = timedelta(minutes=5)
+SLOTS_PER_DAY = timedelta(days=1) // SLOT
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+# Like `valid_until`, the end of a day is written as 23:59:59:
+END_OF_DAY = time(23, 59, 59)
+# The timeblocks of `SingleTimeblock`s are not dated, so they are placed on
+# this week:
+UNDATED_WEEK_START = date(2024, 1, 1)
+
+
+def get_week_start(on_date: date) -> date:
+    return on_date - timedelta(days=on_date.weekday())
+
+
+def get_end_datetime(on_date: date, end_hour: time) -> datetime:
+    '''
+    End of a timeblock of `on_date`, where 23:59:59 (or later) is the
+    midnight that ends the day.
+    '''
+    if end_hour >= END_OF_DAY:
+        return datetime.combine(on_date + timedelta(days=1), time.min)
+    return datetime.combine(on_date, end_hour)
+
+
+def is_aligned(duration: timedelta) -> bool:
+    return duration % SLOT == timedelta(0)
+
+
+def _get_run_mask(start_slot: int, end_slot: int) -> int:
+    start_slot = max(0, start_slot)
+    end_slot = min(SLOTS_PER_WEEK, end_slot)
+    if end_slot <= start_slot:
+        return 0
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
+
+
+def _get_hour(slot_of_day: int) -> time:
+    if slot_of_day == SLOTS_PER_DAY:
+        return END_OF_DAY
+    return (datetime.min + slot_of_day * SLOT).time()
+
+
+class WeekGrid:
+    '''
+    A set of the 5-minute slots of a week, stored as the bits of an `int`:
+    bit `i` is the slot that starts `5 * i` minutes after Monday at 00:00.
+
+    Union (`|`), intersection (`&`) and subtraction (`-`) are single integer
+    operations. Boundaries that are not multiples of 5 minutes are rounded
+    so that free time never grows: inwards for free time, outwards for busy
+    time. So a slot-aligned interval is inside the grid exactly when it is
+    inside the free time it was built from.
+    '''
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    # Conversions from intervals and timeblocks
+
+    @staticmethod
+    def from_free_intervals(week_start: date, intervals: list[Interval]):
+        '''
+        Slots of the week that starts on `week_start` (a Monday) that are
+        entirely inside the intervals.
+        '''
+        week_start = datetime.combine(week_start, time.min)
+        bits = 0
+        # Touching intervals are merged first, so that a boundary between
+        # them that is not a multiple of 5 minutes doesn't lose a slot:
+        for start, end in merge_intervals(intervals):
+            bits |= _get_run_mask(
+                -(-(start - week_start) // SLOT),
+                (end - week_start) // SLOT
+            )
+        return WeekGrid(bits)
+
+    @staticmethod
+    def from_busy_intervals(week_start: date, intervals: list[Interval]):
+        '''
+        Slots of the week that starts on `week_start` (a Monday) touched by
+        the intervals; the parts outside of that week are ignored.
+        '''
+        week_start = datetime.combine(week_start, time.min)
+        bits = 0
+        for start, end in intervals:
+            bits |= _get_run_mask(
+                (start - week_start) // SLOT,
+                -(-(end - week_start) // SLOT)
+            )
+        return WeekGrid(bits)
+
+    @staticmethod
+    def from_weekly_timeblocks(
+        week_start: date,
+        weekly_timeblocks: list[WeeklyTimeblock | WeeklyTimeblockOut]
+    ):
+        '''
+        Slots of the week that starts on `week_start` (a Monday) inside the
+        timeblocks valid on their date.
+        '''
+        intervals = []
+        for day in range(7):
+            on_date = week_start + timedelta(days=day)
+            intervals.extend(
+                (
+                    datetime.combine(on_date, weekly_timeblock.start_hour),
+                    get_end_datetime(on_date, weekly_timeblock.end_hour),
+                )
+                for weekly_timeblock in weekly_timeblocks
+                if is_weekly_timeblock_valid_on_date(weekly_timeblock, on_date)
+            )
+        return WeekGrid.from_free_intervals(week_start, intervals)
+
+    @staticmethod
+    def from_single_timeblocks(timeblocks: list[SingleTimeblock]):
+        intervals = []
+        for timeblock in timeblocks:
+            weekday_index = timeblock.weekday_index
+            if weekday_index is None:
+                weekday_index = map_enum_weekday_to_int_weekday(
+                    timeblock.weekday
+                )
+            on_date = UNDATED_WEEK_START + timedelta(days=weekday_index)
+            intervals.append((
+                datetime.combine(on_date, timeblock.start_hour),
+                get_end_datetime(on_date, timeblock.end_hour),
+            ))
+        return WeekGrid.from_free_intervals(UNDATED_WEEK_START, intervals)
+
+    # Conversions to timeblocks and intervals
+
+    def iterate_runs(self) -> Iterator[tuple[int, int]]:
+        '''
+        Yields `(start_slot, end_slot)` of each run of consecutive slots,
+        splitting the runs that cross midnight.
+        '''
+        for weekday_index in range(7):
+            day_offset = weekday_index * SLOTS_PER_DAY
+            day_bits = (self.bits >> day_offset) & DAY_MASK
+            slot = 0
+            while day_bits:
+                # Skip the trailing zeros, then count the trailing ones:
+                zeros = (day_bits & -day_bits).bit_length() - 1
+                day_bits >>= zeros
+                slot += zeros
+                ones = (day_bits ^ (day_bits + 1)).bit_length() - 1
+                yield day_offset + slot, day_offset + slot + ones
+                day_bits >>= ones
+                slot += ones
+
+    def to_single_timeblocks(self) -> list[SingleTimeblock]:
+        '''
+        Converts the grid back to timeblocks, one per connected run, sorted
+        like the output of `SingleTimeblock.merge_connected_timeblocks()`.
+        A run that ends at midnight ends at 23:59:59.
+        '''
+        timeblocks = []
+        for start_slot, end_slot in self.iterate_runs():
+            weekday_index = start_slot // SLOTS_PER_DAY
+            day_offset = weekday_index * SLOTS_PER_DAY
+            timeblocks.append(SingleTimeblock(
+                weekday=map_int_weekday_to_enum_weekday(weekday_index),
+                weekday_index=weekday_index,
+                start_hour=_get_hour(start_slot - day_offset),
+                end_hour=_get_hour(end_slot - day_offset),
+            ))
+        return timeblocks
+
+    def to_intervals(self, week_start: date) -> list[Interval]:
+        week_start = datetime.combine(week_start, time.min)
+        return [
+            (week_start + start_slot * SLOT, week_start + end_slot * SLOT)
+            for start_slot, end_slot in self.iterate_runs()
+        ]
+
+    # Bookable slots
+
+    def get_run_starts(self, length: int) -> 'WeekGrid':
+        '''
+        Slots that start `length` consecutive slots of the grid, found with
+        `O(log(length))` shifts.
+        '''
+        starts = self.bits
+        run_length = 1
+        while run_length < length:
+            # If the runs of `run_length` slots at `i` and `i + shift` are
+            # both in the grid, so is the one of `run_length + shift` at `i`:
+            shift = min(run_length, length - run_length)
+            starts &= starts >> shift
+            run_length += shift
+        return WeekGrid(starts)
+
+    def iterate_slots(
+        self,
+        week_start: date,
+        duration: timedelta,
+        step: timedelta,
+    ) -> Iterator[Interval]:
+        '''
+        Same as `app.utilities.intervals.iterate_slots()` over the runs of
+        the grid, for a `duration` and `step` that are multiples of 5
+        minutes.
+        '''
+        step_slots = step // SLOT
+        day_step_mask = sum(
+            1 << slot for slot in range(0, SLOTS_PER_DAY, step_slots)
+        )
+        step_mask = sum(
+            day_step_mask << (day * SLOTS_PER_DAY) for day in range(7)
+        )
+        starts = self.get_run_starts(duration // SLOT).bits & step_mask
+        week_start = datetime.combine(week_start, time.min)
+        while starts:
+            slot = (starts & -starts).bit_length() - 1
+            starts &= starts - 1
+            slot_start = week_start + slot * SLOT
+            yield (slot_start, slot_start + duration)
+
+    # Set operations
+
+    def __or__(self, other: 'WeekGrid'):
+        return WeekGrid(self.bits | other.bits)
+
+    def __and__(self, other: 'WeekGrid'):
+        return WeekGrid(self.bits & other.bits)
+
+    def __sub__(self, other: 'WeekGrid'):
+        return WeekGrid(self.bits & ~other.bits)
+
+    def __eq__(self, other: object):
+        return isinstance(other, WeekGrid) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __repr__(self):
+        return f"WeekGrid({self.to_single_timeblocks()!r})"
+
+    def overlaps(self, other: 'WeekGrid') -> bool:
+        return self.bits & other.bits != 0
+
+    def covers(self, other: 'WeekGrid') -> bool:
+        return other.bits & ~self.bits == 0
+
+    def count_minutes(self) -> int:
+        return self.bits.bit_count() * SLOT // timedelta(minutes=1)
@@ -1,7 +1,24 @@
 from app.models.weekly_timeblock import WeeklyTimeblock
 from app.schemas.single_timeblock import SingleTimeblock
 from app.utilities.weekdays import map_int_weekday_to_enum_weekday
-from datetime import datetime
+from datetime import date, datetime
+
+
+def is_weekly_timeblock_valid_on_date(
+    weekly_timeblock: WeeklyTimeblock,
+    on_date: date
+):
+    '''
+    In-memory version of the `on_date` filter of
+    `read_weekly_timeblocks_of_user()`.
+    '''
+    weekday = map_int_weekday_to_enum_weekday(on_date.weekday())
+    on_date = datetime(on_date.year, on_date.month, on_date.day)
+    return (
+        weekly_timeblock.weekday == weekday and
+        weekly_timeblock.valid_from <= on_date and
+        weekly_timeblock.valid_until >= on_date
+    )
 
 
 def does_weekly_timeblock_contain_date_time(
@@ -28,21 +45,26 @@ def are_start_time_and_end_time_inside_connected_timeblocks(
     end_time: datetime,
     weekly_timeblocks: list[WeeklyTimeblock],
 ):
-    weekly_timeblocks_that_contain_start_time = [
-        weekly_timeblock
+    if not any(
+        does_weekly_timeblock_contain_date_time(weekly_timeblock, start_time)
         for weekly_timeblock in weekly_timeblocks
-        if does_weekly_timeblock_contain_date_time(weekly_timeblock, start_time)
-    ]
-    weekly_timeblocks_that_contain_end_time = [
-        weekly_timeblock
+    ):
+        return False
+    if not any(
+        does_weekly_timeblock_contain_date_time(weekly_timeblock, end_time)
         for weekly_timeblock in weekly_timeblocks
-        if does_weekly_timeblock_contain_date_time(weekly_timeblock, end_time)
-    ]
-    all_timeblocks = [SingleTimeblock.from_weekly_timeblock(wt) for wt in weekly_timeblocks]
-    for start_weekly_timeblock in weekly_timeblocks_that_contain_start_time:
-        start_timeblock = SingleTimeblock.from_weekly_timeblock(start_weekly_timeblock)
-        for end_weekly_timeblock in weekly_timeblocks_that_contain_end_time:
-            end_timeblock = SingleTimeblock.from_weekly_timeblock(end_weekly_timeblock)
-            if SingleTimeblock.are_timeblocks_connected(start_timeblock, end_timeblock, all_timeblocks):
-                return True
-    return False
+    ):
+        return False
+    # A timeblock that contains an instant always lies inside the connected
+    # component that contains that instant, so it's enough to compare the
+    # components of both instants:
+    merged_timeblocks = SingleTimeblock.merge_connected_timeblocks(
+        SingleTimeblock.from_weekly_timeblocks(weekly_timeblocks)
+    )
+    start_index = SingleTimeblock.find_connected_timeblock_index(
+        merged_timeblocks, start_time.weekday(), start_time.time()
+    )
+    end_index = SingleTimeblock.find_connected_timeblock_index(
+        merged_timeblocks, end_time.weekday(), end_time.time()
+    )
+    return start_index is not None and start_index == end_index
@@ -0,0 +1,152 @@
+'''
+Throughput of reservation creation as concurrent bookers are added.
+
+Every booker books lessons of the same tutor, so every booking contends for
+the schedule lock of that tutor (see `app.utilities.locks`). With
+`--tutors N`, bookings are spread over N tutors instead, to show that the
+lock of one tutor doesn't slow down the bookings of the others.
+
+Usage (from the root of the repository):
+
+    python -m benchmarks.reservation_contention
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.reservation_contention --tutors 4
+
+Without `DATABASE_URL`, a temporary SQLite file is used. The tables are
+dropped and created again, so don't point it to a database you care about.
+'''
+from datetime import datetime, time, timedelta
+from tempfile import gettempdir
+import argparse
+import asyncio
+import os
+import time as clock
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{gettempdir()}/reservation_contention.db"
+)
+
+from app.crud.reservation import validate_and_create_reservation  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.models.private_lesson import PrivateLesson  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.weekly_timeblock import WeeklyTimeblock  # noqa: E402
+from app.schemas.reservation import (  # noqa: E402
+    ReservationCreate,
+    ReservationStatus,
+)
+from app.schemas.weekday import Weekday  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+
+FIRST_DAY = datetime(2030, 1, 7)
+
+
+async def set_up(session_maker, number_of_tutors: int, number_of_students: int):
+    async with session_maker() as session:
+        course = Course(name="Course", description="Description.")
+        tutors = [
+            User(
+                email=f"tutor_{i}@example.com",
+                password="password",
+                name=f"Tutor {i}",
+                role="tutor"
+            )
+            for i in range(number_of_tutors)
+        ]
+        students = [
+            User(
+                email=f"student_{i}@example.com",
+                password="password",
+                name=f"Student {i}",
+                role="student"
+            )
+            for i in range(number_of_students)
+        ]
+        session.add_all([course, *tutors, *students])
+        await session.flush()
+        lessons = [
+            PrivateLesson(tutor_id=tutor.id, course_id=course.id, price=100)
+            for tutor in tutors
+        ]
+        session.add_all(lessons)
+        session.add_all([
+            WeeklyTimeblock(
+                user_id=tutor.id,
+                weekday=weekday,
+                start_hour=time(0),
+                end_hour=time(23, 59, 59),
+                valid_from=FIRST_DAY,
+                valid_until=FIRST_DAY + timedelta(days=3650)
+            )
+            for tutor in tutors
+            for weekday in Weekday
+        ])
+        await session.commit()
+        return [lesson.id for lesson in lessons], [s.id for s in students]
+
+
+async def book(session_maker, lesson_id: int, student_id: int, slot: int):
+    start_time = FIRST_DAY + timedelta(hours=slot)
+    async with session_maker() as session:
+        await validate_and_create_reservation(session, ReservationCreate(
+            private_lesson_id=lesson_id,
+            student_id=student_id,
+            status=ReservationStatus.PENDING,
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=50)
+        ))
+
+
+async def run(engine, concurrency: int, bookings: int, tutors: int) -> float:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    session_maker = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    lesson_ids, student_ids = await set_up(session_maker, tutors, concurrency)
+    slots = iter(range(bookings))
+
+    async def booker(student_id: int):
+        for slot in slots:
+            await book(
+                session_maker,
+                lesson_ids[slot % len(lesson_ids)],
+                student_id,
+                slot
+            )
+
+    started_at = clock.perf_counter()
+    await asyncio.gather(*(booker(student_id) for student_id in student_ids))
+    return bookings / (clock.perf_counter() - started_at)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--tutors", type=int, default=1)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(c) for c in value.split(",")],
+        default=[1, 2, 4, 8, 16, 32]
+    )
+    arguments = parser.parse_args()
+    # One connection per booker, so that the pool doesn't serialize them:
+    engine = create_async_engine(
+        os.environ["DATABASE_URL"],
+        pool_size=max(arguments.concurrency) + 1
+    )
+    print(f"{'bookers':>8} {'bookings/s':>12}")
+    for concurrency in arguments.concurrency:
+        throughput = await run(
+            engine, concurrency, arguments.bookings, arguments.tutors
+        )
+        print(f"{concurrency:>8} {throughput:>12.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
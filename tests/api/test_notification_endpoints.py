@@ -0,0 +1,157 @@
+from app.api.routes import get_db
+from app.auth.auth_handler import create_access_token
+from app.database import Base
+from app.main import app
+from app.models.course import Course
+from app.models.private_lesson import PrivateLesson
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.models.weekly_timeblock import WeeklyTimeblock
+from app.schemas.reservation import ReservationStatus
+from app.schemas.user import UserRole
+from app.schemas.weekday import Weekday
+from datetime import datetime, time, timedelta
+from fastapi.testclient import TestClient
+from fastapi.websockets import WebSocketDisconnect
+from tests.auth_for_tests import get_auth_header_for_tests
+from tests.db_for_tests import db_engine, get_db_for_tests, SessionLocal
+from unittest import IsolatedAsyncioTestCase
+
+
+app.dependency_overrides[get_db] = get_db_for_tests
+
+
+class TestNotificationEndpoints(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.app = TestClient(app)
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.course = Course(name="Test Course", description="Course desc")
+        self.student = User(
+            email="student@test.com",
+            password="pw",
+            name="Student",
+            role="student"
+        )
+        self.tutor = User(
+            email="tutor@test.com",
+            password="pw",
+            name="Tutor",
+            role="tutor"
+        )
+        async with SessionLocal() as session:
+            session.add_all([self.course, self.student, self.tutor])
+            await session.flush()
+            self.lesson = PrivateLesson(
+                tutor_id=self.tutor.id,
+                course_id=self.course.id,
+                price=10000
+            )
+            session.add_all([
+                self.lesson,
+                WeeklyTimeblock(
+                    user_id=self.tutor.id,
+                    weekday=Weekday.MONDAY,
+                    start_hour=time(9),
+                    end_hour=time(17),
+                    valid_from=datetime(2025, 6, 1),
+                    valid_until=datetime(2025, 6, 30),
+                ),
+            ])
+            await session.commit()
+
+    async def asyncTearDown(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def test_tutor_is_notified_of_new_reservations(self):
+        tutor_token = create_access_token({
+            "sub": self.tutor.email,
+            "role": UserRole.tutor,
+            "id": self.tutor.id
+        })
+        with self.app.websocket_connect(
+            f"/notifications/ws?token={tutor_token}"
+        ) as websocket:
+            response = self.app.post(
+                url=f"/reservations/lesson/{self.lesson.id}",
+                params={
+                    "start_time": "2025-06-02T10:00:00",
+                    "end_time": "2025-06-02T11:00:00"
+                },
+                headers=get_auth_header_for_tests(
+                    email=self.student.email,
+                    role=UserRole.student,
+                    user_id=self.student.id
+                ),
+            )
+            notification = websocket.receive_json()
+        self.assertEqual(notification["type"], "reservation.created")
+        self.assertEqual(
+            notification["reservation"]["id"], response.json()["id"]
+        )
+        self.assertEqual(
+            notification["reservation"]["status"],
+            ReservationStatus.PENDING.value
+        )
+
+    async def test_websocket_with_an_invalid_token_is_closed(self):
+        with self.assertRaises(WebSocketDisconnect) as context:
+            with self.app.websocket_connect(
+                "/notifications/ws?token=nope"
+            ) as websocket:
+                websocket.receive_json()
+        self.assertEqual(context.exception.code, 1008)
+
+    async def test_websocket_is_closed_when_the_token_expires(self):
+        tutor_token = create_access_token(
+            {
+                "sub": self.tutor.email,
+                "role": UserRole.tutor,
+                "id": self.tutor.id
+            },
+            expires_delta=timedelta(seconds=2)
+        )
+        with self.assertRaises(WebSocketDisconnect) as context:
+            with self.app.websocket_connect(
+                f"/notifications/ws?token={tutor_token}"
+            ) as websocket:
+                websocket.receive_json()
+        self.assertEqual(context.exception.code, 1008)
+
+    async def test_reservations_rejected_by_deleting_a_user_are_notified(self):
+        async with SessionLocal() as session:
+            reservation = Reservation(
+                student_id=self.student.id,
+                tutor_id=self.tutor.id,
+                private_lesson_id=self.lesson.id,
+                start_time=datetime.now() + timedelta(days=1),
+                end_time=datetime.now() + timedelta(days=1, hours=1),
+                status=ReservationStatus.PENDING
+            )
+            session.add(reservation)
+            await session.commit()
+        tutor_token = create_access_token({
+            "sub": self.tutor.email,
+            "role": UserRole.tutor,
+            "id": self.tutor.id
+        })
+        with self.app.websocket_connect(
+            f"/notifications/ws?token={tutor_token}"
+        ) as websocket:
+            response = self.app.delete(
+                url=f"/users/{self.student.id}",
+                headers=get_auth_header_for_tests(
+                    email=self.student.email,
+                    role=UserRole.student,
+                    user_id=self.student.id
+                ),
+            )
+            notification = websocket.receive_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(notification["type"], "reservation.updated")
+        self.assertEqual(notification["reservation"]["id"], reservation.id)
+        self.assertEqual(
+            notification["reservation"]["status"],
+            ReservationStatus.REJECTED.value
+        )
@@ -4,15 +4,21 @@ from app.crud.private_lesson import PrivateLessonCRUD
 from app.database import Base
 from app.main import app
 from app.models.course import Course
+from app.models.reservation import Reservation
 from app.models.user import User
+from app.models.weekly_timeblock import WeeklyTimeblock
 from app.schemas.private_lesson import (
+    AvailablePrivateLessonPage,
     OfferStatus,
     PrivateLessonBase,
     PrivateLessonCreate,
     PrivateLessonOut,
     PrivateLessonPage
 )
+from app.schemas.reservation import ReservationStatus
 from app.schemas.user import UserCreate, UserRole
+from app.schemas.weekday import Weekday
+from datetime import datetime, time
 from fastapi.testclient import TestClient
 from tests.auth_for_tests import get_auth_header_for_tests
 from tests.db_for_tests import db_engine, get_db_for_tests, SessionLocal
@@ -174,6 +180,136 @@ class TestPrivateLessonEndpoints(IsolatedAsyncioTestCase):
     async def test_get_by_course_id(self):
         pass
 
+    async def test_search_available_private_lessons(self):
+        # Arrange: three tutors with a lesson each. On Tuesday 2025-06-03,
+        # the first one is free from 15:00 to 17:00 (in two connected
+        # timeblocks), the second one has an accepted reservation from 16:00
+        # to 17:00, and the third one only has timeblocks in the morning.
+        async with SessionLocal() as session:
+            tutors = [
+                User(
+                    email=f"tutor_{i}@example.com",
+                    password="password",
+                    name=f"Tutor {i}",
+                    role="tutor"
+                )
+                for i in range(3)
+            ]
+            session.add_all(tutors)
+            await session.commit()
+            lesson_crud = PrivateLessonCRUD(session)
+            lessons = [
+                await lesson_crud.create(PrivateLessonCreate(
+                    tutor_id=tutor.id,
+                    course_id=self.course.id,
+                    price=10000
+                ))
+                for tutor in tutors
+            ]
+            for tutor_index, start_hour, end_hour in [
+                (0, 15, 16), (0, 16, 17), (1, 15, 17), (2, 9, 12)
+            ]:
+                session.add(WeeklyTimeblock(
+                    user_id=tutors[tutor_index].id,
+                    weekday=Weekday.TUESDAY,
+                    start_hour=time(start_hour),
+                    end_hour=time(end_hour),
+                    valid_from=datetime(2025, 6, 1),
+                    valid_until=datetime(2025, 6, 30, 23, 59, 59)
+                ))
+            session.add(Reservation(
+                student_id=self.student.id,
+                private_lesson_id=lessons[1].id,
+                tutor_id=tutors[1].id,
+                status=ReservationStatus.ACCEPTED,
+                start_time=datetime(2025, 6, 3, 16),
+                end_time=datetime(2025, 6, 3, 17)
+            ))
+            await session.commit()
+        # Act:
+        response = self.app.get(
+            url="/private-lessons/available",
+            params={
+                "course_id": self.course.id,
+                "start_time": "2025-06-03T15:00:00",
+                "end_time": "2025-06-03T17:00:00"
+            }
+        )
+        # Assert:
+        page = AvailablePrivateLessonPage.model_validate(response.json())
+        self.assertFalse(page.has_more)
+        self.assertEqual([lesson.id for lesson in page.results], [lessons[0].id])
+
+    async def test_search_available_private_lessons_by_pages(self):
+        # Arrange: five tutors with a lesson each. On Tuesday 2025-06-03,
+        # the second one has a gap from 16:00 to 16:30, and the others are
+        # free from 15:00 to 17:00 (the fourth one in overlapping
+        # timeblocks).
+        async with SessionLocal() as session:
+            tutors = [
+                User(
+                    email=f"tutor_{i}@example.com",
+                    password="password",
+                    name=f"Tutor {i}",
+                    role="tutor"
+                )
+                for i in range(5)
+            ]
+            session.add_all(tutors)
+            await session.commit()
+            lesson_crud = PrivateLessonCRUD(session)
+            lessons = [
+                await lesson_crud.create(PrivateLessonCreate(
+                    tutor_id=tutor.id,
+                    course_id=self.course.id,
+                    price=10000
+                ))
+                for tutor in tutors
+            ]
+            for tutor_index, start_hour, end_hour in [
+                (0, time(15), time(17)),
+                (1, time(15), time(16)),
+                (1, time(16, 30), time(17)),
+                (2, time(15), time(17)),
+                (3, time(14), time(16, 30)),
+                (3, time(15), time(17)),
+                (4, time(15), time(17)),
+            ]:
+                session.add(WeeklyTimeblock(
+                    user_id=tutors[tutor_index].id,
+                    weekday=Weekday.TUESDAY,
+                    start_hour=start_hour,
+                    end_hour=end_hour,
+                    valid_from=datetime(2025, 6, 1),
+                    valid_until=datetime(2025, 6, 30, 23, 59, 59)
+                ))
+            await session.commit()
+        # Act:
+        pages = [
+            AvailablePrivateLessonPage.model_validate(self.app.get(
+                url="/private-lessons/available",
+                params={
+                    "course_id": self.course.id,
+                    "start_time": "2025-06-03T15:00:00",
+                    "end_time": "2025-06-03T17:00:00",
+                    "page": page,
+                    "page_size": 2,
+                }
+            ).json())
+            for page in [1, 2]
+        ]
+        # Assert:
+        self.assertEqual(
+            [
+                ([lesson.id for lesson in page.results], page.has_more)
+                for page in pages
+            ],
+            [
+                ([lessons[0].id, lessons[2].id], True),
+                ([lessons[3].id, lessons[4].id], False),
+            ]
+        )
+
     async def test_update_private_lesson_endpoint(self):
         payload = {
             "course_id": self.course.id,
@@ -3,6 +3,7 @@ from app.crud.reservation import create_reservation
 from app.database import Base
 from app.main import app
 from app.models.course import Course
+from app.models.idempotency_key import IdempotencyKey
 from app.models.private_lesson import PrivateLesson
 from app.models.reservation import Reservation
 from app.models.user import User
@@ -16,12 +17,15 @@ from app.schemas.user import UserRole
 from app.schemas.weekday import Weekday
 from app.schemas.weekly_timeblock import WeeklyTimeblockCreate
 from datetime import datetime, time
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from jose import jwt
-from sqlalchemy import select
+from sqlalchemy import select, update
 from tests.auth_for_tests import get_auth_header_for_tests
 from tests.db_for_tests import db_engine, get_db_for_tests, SessionLocal
 from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+import json
 import os
 
 
@@ -36,6 +40,9 @@ class TestReservationEndpoints(IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         # Initialize test clienta and database:
         self.app = TestClient(app)
+        self.admin_headers = get_auth_header_for_tests(
+            email="admin@test.com", role="admin", user_id=999
+        )
         async with db_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         # Create example course, student, and tutor:
@@ -97,6 +104,204 @@ class TestReservationEndpoints(IsolatedAsyncioTestCase):
         )
         self.assertEqual(returned_reservation, expected_reservation)
 
+    async def test_post_reservation_with_an_idempotency_key(self):
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+            "Idempotency-Key": "2f7c5a1e",
+        }
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        # Act: send the request, retry it, and reuse its key for another one.
+        first_response = self.app.post(url, params=params, headers=headers)
+        retry_response = self.app.post(url, params=params, headers=headers)
+        other_request_response = self.app.post(
+            url,
+            params={**params, "end_time": "2025-06-02T12:00:00"},
+            headers=headers
+        )
+        # Assert:
+        self.assertEqual(first_response.status_code, 200)
+        self.assertEqual(retry_response.status_code, 200)
+        self.assertEqual(retry_response.json(), first_response.json())
+        self.assertEqual(retry_response.headers["Idempotent-Replayed"], "true")
+        self.assertNotIn("Idempotent-Replayed", first_response.headers)
+        self.assertEqual(other_request_response.status_code, 422)
+        async with SessionLocal() as session:
+            reservation_ids = (await session.scalars(
+                select(Reservation.id)
+            )).all()
+        self.assertEqual(reservation_ids, [first_response.json()["id"]])
+
+    async def test_rejected_request_with_an_idempotency_key_is_replayed(self):
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+            "Idempotency-Key": "2f7c5a1e",
+        }
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        async with SessionLocal() as session:
+            self.lesson.offer_status = "closed"
+            session.add(self.lesson)
+            await session.commit()
+        failed_response = self.app.post(url, params=params, headers=headers)
+        # The retry gets the same answer, even though the lesson reopened:
+        async with SessionLocal() as session:
+            self.lesson.offer_status = "open"
+            session.add(self.lesson)
+            await session.commit()
+        retry_response = self.app.post(url, params=params, headers=headers)
+        self.assertEqual(failed_response.status_code, 400)
+        self.assertEqual(retry_response.status_code, 400)
+        self.assertEqual(retry_response.json(), failed_response.json())
+        self.assertEqual(retry_response.headers["Idempotent-Replayed"], "true")
+        async with SessionLocal() as session:
+            reservation_ids = (await session.scalars(
+                select(Reservation.id)
+            )).all()
+        self.assertEqual(reservation_ids, [])
+
+    async def test_conflicts_and_unprocessable_requests_are_replayed(self):
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        for status_code in [409, 422]:
+            with self.subTest(status_code=status_code):
+                headers = {
+                    **get_auth_header_for_tests(
+                        email=self.student.email,
+                        role=UserRole.student,
+                        user_id=self.student.id
+                    ),
+                    "Idempotency-Key": f"key-{status_code}",
+                }
+                with patch(
+                    "app.api.reservations.validate_and_create_reservation",
+                    side_effect=HTTPException(
+                        status_code=status_code, detail="Rejected"
+                    )
+                ):
+                    failed_response = self.app.post(
+                        url, params=params, headers=headers
+                    )
+                retry_response = self.app.post(
+                    url, params=params, headers=headers
+                )
+                self.assertEqual(failed_response.status_code, status_code)
+                self.assertEqual(retry_response.status_code, status_code)
+                self.assertEqual(
+                    retry_response.json(), {"detail": "Rejected"}
+                )
+                self.assertEqual(
+                    retry_response.headers["Idempotent-Replayed"], "true"
+                )
+
+    async def test_failed_request_with_an_idempotency_key_can_be_retried(self):
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+            "Idempotency-Key": "2f7c5a1e",
+        }
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        # Act: fail with a 5xx, then with an unexpected error, and retry.
+        with patch(
+            "app.api.reservations.validate_and_create_reservation",
+            side_effect=HTTPException(status_code=503, detail="Unavailable")
+        ):
+            unavailable_response = self.app.post(
+                url, params=params, headers=headers
+            )
+        with patch(
+            "app.api.reservations.validate_and_create_reservation",
+            side_effect=RuntimeError("The database is down")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.app.post(url, params=params, headers=headers)
+        retry_response = self.app.post(url, params=params, headers=headers)
+        # Assert: neither failure kept the key.
+        self.assertEqual(unavailable_response.status_code, 503)
+        self.assertEqual(retry_response.status_code, 200)
+        self.assertNotIn("Idempotent-Replayed", retry_response.headers)
+
+    async def test_forbidden_request_does_not_claim_the_idempotency_key(self):
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.tutor.email,
+                role=UserRole.tutor,
+                user_id=self.tutor.id
+            ),
+            "Idempotency-Key": "2f7c5a1e",
+        }
+        first_response = self.app.post(url, params=params, headers=headers)
+        retry_response = self.app.post(url, params=params, headers=headers)
+        self.assertEqual(first_response.status_code, 403)
+        self.assertEqual(retry_response.status_code, 403)
+        async with SessionLocal() as session:
+            idempotency_keys = (await session.scalars(
+                select(IdempotencyKey)
+            )).all()
+        self.assertEqual(idempotency_keys, [])
+
+    async def test_failure_after_the_commit_is_replayed(self):
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+            "Idempotency-Key": "2f7c5a1e",
+        }
+        params = {
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00"
+        }
+        url = f"/reservations/lesson/{self.lesson.id}"
+        # Act: fail the notification sent after the reservation is
+        # committed, and retry.
+        with patch(
+            "app.crud.reservation.notify_reservation_event",
+            side_effect=RuntimeError("The broker is down")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.app.post(url, params=params, headers=headers)
+        retry_response = self.app.post(url, params=params, headers=headers)
+        # Assert: the retry gets the committed reservation.
+        async with SessionLocal() as session:
+            reservation_ids = (await session.scalars(
+                select(Reservation.id)
+            )).all()
+        self.assertEqual(len(reservation_ids), 1)
+        self.assertEqual(retry_response.status_code, 200)
+        self.assertEqual(retry_response.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(retry_response.json()["id"], reservation_ids[0])
+
     async def test_get_all_reservations_endpoint(self):
         async with SessionLocal() as db_session:
             await create_reservation(
@@ -117,10 +322,386 @@ class TestReservationEndpoints(IsolatedAsyncioTestCase):
                     start_time=datetime(2025, 6, 2, 10, 0, 0),
                     end_time=datetime(2025, 6, 2, 11, 0, 0)
                 ))
-        resp = self.app.get("/reservations")
+        resp = self.app.get("/reservations", headers=self.admin_headers)
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.json()), 2)
 
+    async def test_get_all_reservations_is_only_for_admins(self):
+        anonymous_response = self.app.get("/reservations")
+        student_response = self.app.get(
+            "/reservations",
+            headers=get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            )
+        )
+        self.assertEqual(anonymous_response.status_code, 401)
+        self.assertEqual(student_response.status_code, 403)
+
+    async def test_get_all_reservations_by_pages(self):
+        # Arrange: five reservations, two of them at the same time.
+        async with SessionLocal() as db_session:
+            for day, status in [
+                (5, ReservationStatus.PENDING),
+                (2, ReservationStatus.PENDING),
+                (3, ReservationStatus.REJECTED),
+                (2, ReservationStatus.PENDING),
+                (4, ReservationStatus.PENDING),
+            ]:
+                await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=status,
+                        start_time=datetime(2025, 6, day, 10, 0, 0),
+                        end_time=datetime(2025, 6, day, 11, 0, 0)
+                    ))
+        # Act: follow the cursors, two reservations at a time.
+        pages = []
+        params = {"limit": 2}
+        while True:
+            response = self.app.get(
+                "/reservations", params=params, headers=self.admin_headers
+            )
+            pages.append([r["start_time"][8:10] for r in response.json()])
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+        filtered_reservations = self.app.get(
+            "/reservations",
+            params={
+                "from_date": "2025-06-03",
+                "to_date": "2025-06-04",
+                "status": ReservationStatus.PENDING.value
+            },
+            headers=self.admin_headers
+        ).json()
+        # Assert:
+        self.assertEqual(pages, [["02", "02"], ["03", "04"], ["05"]])
+        self.assertEqual(
+            [r["start_time"] for r in filtered_reservations],
+            ["2025-06-04T10:00:00"]
+        )
+
+    async def test_browsers_can_read_the_next_cursor(self):
+        response = self.app.get(
+            "/reservations",
+            headers={
+                **self.admin_headers,
+                "Origin": "https://teacheruc.example",
+            }
+        )
+        self.assertIn(
+            "X-Next-Cursor",
+            response.headers["Access-Control-Expose-Headers"]
+        )
+
+    async def test_get_reservations_with_an_invalid_cursor(self):
+        response = self.app.get(
+            "/reservations",
+            params={"cursor": "nope"},
+            headers=self.admin_headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_reservation_changes(self):
+        # Arrange: three reservations, synced by the student. Then, the
+        # tutor accepts the first one and the student deletes the second.
+        async with SessionLocal() as db_session:
+            accepted, deleted, unchanged = [
+                await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=ReservationStatus.PENDING,
+                        start_time=datetime(2025, 6, 2, hour, 0, 0),
+                        end_time=datetime(2025, 6, 2, hour + 1, 0, 0)
+                    ))
+                for hour in (10, 12, 14)
+            ]
+        student_headers = get_auth_header_for_tests(
+            email=self.student.email,
+            role=UserRole.student,
+            user_id=self.student.id
+        )
+        first_sync = self.app.get(
+            "/reservations/changes", headers=student_headers
+        ).json()
+        self.app.patch(
+            url=f"/reservations/tutor/{accepted.id}",
+            json={"status": ReservationStatus.ACCEPTED},
+            headers=get_auth_header_for_tests(
+                email=self.tutor.email,
+                role=UserRole.tutor,
+                user_id=self.tutor.id
+            ),
+        )
+        self.app.delete(
+            f"/reservations/{deleted.id}", headers=student_headers
+        )
+        # Act:
+        recent_changes = self.app.get(
+            "/reservations/changes",
+            params={"since": first_sync["cursor"]},
+            headers=student_headers
+        ).json()
+        no_changes = self.app.get(
+            "/reservations/changes",
+            params={"since": recent_changes["cursor"]},
+            headers=student_headers
+        ).json()
+        # Assert:
+        self.assertEqual(
+            [r["id"] for r in first_sync["changed"]],
+            [accepted.id, deleted.id, unchanged.id]
+        )
+        self.assertEqual(first_sync["deleted"], [])
+        self.assertFalse(first_sync["has_more"])
+        self.assertEqual(
+            [(r["id"], r["status"]) for r in recent_changes["changed"]],
+            [(accepted.id, ReservationStatus.ACCEPTED.value)]
+        )
+        self.assertEqual(
+            [r["reservation_id"] for r in recent_changes["deleted"]],
+            [deleted.id]
+        )
+        self.assertEqual(
+            (no_changes["changed"], no_changes["deleted"]), ([], [])
+        )
+        self.assertEqual(no_changes["cursor"], recent_changes["cursor"])
+
+    async def test_get_reservation_changes_by_pages(self):
+        # Arrange: three reservations, and the deletion of the last one.
+        async with SessionLocal() as db_session:
+            reservations = [
+                await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=ReservationStatus.PENDING,
+                        start_time=datetime(2025, 6, 2, hour, 0, 0),
+                        end_time=datetime(2025, 6, 2, hour + 1, 0, 0)
+                    ))
+                for hour in (10, 12, 14)
+            ]
+        admin_headers = get_auth_header_for_tests(
+            email="admin@test.com", role="admin", user_id=999
+        )
+        # Act: follow the cursors, two changes at a time, deleting a
+        # reservation after the first page.
+        pages = []
+        params = {"limit": 2}
+        while True:
+            page = self.app.get(
+                "/reservations/changes", params=params, headers=admin_headers
+            ).json()
+            pages.append((
+                [r["id"] for r in page["changed"]],
+                [r["reservation_id"] for r in page["deleted"]],
+            ))
+            if len(pages) == 1:
+                self.app.delete(
+                    f"/reservations/{reservations[0].id}",
+                    headers=get_auth_header_for_tests(
+                        email=self.student.email,
+                        role=UserRole.student,
+                        user_id=self.student.id
+                    )
+                )
+            params["since"] = page["cursor"]
+            if not page["has_more"]:
+                break
+        invalid_cursor_response = self.app.get(
+            "/reservations/changes",
+            params={"since": "nope"},
+            headers=admin_headers
+        )
+        # Assert: the deletion of a reservation that was already sent
+        # comes after the rest of them.
+        self.assertEqual(pages, [
+            ([reservations[0].id, reservations[1].id], []),
+            ([reservations[2].id], [reservations[0].id]),
+        ])
+        self.assertEqual(invalid_cursor_response.status_code, 400)
+
+    async def test_get_reservation_calendar(self):
+        # Arrange: reservations on June 1st, 2nd and 3rd.
+        async with SessionLocal() as db_session:
+            reservations = [
+                await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=ReservationStatus.PENDING,
+                        start_time=datetime(2025, 6, day, 10, 0, 0),
+                        end_time=datetime(2025, 6, day, 11, 0, 0)
+                    ))
+                for day in (3, 1, 2)
+            ]
+        student_headers = get_auth_header_for_tests(
+            email=self.student.email,
+            role=UserRole.student,
+            user_id=self.student.id
+        )
+        tutor_headers = get_auth_header_for_tests(
+            email=self.tutor.email,
+            role=UserRole.tutor,
+            user_id=self.tutor.id
+        )
+        window = {"from": "2025-06-01T10:00:00", "to": "2025-06-03T10:00:00"}
+        # Act:
+        student_calendar = self.app.get(
+            "/reservations/calendar", params=window, headers=student_headers
+        )
+        tutor_calendar = self.app.get(
+            "/reservations/calendar", params=window, headers=tutor_headers
+        )
+        inverted_window_response = self.app.get(
+            "/reservations/calendar",
+            params={"from": window["to"], "to": window["from"]},
+            headers=student_headers
+        )
+        too_long_window_response = self.app.get(
+            "/reservations/calendar",
+            params={"from": "2025-01-01T00:00:00", "to": "2026-01-01T00:00:00"},
+            headers=student_headers
+        )
+        # Assert:
+        self.assertEqual(student_calendar.status_code, 200)
+        self.assertEqual(
+            [r["id"] for r in student_calendar.json()],
+            [reservations[1].id, reservations[2].id]
+        )
+        self.assertEqual(
+            set(student_calendar.json()[0]),
+            {
+                "id", "private_lesson_id", "student_id", "tutor_id",
+                "status", "start_time", "end_time",
+            }
+        )
+        self.assertEqual(tutor_calendar.json(), student_calendar.json())
+        self.assertEqual(inverted_window_response.status_code, 400)
+        self.assertEqual(too_long_window_response.status_code, 400)
+
+    async def test_export_reservations(self):
+        async with SessionLocal() as db_session:
+            for day, status in [
+                (3, ReservationStatus.REJECTED),
+                (2, ReservationStatus.PENDING),
+            ]:
+                await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=status,
+                        start_time=datetime(2025, 6, day, 10, 0, 0),
+                        end_time=datetime(2025, 6, day, 11, 0, 0)
+                    ))
+        admin_headers = get_auth_header_for_tests(
+            email="admin@test.com", role=UserRole.admin, user_id=999
+        )
+        ndjson_response = self.app.get(
+            "/reservations/export", headers=admin_headers
+        )
+        csv_response = self.app.get(
+            "/reservations/export",
+            params={"format": "csv", "status": "rejected"},
+            headers=admin_headers
+        )
+        student_response = self.app.get(
+            "/reservations/export",
+            headers=get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            )
+        )
+        # NDJSON, ordered by start time:
+        self.assertEqual(ndjson_response.status_code, 200)
+        self.assertTrue(
+            ndjson_response.headers["content-type"].startswith(
+                "application/x-ndjson"
+            )
+        )
+        lines = [
+            json.loads(line)
+            for line in ndjson_response.text.splitlines()
+        ]
+        self.assertEqual(
+            [(r["start_time"], r["status"], r["tutor_id"]) for r in lines],
+            [
+                ("2025-06-02T10:00:00", "pending", self.tutor.id),
+                ("2025-06-03T10:00:00", "rejected", self.tutor.id),
+            ]
+        )
+        # CSV, filtered by status:
+        self.assertEqual(csv_response.status_code, 200)
+        self.assertEqual(csv_response.text.splitlines()[0], (
+            "id,private_lesson_id,student_id,tutor_id,status,start_time,"
+            "end_time"
+        ))
+        self.assertEqual(len(csv_response.text.splitlines()), 2)
+        self.assertIn(",rejected,2025-06-03T10:00:00,", csv_response.text)
+        # Only for admins:
+        self.assertEqual(student_response.status_code, 403)
+
+    async def test_get_reservations_with_sparse_fieldsets(self):
+        async with SessionLocal() as db_session:
+            reservation = await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=self.student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.PENDING,
+                    start_time=datetime(2025, 6, 2, 10, 0, 0),
+                    end_time=datetime(2025, 6, 2, 11, 0, 0)
+                ))
+        complete = self.app.get("/reservations", headers=self.admin_headers).json()
+        only_times = self.app.get(
+            "/reservations",
+            params={"fields": "start_time,end_time,status"},
+            headers=self.admin_headers
+        ).json()
+        with_tutor = self.app.get(
+            "/reservations",
+            params={"fields": "id", "include": "private_lesson.tutor"},
+            headers=self.admin_headers
+        ).json()
+        unknown_field = self.app.get(
+            "/reservations",
+            params={"fields": "id,password"},
+            headers=self.admin_headers
+        )
+        self.assertEqual(
+            set(complete[0]),
+            {
+                "id", "private_lesson_id", "student_id", "status",
+                "start_time", "end_time", "created_at", "updated_at",
+                "student", "private_lesson",
+            }
+        )
+        self.assertEqual(set(complete[0]["private_lesson"]["course"]), {
+            "id", "name", "description"
+        })
+        self.assertEqual(only_times, [{
+            "start_time": "2025-06-02T10:00:00",
+            "end_time": "2025-06-02T11:00:00",
+            "status": ReservationStatus.PENDING.value,
+        }])
+        self.assertEqual(set(with_tutor[0]), {"id", "private_lesson"})
+        self.assertEqual(with_tutor[0]["id"], reservation.id)
+        self.assertNotIn("course", with_tutor[0]["private_lesson"])
+        self.assertEqual(
+            with_tutor[0]["private_lesson"]["tutor"]["id"], self.tutor.id
+        )
+        self.assertEqual(unknown_field.status_code, 400)
+
     async def test_get_student_reservations_endpoint(self):
         # Usar endpoint POST + GET /reservations/student
         token_s = generate_token(self.student.id, "student")
@@ -210,3 +791,251 @@ class TestReservationEndpoints(IsolatedAsyncioTestCase):
         # Assert: Should return 400 error
         self.assertEqual(response.status_code, 400)
         self.assertIn("Cannot create reservation for a closed private lesson", response.json()["detail"])
+
+    async def test_cannot_create_reservation_around_an_accepted_one(self):
+        # Arrange: an accepted reservation from 10:00 to 11:00.
+        async with SessionLocal() as db_session:
+            await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=self.student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.ACCEPTED,
+                    start_time=datetime(2025, 6, 2, 10, 0, 0),
+                    end_time=datetime(2025, 6, 2, 11, 0, 0)
+                ))
+
+        # Act: request a reservation that contains the accepted one.
+        response = self.app.post(
+            url=f"/reservations/lesson/{self.lesson.id}",
+            params={
+                "start_time": "2025-06-02T09:00:00",
+                "end_time": "2025-06-02T12:00:00"
+            },
+            headers=get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+        )
+
+        # Assert:
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Tutor is not available", response.json()["detail"])
+
+    async def test_create_reservation_copies_tutor_of_lesson(self):
+        async with SessionLocal() as db_session:
+            reservation = await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=self.student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.PENDING,
+                    start_time=datetime(2025, 6, 2, 10, 0, 0),
+                    end_time=datetime(2025, 6, 2, 11, 0, 0)
+                ))
+        self.assertEqual(reservation.tutor_id, self.tutor.id)
+
+    async def test_cannot_accept_reservation_overlapping_an_accepted_one(self):
+        # Arrange: an accepted reservation from 10:00 to 11:00 and
+        # a pending one, of another student, from 10:30 to 11:30.
+        other_student = User(
+            email="other@test.com",
+            password="pw",
+            name="Other",
+            role="student"
+        )
+        async with SessionLocal() as db_session:
+            db_session.add(other_student)
+            await db_session.commit()
+            await db_session.refresh(other_student)
+            await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=self.student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.ACCEPTED,
+                    start_time=datetime(2025, 6, 2, 10, 0, 0),
+                    end_time=datetime(2025, 6, 2, 11, 0, 0)
+                ))
+            pending_reservation = await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=other_student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.PENDING,
+                    start_time=datetime(2025, 6, 2, 10, 30, 0),
+                    end_time=datetime(2025, 6, 2, 11, 30, 0)
+                ))
+
+        # Act: the tutor accepts the pending one.
+        response = self.app.patch(
+            url=f"/reservations/tutor/{pending_reservation.id}",
+            json={"status": ReservationStatus.ACCEPTED},
+            headers=get_auth_header_for_tests(
+                email=self.tutor.email,
+                role=UserRole.tutor,
+                user_id=self.tutor.id
+            ),
+        )
+
+        # Assert:
+        self.assertEqual(response.status_code, 409)
+        async with SessionLocal() as db_session:
+            reservation = await db_session.get(
+                Reservation, pending_reservation.id
+            )
+        self.assertEqual(reservation.status, ReservationStatus.PENDING)
+
+    async def create_pending_reservations(self, hours: list[tuple[int, int]]):
+        reservations = []
+        async with SessionLocal() as db_session:
+            for start_hour, end_hour in hours:
+                reservations.append(await create_reservation(
+                    db_session,
+                    ReservationCreate(
+                        student_id=self.student.id,
+                        private_lesson_id=self.lesson.id,
+                        status=ReservationStatus.PENDING,
+                        start_time=datetime(2025, 6, 2, start_hour),
+                        end_time=datetime(2025, 6, 2, end_hour)
+                    )))
+        return reservations
+
+    async def test_bulk_decisions_reject_overlapping_pending_reservations(self):
+        # Arrange: 9-10 and 10-11 don't overlap, 10-12 overlaps 10-11,
+        # and 12-13 overlaps neither.
+        first, second, overlapping, other = (
+            await self.create_pending_reservations(
+                [(9, 10), (10, 11), (10, 12), (12, 13)]
+            )
+        )
+        # Act:
+        response = self.app.patch(
+            url="/reservations/tutor",
+            json={"accept": [first.id, second.id], "reject": [other.id]},
+            headers=get_auth_header_for_tests(
+                email=self.tutor.email,
+                role=UserRole.tutor,
+                user_id=self.tutor.id
+            ),
+        )
+        # Assert:
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(
+            {r["id"]: r["status"] for r in body["updated"]},
+            {
+                first.id: ReservationStatus.ACCEPTED.value,
+                second.id: ReservationStatus.ACCEPTED.value,
+                other.id: ReservationStatus.REJECTED.value,
+            }
+        )
+        self.assertEqual(
+            [(r["id"], r["status"]) for r in body["auto_rejected"]],
+            [(overlapping.id, ReservationStatus.REJECTED.value)]
+        )
+
+    async def test_bulk_decisions_are_all_or_nothing(self):
+        # Arrange: two pending reservations that overlap each other.
+        first, second = await self.create_pending_reservations(
+            [(10, 11), (10, 12)]
+        )
+        headers = get_auth_header_for_tests(
+            email=self.tutor.email,
+            role=UserRole.tutor,
+            user_id=self.tutor.id
+        )
+        # Act: accept both, and then one of them and an unknown one.
+        overlapping_response = self.app.patch(
+            url="/reservations/tutor",
+            json={"accept": [first.id, second.id]},
+            headers=headers,
+        )
+        unknown_response = self.app.patch(
+            url="/reservations/tutor",
+            json={"accept": [first.id], "reject": [999]},
+            headers=headers,
+        )
+        # Assert:
+        self.assertEqual(overlapping_response.status_code, 409)
+        self.assertEqual(unknown_response.status_code, 404)
+        async with SessionLocal() as db_session:
+            statuses = (await db_session.scalars(
+                select(Reservation.status).order_by(Reservation.id)
+            )).all()
+        self.assertEqual(statuses, [ReservationStatus.PENDING] * 2)
+
+    async def test_post_reservation_package_with_a_recurrence(self):
+        # Act: four Mondays in a row, from 10:00 to 11:00.
+        response = self.app.post(
+            url=f"/reservations/lesson/{self.lesson.id}/package",
+            json={
+                "recurrence": {
+                    "start_time": "2025-06-02T10:00:00",
+                    "end_time": "2025-06-02T11:00:00",
+                    "every_days": 7,
+                    "count": 4
+                }
+            },
+            headers=get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+        )
+        # Assert:
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [reservation["start_time"] for reservation in response.json()],
+            [f"2025-06-{day:02}T10:00:00" for day in (2, 9, 16, 23)]
+        )
+        async with SessionLocal() as db_session:
+            reservations = (
+                await db_session.execute(select(Reservation))
+            ).scalars().all()
+        self.assertEqual(len(reservations), 4)
+        for reservation in reservations:
+            self.assertEqual(reservation.tutor_id, self.tutor.id)
+            self.assertEqual(reservation.status, ReservationStatus.PENDING)
+
+    async def test_reservation_package_is_not_created_if_one_is_invalid(self):
+        # Arrange: an accepted reservation on the second Monday.
+        async with SessionLocal() as db_session:
+            await create_reservation(
+                db_session,
+                ReservationCreate(
+                    student_id=self.student.id,
+                    private_lesson_id=self.lesson.id,
+                    status=ReservationStatus.ACCEPTED,
+                    start_time=datetime(2025, 6, 9, 10, 30, 0),
+                    end_time=datetime(2025, 6, 9, 11, 30, 0)
+                ))
+        # Act:
+        response = self.app.post(
+            url=f"/reservations/lesson/{self.lesson.id}/package",
+            json={
+                "intervals": [
+                    {
+                        "start_time": "2025-06-02T10:00:00",
+                        "end_time": "2025-06-02T11:00:00"
+                    },
+                    {
+                        "start_time": "2025-06-09T10:00:00",
+                        "end_time": "2025-06-09T11:00:00"
+                    },
+                ]
+            },
+            headers=get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+        )
+        # Assert: no reservation, other than the accepted one, was created.
+        self.assertEqual(response.status_code, 400)
+        async with SessionLocal() as db_session:
+            reservations = (
+                await db_session.execute(select(Reservation))
+            ).scalars().all()
+        self.assertEqual(len(reservations), 1)
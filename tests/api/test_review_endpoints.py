@@ -148,6 +148,30 @@ class TestReviewEndpoints(IsolatedAsyncioTestCase):
         self.assertEqual(response2.status_code, 400)
         self.assertIn("already exists", response2.json()["detail"])
 
+    async def test_create_review_with_an_idempotency_key(self):
+        """Test that a retry with the same Idempotency-Key gets the same review"""
+        review_data = {
+            "reservation_id": self.reservation.id,
+            "content": "Excelente tutor, muy recomendado",
+            "rating": 5
+        }
+        headers = {
+            **get_auth_header_for_tests(
+                email=self.student.email,
+                role=UserRole.student,
+                user_id=self.student.id
+            ),
+            "Idempotency-Key": "review-1",
+        }
+
+        response1 = self.app.post("/reviews", json=review_data, headers=headers)
+        response2 = self.app.post("/reviews", json=review_data, headers=headers)
+
+        self.assertEqual(response1.status_code, 201)
+        self.assertEqual(response2.status_code, 201)
+        self.assertEqual(response2.json(), response1.json())
+        self.assertEqual(response2.headers["Idempotent-Replayed"], "true")
+
     async def test_create_review_only_students(self):
         """Test that only students can create reviews"""
         review_data = {
@@ -10,12 +10,17 @@ from app.schemas.weekly_timeblock import (
     WeeklyTimeblockBase,
     WeeklyTimeblockOut
 )
+from app.utilities.availability_calendar import (
+    availability_cache,
+    availability_calendar,
+)
 from datetime import datetime, time
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 from tests.auth_for_tests import get_auth_header_for_tests
 from tests.db_for_tests import db_engine, get_db_for_tests, SessionLocal
 from unittest import IsolatedAsyncioTestCase
+import json
 
 
 app.dependency_overrides[get_db] = get_db_for_tests
@@ -166,6 +171,8 @@ class TestWeeklyTimeblockEndpoints(IsolatedAsyncioTestCase):
 class TestTimeblockEndpoints(IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         self.app = TestClient(app)
+        availability_cache.clear()
+        availability_calendar.clear()
         async with db_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         self.course = self.app.post(
@@ -298,3 +305,247 @@ class TestTimeblockEndpoints(IsolatedAsyncioTestCase):
             SingleTimeblock.model_validate(self.weekly_timeblocks[1])
         ]
         self.assertEqual(blocks, expected_blocks)
+
+    async def test_when_an_accepted_reservation_is_inside_a_timeblock(self):
+        # ARRANGE: create and accept a reservation
+        # that is strictly inside the second timeblock.
+        reservation = self.app.post(
+            f"/reservations/lesson/{self.lesson['id']}",
+            headers={"Authorization": f"Bearer {self.student_token}"},
+            params={
+                "start_time": "2025-07-14T11:15:00",
+                "end_time": "2025-07-14T11:45:00",
+            }
+        ).json()
+        self.app.patch(
+            f"/reservations/tutor/{reservation['id']}",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+            json={"status": ReservationStatus.ACCEPTED}
+        )
+        # ACT:
+        blocks = self.app.get(
+            f"/timeblocks/{self.tutor['id']}",
+            params={"on_date": "2025-07-14"}
+        ).json()
+        # ASSERT: only the first block should have been returned.
+        blocks = [
+            SingleTimeblock.model_validate(b)
+            for b in blocks
+        ]
+        for block in blocks:
+            block.weekday_index = None
+        expected_blocks = [
+            SingleTimeblock.model_validate(self.weekly_timeblocks[0])
+        ]
+        self.assertEqual(blocks, expected_blocks)
+
+    async def test_get_bookable_slots(self):
+        # ARRANGE: accept a reservation from 10:30 to 11:00, so the tutor is
+        # free from 10:00 to 10:30 and from 11:00 to 12:00.
+        reservation = self.app.post(
+            f"/reservations/lesson/{self.lesson['id']}",
+            headers={"Authorization": f"Bearer {self.student_token}"},
+            params={
+                "start_time": "2025-07-14T10:30:00",
+                "end_time": "2025-07-14T11:00:00",
+            }
+        ).json()
+        self.app.patch(
+            f"/reservations/tutor/{reservation['id']}",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+            json={"status": ReservationStatus.ACCEPTED}
+        )
+        # ACT:
+        slots = self.app.get(
+            f"/timeblocks/{self.tutor['id']}/slots",
+            params={
+                "on_date": "2025-07-14",
+                "duration_minutes": 30,
+                "step_minutes": 15,
+            }
+        ).json()
+        # ASSERT:
+        self.assertEqual(
+            [(slot["start_time"], slot["end_time"]) for slot in slots],
+            [
+                ("2025-07-14T10:00:00", "2025-07-14T10:30:00"),
+                ("2025-07-14T11:00:00", "2025-07-14T11:30:00"),
+                ("2025-07-14T11:15:00", "2025-07-14T11:45:00"),
+                ("2025-07-14T11:30:00", "2025-07-14T12:00:00"),
+            ]
+        )
+
+    async def test_get_available_timeblocks_of_a_date_range(self):
+        # ARRANGE: create and accept a reservation
+        # that overlaps with the first timeblock on the first Monday.
+        reservation = self.app.post(
+            f"/reservations/lesson/{self.lesson['id']}",
+            headers={"Authorization": f"Bearer {self.student_token}"},
+            params={
+                "start_time": "2025-07-14T10:00:00",
+                "end_time": "2025-07-14T11:00:00",
+            }
+        ).json()
+        self.app.patch(
+            f"/reservations/tutor/{reservation['id']}",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+            json={"status": ReservationStatus.ACCEPTED}
+        )
+        # ACT: from a Monday to the next one.
+        response = self.app.get(
+            f"/timeblocks/{self.tutor['id']}/range",
+            params={"from_date": "2025-07-14", "to_date": "2025-07-21"}
+        )
+        # ASSERT: one line per date, and each Monday must be equal
+        # to the result of the single-date endpoint.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["content-type"],
+            "application/x-ndjson"
+        )
+        days = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [day["on_date"] for day in days],
+            [f"2025-07-{day}" for day in range(14, 22)]
+        )
+        for day in days:
+            expected_timeblocks = self.app.get(
+                f"/timeblocks/{self.tutor['id']}",
+                params={"on_date": day["on_date"]}
+            ).json()
+            self.assertEqual(day["timeblocks"], expected_timeblocks)
+        self.assertEqual(len(days[0]["timeblocks"]), 1)
+        self.assertEqual(len(days[-1]["timeblocks"]), 2)
+
+    async def test_get_available_timeblocks_of_an_invalid_date_range(self):
+        response = self.app.get(
+            f"/timeblocks/{self.tutor['id']}/range",
+            params={"from_date": "2025-07-21", "to_date": "2025-07-14"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_available_timeblocks_of_a_date_range_of_unknown_user(
+        self
+    ):
+        response = self.app.get(
+            "/timeblocks/999999/range",
+            params={"from_date": "2025-07-14", "to_date": "2025-07-21"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_get_available_timeblocks_of_many_users(self):
+        # ACT:
+        response = self.app.get(
+            "/timeblocks",
+            params={
+                "user_ids": [self.tutor["id"], self.student["id"]],
+                "from_date": "2025-07-14",
+            }
+        )
+        # ASSERT: the tutor's day must be equal to the result of the
+        # single-user endpoint, and the student has no timeblocks.
+        self.assertEqual(response.status_code, 200)
+        expected_tutor_timeblocks = self.app.get(
+            f"/timeblocks/{self.tutor['id']}",
+            params={"on_date": "2025-07-14"}
+        ).json()
+        self.assertEqual(response.json(), [
+            {
+                "user_id": self.tutor["id"],
+                "days": [{
+                    "on_date": "2025-07-14",
+                    "timeblocks": expected_tutor_timeblocks
+                }]
+            },
+            {
+                "user_id": self.student["id"],
+                "days": [{"on_date": "2025-07-14", "timeblocks": []}]
+            },
+        ])
+
+    async def test_get_available_timeblocks_of_many_users_with_unknown_one(
+        self
+    ):
+        response = self.app.get(
+            "/timeblocks",
+            params={
+                "user_ids": [self.tutor["id"], 999],
+                "from_date": "2025-07-14",
+            }
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_calendar_is_updated_by_writes_after_a_read(self):
+        # ARRANGE: read the date once, so that it's stored in the calendar.
+        self.app.get(
+            f"/timeblocks/{self.tutor['id']}",
+            params={"on_date": "2025-07-14"}
+        )
+        # ACT: add a timeblock, remove another one,
+        # and accept a reservation.
+        new_timeblock = self.app.post(
+            "/weekly-timeblocks",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+            json={
+                "weekday": Weekday.MONDAY,
+                "start_hour": "15:00",
+                "end_hour": "16:00",
+                "valid_from": "2025-07-01",
+                "valid_until": "2025-07-31",
+            }
+        ).json()
+        self.app.delete(
+            f"/weekly-timeblocks/{self.weekly_timeblocks[0]['id']}",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+        )
+        reservation = self.app.post(
+            f"/reservations/lesson/{self.lesson['id']}",
+            headers={"Authorization": f"Bearer {self.student_token}"},
+            params={
+                "start_time": "2025-07-14T11:00:00",
+                "end_time": "2025-07-14T12:00:00",
+            }
+        ).json()
+        self.app.patch(
+            f"/reservations/tutor/{reservation['id']}",
+            headers={"Authorization": f"Bearer {self.tutor_token}"},
+            json={"status": ReservationStatus.ACCEPTED}
+        )
+        # ASSERT: the read must be the same as the one computed from
+        # the database, with only the new timeblock available.
+        cached_blocks = self.app.get(
+            f"/timeblocks/{self.tutor['id']}",
+            params={"on_date": "2025-07-14"}
+        ).json()
+        availability_cache.clear()
+        availability_calendar.clear()
+        computed_blocks = self.app.get(
+            f"/timeblocks/{self.tutor['id']}",
+            params={"on_date": "2025-07-14"}
+        ).json()
+        self.assertEqual(cached_blocks, computed_blocks)
+        self.assertEqual(
+            [(b["start_hour"], b["end_hour"]) for b in cached_blocks],
+            [(new_timeblock["start_hour"], new_timeblock["end_hour"])]
+        )
+
+    async def test_get_available_timeblocks_of_unknown_user(self):
+        response = self.app.get(
+            "/timeblocks/999",
+            params={"on_date": "2025-07-14"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_repeated_reads_are_served_from_the_cache(self):
+        # ARRANGE:
+        stats_before = self.app.get("/metrics").json()["availability_cache"]
+        # ACT:
+        for _ in range(3):
+            self.app.get(
+                f"/timeblocks/{self.tutor['id']}",
+                params={"on_date": "2025-07-14"}
+            )
+        # ASSERT:
+        stats = self.app.get("/metrics").json()["availability_cache"]
+        self.assertEqual(stats["misses"] - stats_before["misses"], 1)
+        self.assertEqual(stats["hits"] - stats_before["hits"], 2)
@@ -0,0 +1,213 @@
+from app.crud.reservation import (
+    delete_reservation,
+    get_reservation_by_tutor_id,
+    update_reservation_data_student,
+    update_reservation_data_tutor,
+)
+from app.crud.review import does_review_belong_to_user
+from app.database import Base
+from app.models.course import Course
+from app.models.private_lesson import PrivateLesson
+from app.models.reservation import Reservation
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.reservation import ReservationStatus, ReservationUpdate
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from unittest import IsolatedAsyncioTestCase
+
+
+class TestTutorLookupsUseOneStatement(IsolatedAsyncioTestCase):
+    '''
+    Pins the number of statements sent to the database by the lookups and
+    updates that check who a reservation belongs to, so that a change that
+    adds a round trip (e.g. fetching the lesson IDs first) makes a test fail.
+    '''
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(
+            self.engine, expire_on_commit=False
+        ) as session:
+            self.student = User(
+                email="student@example.com",
+                password="password",
+                name="Student Name",
+                role="student"
+            )
+            self.tutor = User(
+                email="tutor@example.com",
+                password="password",
+                name="Tutor Name",
+                role="tutor"
+            )
+            course = Course(name="Test Course", description="Description.")
+            session.add_all([self.student, self.tutor, course])
+            await session.flush()
+            lessons = [
+                PrivateLesson(
+                    tutor_id=self.tutor.id,
+                    course_id=course.id,
+                    price=5000
+                )
+                for _ in range(3)
+            ]
+            session.add_all(lessons)
+            await session.flush()
+            self.reservations = [
+                Reservation(
+                    private_lesson_id=lesson.id,
+                    student_id=self.student.id,
+                    tutor_id=self.tutor.id,
+                    status=ReservationStatus.PENDING,
+                    start_time=datetime(2025, 6, 2, 10 + i),
+                    end_time=datetime(2025, 6, 2, 11 + i)
+                )
+                for i, lesson in enumerate(lessons)
+            ]
+            session.add_all(self.reservations)
+            await session.flush()
+            self.review = Review(
+                reservation_id=self.reservations[0].id,
+                content="Great lesson.",
+                rating=5
+            )
+            session.add(self.review)
+            await session.commit()
+        self.statements = []
+
+        def count_statement(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            if statement.lstrip().upper().startswith(
+                ("SELECT", "INSERT", "UPDATE", "DELETE")
+            ):
+                self.statements.append(statement)
+
+        self.count_statement = count_statement
+        event.listen(
+            self.engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    async def asyncTearDown(self):
+        event.remove(
+            self.engine.sync_engine,
+            "before_cursor_execute",
+            self.count_statement
+        )
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await self.engine.dispose()
+
+    async def test_get_reservation_by_tutor_id_uses_one_statement(self):
+        async with AsyncSession(self.engine) as session:
+            reservations = await get_reservation_by_tutor_id(
+                session, self.tutor.id
+            )
+            # The relationships must be loaded already:
+            for reservation in reservations:
+                self.assertEqual(reservation.student.id, self.student.id)
+                self.assertEqual(
+                    reservation.private_lesson.tutor.id, self.tutor.id
+                )
+                self.assertIsNotNone(reservation.private_lesson.course)
+        self.assertEqual(len(reservations), 3)
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_delete_reservation_as_tutor_uses_one_statement(self):
+        reservation_id = self.reservations[1].id
+        async with AsyncSession(self.engine) as session:
+            deleted = await delete_reservation(
+                session, reservation_id, self.tutor.id, "tutor"
+            )
+        self.assertTrue(deleted)
+        # One to check and delete, and one to insert the tombstone:
+        self.assertEqual(
+            [statement.split()[0] for statement in self.statements],
+            ["DELETE", "INSERT"]
+        )
+        async with AsyncSession(self.engine) as session:
+            self.assertIsNone(await session.get(Reservation, reservation_id))
+
+    async def test_delete_reservation_of_another_tutor_deletes_nothing(self):
+        reservation_id = self.reservations[1].id
+        async with AsyncSession(self.engine) as session:
+            deleted = await delete_reservation(
+                session, reservation_id, self.student.id, "tutor"
+            )
+        self.assertIsNone(deleted)
+        self.assertEqual(len(self.statements), 1)
+        async with AsyncSession(self.engine) as session:
+            self.assertIsNotNone(
+                await session.get(Reservation, reservation_id)
+            )
+
+    async def test_does_review_belong_to_user_uses_one_statement(self):
+        cases = [
+            (self.tutor.id, "tutor", True),
+            (self.student.id, "student", True),
+            (self.student.id, "tutor", False),
+            (self.tutor.id, "student", False),
+        ]
+        for user_id, user_role, expected in cases:
+            with self.subTest(user_role=user_role, user_id=user_id):
+                self.statements.clear()
+                async with AsyncSession(self.engine) as session:
+                    belongs = await does_review_belong_to_user(
+                        session, self.review.id, user_id, user_role
+                    )
+                self.assertEqual(belongs, expected)
+                self.assertEqual(len(self.statements), 1)
+
+    async def test_update_reservation_as_tutor_uses_one_statement(self):
+        async with AsyncSession(self.engine) as session:
+            reservation = await update_reservation_data_tutor(
+                session,
+                self.reservations[0].id,
+                ReservationUpdate(status=ReservationStatus.ACCEPTED),
+                self.tutor.id
+            )
+        self.assertEqual(reservation.status, ReservationStatus.ACCEPTED)
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_update_reservation_of_another_tutor_is_forbidden(self):
+        async with AsyncSession(self.engine) as session:
+            with self.assertRaises(HTTPException) as context:
+                await update_reservation_data_tutor(
+                    session,
+                    self.reservations[0].id,
+                    ReservationUpdate(status=ReservationStatus.ACCEPTED),
+                    self.student.id
+                )
+            missing_reservation = await update_reservation_data_tutor(
+                session,
+                999,
+                ReservationUpdate(status=ReservationStatus.ACCEPTED),
+                self.tutor.id
+            )
+        self.assertEqual(context.exception.status_code, 403)
+        self.assertIsNone(missing_reservation)
+        async with AsyncSession(self.engine) as session:
+            reservation = await session.get(
+                Reservation, self.reservations[0].id
+            )
+        self.assertEqual(reservation.status, ReservationStatus.PENDING)
+
+    async def test_cancel_reservation_as_student_uses_one_statement(self):
+        async with AsyncSession(self.engine) as session:
+            reservation = await update_reservation_data_student(
+                session,
+                self.reservations[0].id,
+                ReservationUpdate(
+                    private_lesson_id=self.reservations[0].private_lesson_id,
+                    status=ReservationStatus.REJECTED
+                ),
+                self.student.id
+            )
+        self.assertEqual(reservation.status, ReservationStatus.REJECTED)
+        self.assertEqual(reservation.student_id, self.student.id)
+        self.assertEqual(len(self.statements), 1)
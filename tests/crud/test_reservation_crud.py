@@ -1,16 +1,26 @@
 from app.crud.reservation import (
     create_reservation,
     get_reservation_by_id,
-    delete_reservation
+    delete_reservation,
+    update_reservation_data_tutor
 )
 from app.database import Base
 from app.models.user import User
 from app.models.course import Course
 from app.models.private_lesson import PrivateLesson
-from app.schemas.reservation import ReservationCreate, ReservationUpdate
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationStatus,
+    ReservationUpdate
+)
+from app.utilities.availability_calendar import availability_cache
+from app.utilities.locks import lock_schedule_of_user
+from app.utilities.notifications import notification_broker
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from unittest import IsolatedAsyncioTestCase
 from datetime import datetime, timedelta
+import asyncio
 
 class TestReservationCrud(IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
@@ -97,3 +107,96 @@ class TestReservationCrud(IsolatedAsyncioTestCase):
         async with AsyncSession(self.engine) as session:
             result = await get_reservation_by_id(session, reservation_id=999)
         self.assertIsNone(result)
+
+    async def test_accepting_a_reservation_waits_for_the_schedule_lock(self):
+        student, lesson = await self.setup_dependencies()
+        async with AsyncSession(self.engine) as session:
+            created = await create_reservation(session, ReservationCreate(
+                student_id=student.id,
+                private_lesson_id=lesson.id,
+                status="pending",
+                start_time=datetime(2025, 6, 2, 10, 0, 0),
+                end_time=datetime(2025, 6, 2, 11, 0, 0)
+            ))
+
+        async def accept():
+            async with AsyncSession(
+                self.engine, expire_on_commit=False
+            ) as session:
+                return await update_reservation_data_tutor(
+                    session,
+                    created.id,
+                    ReservationUpdate(status=ReservationStatus.ACCEPTED),
+                    lesson.tutor_id
+                )
+
+        async with AsyncSession(self.engine) as session:
+            async with lock_schedule_of_user(session, lesson.tutor_id):
+                acceptance = asyncio.create_task(accept())
+                await asyncio.sleep(0.01)
+                self.assertFalse(acceptance.done())
+        accepted = await acceptance
+        self.assertEqual(accepted.status, ReservationStatus.ACCEPTED)
+
+    async def test_moving_a_reservation_to_a_lesson_of_another_tutor(self):
+        student, lesson = await self.setup_dependencies()
+        async with AsyncSession(self.engine) as session:
+            other_tutor = User(
+                email="other.tutor@example.com",
+                password="password",
+                name="Other Tutor",
+                role="tutor"
+            )
+            session.add(other_tutor)
+            await session.flush()
+            other_lesson = PrivateLesson(
+                tutor_id=other_tutor.id,
+                course_id=lesson.course_id,
+                price=5000
+            )
+            session.add(other_lesson)
+            await session.flush()
+            other_tutor_id, other_lesson_id = other_tutor.id, other_lesson.id
+            await session.commit()
+        async with AsyncSession(self.engine) as session:
+            created = await create_reservation(session, ReservationCreate(
+                student_id=student.id,
+                private_lesson_id=lesson.id,
+                status="pending",
+                start_time=datetime(2025, 6, 2, 10, 0, 0),
+                end_time=datetime(2025, 6, 2, 11, 0, 0)
+            ))
+
+        on_date = created.start_time.date()
+        computations = []
+
+        async def compute():
+            computations.append(None)
+            return []
+
+        await availability_cache.get_or_compute(
+            (other_tutor_id, on_date), compute
+        )
+        computations_before = len(computations)
+
+        async with notification_broker.subscribe(other_tutor_id) as subscription:
+            async with AsyncSession(self.engine) as session:
+                with self.assertRaises(HTTPException) as context:
+                    await update_reservation_data_tutor(
+                        session,
+                        created.id,
+                        ReservationUpdate(private_lesson_id=other_lesson_id),
+                        lesson.tutor_id
+                    )
+            self.assertTrue(subscription.queue.empty())
+        async with AsyncSession(self.engine) as session:
+            fetched = await get_reservation_by_id(session, created.id)
+
+        self.assertEqual(context.exception.status_code, 403)
+        self.assertEqual(fetched.private_lesson_id, lesson.id)
+        self.assertEqual(fetched.tutor_id, lesson.tutor_id)
+        # Nothing reached the calendar or the feed of the other tutor:
+        await availability_cache.get_or_compute(
+            (other_tutor_id, on_date), compute
+        )
+        self.assertEqual(len(computations), computations_before)
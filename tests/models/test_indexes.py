@@ -0,0 +1,165 @@
+from app.crud.private_lesson import PrivateLessonCRUD
+from app.crud.reservation import (
+    get_all_reservations,
+    get_reservation_by_tutor_id,
+    get_reservation_calendar,
+    get_reservation_changes,
+)
+from app.crud.weekly_timeblocks import read_weekly_timeblocks_of_user
+from app.database import Base
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.reservation import ReservationPageParams
+from app.schemas.user import UserRole
+from app.utilities.availability import AvailabilityService
+from datetime import date, datetime
+from sqlalchemy import event, select
+from tests.db_for_tests import db_engine, SessionLocal
+from unittest import IsolatedAsyncioTestCase
+
+
+class TestHotQueriesUseIndexes(IsolatedAsyncioTestCase):
+    '''
+    Runs the hot queries, captures the SQL that they send to SQLite, and
+    checks that `EXPLAIN QUERY PLAN` uses the expected indexes.
+    '''
+
+    async def asyncSetUp(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def asyncTearDown(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def get_query_plan(self, read) -> str:
+        statements = []
+
+        def capture_statement(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            statements.append((statement, parameters))
+
+        event.listen(
+            db_engine.sync_engine, "before_cursor_execute", capture_statement
+        )
+        try:
+            async with SessionLocal() as db_session:
+                await read(db_session)
+        finally:
+            event.remove(
+                db_engine.sync_engine,
+                "before_cursor_execute",
+                capture_statement
+            )
+        plan = []
+        async with db_engine.connect() as conn:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                )
+                plan.extend(row[-1] for row in result.all())
+        return "\n".join(plan)
+
+    async def test_weekly_timeblocks_of_user_on_date(self):
+        plan = await self.get_query_plan(
+            lambda db_session: read_weekly_timeblocks_of_user(
+                db_session, 1, date(2025, 7, 14)
+            )
+        )
+        self.assertIn(
+            "ix_weeklytimeblock_user_id_weekday_valid_from_valid_until", plan
+        )
+
+    async def test_busy_intervals_of_student(self):
+        student = User(id=1, role=UserRole.student)
+        plan = await self.get_query_plan(
+            lambda db_session: AvailabilityService(
+                db_session
+            ).read_busy_intervals_of_user(
+                student, datetime(2025, 7, 14), datetime(2025, 7, 15)
+            )
+        )
+        self.assertIn("ix_reservation_student_id_status_start_time", plan)
+
+    async def test_busy_intervals_of_tutor(self):
+        tutor = User(id=1, role=UserRole.tutor)
+        plan = await self.get_query_plan(
+            lambda db_session: AvailabilityService(
+                db_session
+            ).read_busy_intervals_of_user(
+                tutor, datetime(2025, 7, 14), datetime(2025, 7, 15)
+            )
+        )
+        self.assertIn("ix_reservation_tutor_id_start_time_accepted", plan)
+
+    async def test_private_lessons_of_tutor(self):
+        plan = await self.get_query_plan(
+            lambda db_session: PrivateLessonCRUD(db_session).read_by_tutor_id(1)
+        )
+        self.assertIn("ix_privatelesson_tutor_id", plan)
+
+    async def test_open_private_lessons_of_course(self):
+        plan = await self.get_query_plan(
+            lambda db_session: PrivateLessonCRUD(db_session).read_page(
+                course_id=1
+            )
+        )
+        self.assertIn("ix_privatelesson_course_id_open", plan)
+
+    async def test_page_of_reservations(self):
+        plan = await self.get_query_plan(
+            lambda db_session: get_all_reservations(
+                db_session, ReservationPageParams(limit=10)
+            )
+        )
+        self.assertIn("ix_reservation_start_time_id", plan)
+
+    async def test_calendar_of_student(self):
+        plan = await self.get_query_plan(
+            lambda db_session: get_reservation_calendar(
+                db_session,
+                1,
+                "student",
+                datetime(2025, 7, 14),
+                datetime(2025, 7, 21)
+            )
+        )
+        self.assertRegex(plan, r"\bix_reservation_student_id_start_time\b")
+
+    async def test_calendar_of_tutor(self):
+        plan = await self.get_query_plan(
+            lambda db_session: get_reservation_calendar(
+                db_session,
+                1,
+                "tutor",
+                datetime(2025, 7, 14),
+                datetime(2025, 7, 21)
+            )
+        )
+        self.assertRegex(plan, r"\bix_reservation_tutor_id_start_time\b")
+
+    async def test_changes_of_tutor(self):
+        plan = await self.get_query_plan(
+            lambda db_session: get_reservation_changes(
+                db_session, 1, "tutor", (0, 0, 0, 0)
+            )
+        )
+        self.assertIn("ix_reservation_tutor_id_change_id", plan)
+        self.assertIn("ix_reservationtombstone_tutor_id_change_id", plan)
+
+    async def test_reservations_of_tutor(self):
+        plan = await self.get_query_plan(
+            lambda db_session: get_reservation_by_tutor_id(
+                db_session, 1, ReservationPageParams(limit=10)
+            )
+        )
+        self.assertRegex(plan, r"\bix_reservation_tutor_id_start_time\b")
+
+    async def test_reviews_of_reservation(self):
+        plan = await self.get_query_plan(
+            lambda db_session: db_session.execute(
+                select(Review).where(Review.reservation_id == 1)
+            )
+        )
+        self.assertIn("ix_review_reservation_id", plan)
@@ -0,0 +1,83 @@
+from app.utilities.cache import AsyncTTLCache
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+
+
+class TestAsyncTTLCache(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = AsyncTTLCache(max_size=2, ttl=60)
+        self.computations = 0
+
+    async def compute(self):
+        self.computations += 1
+        await asyncio.sleep(0.01)
+        return self.computations
+
+    async def test_hits_and_misses(self):
+        first = await self.cache.get_or_compute("key", self.compute)
+        second = await self.cache.get_or_compute("key", self.compute)
+        self.assertEqual((first, second), (1, 1))
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    async def test_single_flight(self):
+        results = await asyncio.gather(*[
+            self.cache.get_or_compute("key", self.compute)
+            for _ in range(5)
+        ])
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.computations, 1)
+        self.assertEqual(self.cache.get_stats()["coalesced"], 4)
+
+    async def test_expired_entries_are_computed_again(self):
+        self.cache.ttl = 0
+        await self.cache.get_or_compute("key", self.compute)
+        await self.cache.get_or_compute("key", self.compute)
+        self.assertEqual(self.computations, 2)
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        await self.cache.get_or_compute("a", self.compute)
+        await self.cache.get_or_compute("b", self.compute)
+        await self.cache.get_or_compute("a", self.compute)
+        await self.cache.get_or_compute("c", self.compute)
+        await self.cache.get_or_compute("a", self.compute)
+        await self.cache.get_or_compute("b", self.compute)
+        self.assertEqual(self.computations, 4)
+        self.assertEqual(self.cache.get_stats()["evictions"], 2)
+
+    async def test_invalidation(self):
+        await self.cache.get_or_compute(("user", 1), self.compute)
+        await self.cache.get_or_compute(("user", 2), self.compute)
+        self.cache.invalidate_where(lambda key: key[1] == 1)
+        await self.cache.get_or_compute(("user", 1), self.compute)
+        await self.cache.get_or_compute(("user", 2), self.compute)
+        self.assertEqual(self.computations, 3)
+
+    async def test_invalidation_during_a_computation(self):
+        computation = asyncio.create_task(
+            self.cache.get_or_compute("key", self.compute)
+        )
+        await asyncio.sleep(0)
+        self.cache.invalidate("key")
+        self.assertEqual(await computation, 1)
+        # The stale result must not have been stored:
+        self.assertEqual(
+            await self.cache.get_or_compute("key", self.compute), 2
+        )
+
+    async def test_cancelled_computation_does_not_cancel_the_waiters(self):
+        leader = asyncio.create_task(
+            self.cache.get_or_compute("key", self.compute)
+        )
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(self.cache.get_or_compute("key", self.compute))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        # One of the waiters computes the value again, for all of them:
+        self.assertEqual(results, [2] * 3)
+        self.assertEqual(self.computations, 2)
+        self.assertTrue(leader.cancelled())
@@ -0,0 +1,69 @@
+from app.database import Base
+from app.models.idempotency_key import IdempotencyKey
+from app.utilities.idempotency_key_cleanup import IdempotencyKeyCleanupJob
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from tests.db_for_tests import db_engine, SessionLocal
+from unittest import IsolatedAsyncioTestCase
+import os
+import time
+
+
+class TestIdempotencyKeyCleanupJob(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # A local time 12 hours ahead of UTC, so that mixing up the clocks
+        # deletes keys that haven't expired yet:
+        self.previous_timezone = os.environ.get("TZ")
+        os.environ["TZ"] = "Etc/GMT-12"
+        time.tzset()
+        now = datetime.utcnow()
+        async with SessionLocal() as session:
+            session.add_all([
+                IdempotencyKey(
+                    user_id=1,
+                    key=key,
+                    fingerprint="fingerprint",
+                    status_code=200,
+                    response_body="{}",
+                    created_at=now - timedelta(days=1),
+                    expires_at=now + expires_in
+                )
+                for key, expires_in in [
+                    ("expired", timedelta(minutes=-1)),
+                    ("alive", timedelta(hours=1)),
+                ]
+            ])
+            await session.commit()
+
+    async def asyncTearDown(self):
+        if self.previous_timezone is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = self.previous_timezone
+        time.tzset()
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def test_run_once_deletes_the_keys_expired_in_utc(self):
+        job = IdempotencyKeyCleanupJob(SessionLocal)
+
+        deleted_idempotency_keys = await job.run_once()
+
+        async with SessionLocal() as session:
+            keys = (await session.scalars(select(IdempotencyKey.key))).all()
+        self.assertEqual(deleted_idempotency_keys, 1)
+        self.assertEqual(keys, ["alive"])
+        stats = job.get_stats()
+        self.assertEqual(stats["runs"], 1)
+        self.assertEqual(stats["deleted_idempotency_keys"], 1)
+        self.assertEqual(stats["last_run_deleted_idempotency_keys"], 1)
+
+    async def test_job_is_disabled_with_an_interval_of_zero(self):
+        job = IdempotencyKeyCleanupJob(SessionLocal, interval_seconds=0)
+
+        job.start()
+        await job.stop()
+
+        self.assertEqual(job.get_stats()["runs"], 0)
@@ -0,0 +1,87 @@
+from app.utilities.intervals import (
+    does_interval_overlap_merged_intervals,
+    iterate_slots,
+    merge_intervals,
+    subtract_intervals,
+)
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+
+class TestIntervals(TestCase):
+
+    # Test merge_intervals()
+
+    def test_merge_intervals_coalesces_overlapping_and_touching_ones(self):
+        intervals = [
+            (datetime(2025, 7, 14, 12), datetime(2025, 7, 14, 13)),
+            (datetime(2025, 7, 14, 9), datetime(2025, 7, 14, 10)),
+            (datetime(2025, 7, 14, 9, 30), datetime(2025, 7, 14, 11)),
+            (datetime(2025, 7, 14, 11), datetime(2025, 7, 14, 11, 30)),
+        ]
+        self.assertEqual(merge_intervals(intervals), [
+            (datetime(2025, 7, 14, 9), datetime(2025, 7, 14, 11, 30)),
+            (datetime(2025, 7, 14, 12), datetime(2025, 7, 14, 13)),
+        ])
+
+    def test_merge_intervals_when_there_are_no_intervals(self):
+        self.assertEqual(merge_intervals([]), [])
+
+    # Test does_interval_overlap_merged_intervals()
+
+    def test_does_interval_overlap_merged_intervals(self):
+        merged_intervals = [
+            (datetime(2025, 7, 14, 10, 15), datetime(2025, 7, 14, 10, 45)),
+            (datetime(2025, 7, 14, 12), datetime(2025, 7, 14, 13)),
+        ]
+        # Contains an interval:
+        self.assertTrue(does_interval_overlap_merged_intervals(
+            datetime(2025, 7, 14, 10), datetime(2025, 7, 14, 11),
+            merged_intervals
+        ))
+        # Partially overlaps an interval:
+        self.assertTrue(does_interval_overlap_merged_intervals(
+            datetime(2025, 7, 14, 12, 30), datetime(2025, 7, 14, 14),
+            merged_intervals
+        ))
+        # Only touches the intervals:
+        self.assertFalse(does_interval_overlap_merged_intervals(
+            datetime(2025, 7, 14, 10, 45), datetime(2025, 7, 14, 12),
+            merged_intervals
+        ))
+        self.assertFalse(does_interval_overlap_merged_intervals(
+            datetime(2025, 7, 14, 9), datetime(2025, 7, 14, 10, 15),
+            merged_intervals
+        ))
+
+    # Test subtract_intervals()
+
+    def test_subtract_intervals(self):
+        intervals = [
+            (datetime(2025, 7, 14, 9), datetime(2025, 7, 14, 12)),
+            (datetime(2025, 7, 14, 14), datetime(2025, 7, 14, 15)),
+        ]
+        subtrahend = [
+            (datetime(2025, 7, 14, 8), datetime(2025, 7, 14, 9, 30)),
+            (datetime(2025, 7, 14, 10), datetime(2025, 7, 14, 10, 30)),
+            (datetime(2025, 7, 14, 11, 30), datetime(2025, 7, 14, 14, 15)),
+        ]
+        self.assertEqual(subtract_intervals(intervals, subtrahend), [
+            (datetime(2025, 7, 14, 9, 30), datetime(2025, 7, 14, 10)),
+            (datetime(2025, 7, 14, 10, 30), datetime(2025, 7, 14, 11, 30)),
+            (datetime(2025, 7, 14, 14, 15), datetime(2025, 7, 14, 15)),
+        ])
+
+    # Test iterate_slots()
+
+    def test_iterate_slots_aligns_starts_to_the_step(self):
+        intervals = [
+            (datetime(2025, 7, 14, 9, 10), datetime(2025, 7, 14, 10, 30)),
+        ]
+        slots = list(iterate_slots(
+            intervals, timedelta(minutes=60), timedelta(minutes=15)
+        ))
+        self.assertEqual(slots, [
+            (datetime(2025, 7, 14, 9, 15), datetime(2025, 7, 14, 10, 15)),
+            (datetime(2025, 7, 14, 9, 30), datetime(2025, 7, 14, 10, 30)),
+        ])
@@ -0,0 +1,52 @@
+from app.utilities.locks import lock_schedule_of_user, lock_schedules_of_users
+from tests.db_for_tests import SessionLocal
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+
+
+class TestLockScheduleOfUser(IsolatedAsyncioTestCase):
+    async def test_same_user_is_serialized(self):
+        events = []
+
+        async def hold_lock(name: str):
+            async with SessionLocal() as db_session:
+                async with lock_schedule_of_user(db_session, 1):
+                    events.append(f"{name} in")
+                    await asyncio.sleep(0.01)
+                    events.append(f"{name} out")
+
+        await asyncio.gather(hold_lock("a"), hold_lock("b"))
+        self.assertEqual(events, ["a in", "a out", "b in", "b out"])
+
+    async def test_different_users_are_not_serialized(self):
+        events = []
+
+        async def hold_lock(user_id: int):
+            async with SessionLocal() as db_session:
+                async with lock_schedule_of_user(db_session, user_id):
+                    events.append(f"{user_id} in")
+                    await asyncio.sleep(0.01)
+                    events.append(f"{user_id} out")
+
+        await asyncio.gather(hold_lock(1), hold_lock(2))
+        self.assertEqual(events, ["1 in", "2 in", "1 out", "2 out"])
+
+    async def test_several_users_are_locked_in_the_same_order(self):
+        events = []
+
+        async def hold_locks(name: str, user_ids: list[int]):
+            async with SessionLocal() as db_session:
+                async with lock_schedules_of_users(db_session, user_ids):
+                    events.append(f"{name} in")
+                    await asyncio.sleep(0.01)
+                    events.append(f"{name} out")
+
+        # In opposite orders, and with a repeated user, without deadlocks:
+        await asyncio.wait_for(
+            asyncio.gather(
+                hold_locks("a", [1, 2]),
+                hold_locks("b", [2, 1, 1])
+            ),
+            timeout=1
+        )
+        self.assertEqual(events, ["a in", "a out", "b in", "b out"])
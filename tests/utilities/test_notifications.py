@@ -0,0 +1,72 @@
+from app.utilities.notifications import (
+    iterate_server_sent_events,
+    LocalBroker,
+    notification_broker,
+)
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+import json
+
+
+class TestLocalBroker(IsolatedAsyncioTestCase):
+    async def test_only_the_subscribers_of_the_user_are_notified(self):
+        broker = LocalBroker()
+        async with broker.subscribe(1) as first_subscription:
+            async with broker.subscribe(2) as second_subscription:
+                await broker.publish([1], {"type": "first"})
+                await broker.publish([1, 2], {"type": "both"})
+                self.assertEqual(
+                    [
+                        first_subscription.queue.get_nowait(),
+                        first_subscription.queue.get_nowait(),
+                    ],
+                    [{"type": "first"}, {"type": "both"}]
+                )
+                self.assertEqual(
+                    second_subscription.queue.get_nowait(), {"type": "both"}
+                )
+                self.assertTrue(second_subscription.queue.empty())
+        # Without subscribers, notifications go nowhere:
+        await broker.publish([1, 2], {"type": "lost"})
+        self.assertTrue(first_subscription.queue.empty())
+
+    async def test_notifications_from_another_thread_are_delivered(self):
+        broker = LocalBroker()
+        async with broker.subscribe(1) as subscription:
+            await asyncio.to_thread(
+                asyncio.run, broker.publish([1], {"type": "threaded"})
+            )
+            notification = await asyncio.wait_for(anext(subscription), 1)
+        self.assertEqual(notification, {"type": "threaded"})
+
+
+class TestServerSentEvents(IsolatedAsyncioTestCase):
+    async def test_notifications_are_encoded_as_events(self):
+        events = iterate_server_sent_events(1, keep_alive_seconds=0.01)
+
+        connected = await anext(events)
+        keep_alive = await anext(events)
+        await notification_broker.publish([1], {"type": "reservation.created"})
+        event = await anext(events)
+        await events.aclose()
+
+        self.assertEqual(connected, ": connected\n\n")
+        self.assertEqual(keep_alive, ": keep-alive\n\n")
+        self.assertEqual(
+            event,
+            "event: reservation.created\n"
+            f"data: {json.dumps({'type': 'reservation.created'})}\n\n"
+        )
+
+    async def test_stream_ends_when_the_token_expires(self):
+        events = iterate_server_sent_events(
+            1, keep_alive_seconds=10, expires_in_seconds=0.01
+        )
+
+        connected = await anext(events)
+        expired = await anext(events)
+
+        self.assertEqual(connected, ": connected\n\n")
+        self.assertEqual(expired, "event: token.expired\ndata: {}\n\n")
+        with self.assertRaises(StopAsyncIteration):
+            await anext(events)
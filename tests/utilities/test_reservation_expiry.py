@@ -0,0 +1,107 @@
+from app.database import Base
+from app.models.course import Course
+from app.models.private_lesson import PrivateLesson
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.schemas.reservation import ReservationStatus
+from app.utilities.reservation_expiry import ReservationExpiryJob
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from tests.db_for_tests import db_engine, SessionLocal
+from unittest import IsolatedAsyncioTestCase
+
+
+NOW = datetime(2025, 6, 10, 12)
+
+
+class TestReservationExpiryJob(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with SessionLocal() as session:
+            course = Course(name="Test Course", description="Course desc")
+            student = User(
+                email="student@test.com",
+                password="pw",
+                name="Student",
+                role="student"
+            )
+            tutor = User(
+                email="tutor@test.com",
+                password="pw",
+                name="Tutor",
+                role="tutor"
+            )
+            session.add_all([course, student, tutor])
+            await session.flush()
+            lesson = PrivateLesson(
+                tutor_id=tutor.id,
+                course_id=course.id,
+                price=10000
+            )
+            session.add(lesson)
+            await session.flush()
+            # Five pending reservations in the past, one in the future,
+            # and an accepted one in the past:
+            session.add_all([
+                Reservation(
+                    private_lesson_id=lesson.id,
+                    student_id=student.id,
+                    tutor_id=tutor.id,
+                    status=status,
+                    start_time=NOW + timedelta(days=days),
+                    end_time=NOW + timedelta(days=days, hours=1)
+                )
+                for days, status in [
+                    (-5, ReservationStatus.PENDING),
+                    (-4, ReservationStatus.PENDING),
+                    (-3, ReservationStatus.PENDING),
+                    (-2, ReservationStatus.PENDING),
+                    (-1, ReservationStatus.PENDING),
+                    (1, ReservationStatus.PENDING),
+                    (-1, ReservationStatus.ACCEPTED),
+                ]
+            ])
+            await session.commit()
+
+    async def asyncTearDown(self):
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def test_run_once_expires_past_pending_reservations_in_batches(self):
+        job = ReservationExpiryJob(SessionLocal, batch_size=2)
+
+        expired_reservations = await job.run_once(now=NOW)
+
+        async with SessionLocal() as session:
+            statuses = (await session.scalars(
+                select(Reservation.status).order_by(Reservation.id)
+            )).all()
+        self.assertEqual(expired_reservations, 5)
+        self.assertEqual(statuses, [
+            *[ReservationStatus.REJECTED] * 5,
+            ReservationStatus.PENDING,
+            ReservationStatus.ACCEPTED,
+        ])
+        stats = job.get_stats()
+        self.assertEqual(stats["runs"], 1)
+        self.assertEqual(stats["expired_reservations"], 5)
+        self.assertEqual(stats["last_run_expired_reservations"], 5)
+
+    async def test_second_run_finds_nothing_to_expire(self):
+        job = ReservationExpiryJob(SessionLocal, batch_size=2)
+
+        await job.run_once(now=NOW)
+        expired_reservations = await job.run_once(now=NOW)
+
+        self.assertEqual(expired_reservations, 0)
+        self.assertEqual(job.get_stats()["runs"], 2)
+        self.assertEqual(job.get_stats()["expired_reservations"], 5)
+
+    async def test_job_is_disabled_with_an_interval_of_zero(self):
+        job = ReservationExpiryJob(SessionLocal, interval_seconds=0)
+
+        job.start()
+        await job.stop()
+
+        self.assertEqual(job.get_stats()["runs"], 0)
@@ -193,3 +193,71 @@ class TestSingleTimeblocks(TestCase):
         self.assertFalse(SingleTimeblock.are_timeblocks_connected(
             t6, t1, all_timeblocks
         ))
+
+    def test_are_timeblocks_connected_with_many_fine_grained_timeblocks(self):
+        all_timeblocks = [
+            SingleTimeblock(
+                weekday=Weekday.MONDAY,
+                weekday_index=0,
+                start_hour=time(hour, minute),
+                end_hour=(
+                    time(hour, minute + 15) if minute < 45
+                    else time(hour + 1, 0)
+                )
+            )
+            for hour in range(8, 20)
+            for minute in range(0, 60, 15)
+            if (hour, minute) != (14, 0)
+        ]
+        first, last = all_timeblocks[0], all_timeblocks[-1]
+        before_gap, after_gap = all_timeblocks[23], all_timeblocks[24]
+        self.assertTrue(SingleTimeblock.are_timeblocks_connected(
+            first, before_gap, all_timeblocks
+        ))
+        self.assertTrue(SingleTimeblock.are_timeblocks_connected(
+            after_gap, last, all_timeblocks
+        ))
+        self.assertFalse(SingleTimeblock.are_timeblocks_connected(
+            first, last, all_timeblocks
+        ))
+
+    # Test merge_connected_timeblocks()
+
+    def test_merge_connected_timeblocks(self):
+        t1 = SingleTimeblock(
+            weekday=Weekday.MONDAY,
+            weekday_index=0,
+            start_hour=time(10, 0),
+            end_hour=time(11, 0)
+        )
+        t2 = SingleTimeblock(
+            weekday=Weekday.MONDAY,
+            weekday_index=0,
+            start_hour=time(9, 0),
+            end_hour=time(10, 0)
+        )
+        t3 = SingleTimeblock(
+            weekday=Weekday.MONDAY,
+            weekday_index=0,
+            start_hour=time(12, 0),
+            end_hour=time(13, 0)
+        )
+        t4 = SingleTimeblock(
+            weekday=Weekday.TUESDAY,
+            weekday_index=1,
+            start_hour=time(9, 0),
+            end_hour=time(10, 0)
+        )
+        merged = SingleTimeblock.merge_connected_timeblocks([t4, t3, t1, t2])
+        self.assertEqual(merged, [
+            SingleTimeblock(
+                weekday=Weekday.MONDAY,
+                weekday_index=0,
+                start_hour=time(9, 0),
+                end_hour=time(11, 0)
+            ),
+            t3,
+            t4,
+        ])
+        # The original timeblocks must not be modified:
+        self.assertEqual(t2.end_hour, time(10, 0))
@@ -0,0 +1,146 @@
+from app.schemas.single_timeblock import SingleTimeblock
+from app.schemas.weekday import Weekday
+from app.schemas.weekly_timeblock import WeeklyTimeblockOut
+from app.utilities.intervals import (
+    iterate_slots,
+    merge_intervals,
+    subtract_intervals,
+)
+from app.utilities.week_grid import END_OF_DAY, WeekGrid
+from datetime import date, datetime, time, timedelta
+from unittest import TestCase
+
+
+MONDAY = date(2025, 7, 14)
+
+
+class TestWeekGrid(TestCase):
+
+    # Test conversions
+
+    def test_round_trip_merges_connected_timeblocks(self):
+        timeblocks = [
+            SingleTimeblock(
+                weekday=Weekday.MONDAY,
+                start_hour=time(9),
+                end_hour=time(10)
+            ),
+            SingleTimeblock(
+                weekday=Weekday.MONDAY,
+                start_hour=time(10),
+                end_hour=time(11, 30)
+            ),
+            SingleTimeblock(
+                weekday=Weekday.SUNDAY,
+                start_hour=time(22),
+                end_hour=END_OF_DAY
+            ),
+        ]
+        grid = WeekGrid.from_single_timeblocks(timeblocks)
+        self.assertEqual(grid.to_single_timeblocks(), [
+            SingleTimeblock(
+                weekday=Weekday.MONDAY,
+                weekday_index=0,
+                start_hour=time(9),
+                end_hour=time(11, 30)
+            ),
+            SingleTimeblock(
+                weekday=Weekday.SUNDAY,
+                weekday_index=6,
+                start_hour=time(22),
+                end_hour=END_OF_DAY
+            ),
+        ])
+        self.assertEqual(grid.count_minutes(), 150 + 120)
+
+    def test_free_time_is_rounded_inwards(self):
+        grid = WeekGrid.from_free_intervals(MONDAY, [
+            (datetime(2025, 7, 15, 9, 2), datetime(2025, 7, 15, 9, 30, 1)),
+            # Touches the first interval, so no slot is lost in between:
+            (datetime(2025, 7, 15, 9, 30, 1), datetime(2025, 7, 15, 9, 58)),
+        ])
+        self.assertEqual(grid.to_intervals(MONDAY), [
+            (datetime(2025, 7, 15, 9, 5), datetime(2025, 7, 15, 9, 55)),
+        ])
+
+    def test_busy_time_is_rounded_outwards_and_clipped_to_the_week(self):
+        grid = WeekGrid.from_busy_intervals(MONDAY, [
+            (datetime(2025, 7, 14, 9, 2), datetime(2025, 7, 14, 9, 58)),
+            (datetime(2025, 7, 13, 23), datetime(2025, 7, 14, 0, 30)),
+            (datetime(2025, 7, 21, 9), datetime(2025, 7, 21, 10)),
+        ])
+        self.assertEqual(grid.to_intervals(MONDAY), [
+            (datetime(2025, 7, 14, 0, 0), datetime(2025, 7, 14, 0, 30)),
+            (datetime(2025, 7, 14, 9, 0), datetime(2025, 7, 14, 10, 0)),
+        ])
+
+    def test_weekly_timeblocks_are_placed_on_their_valid_dates(self):
+        weekly_timeblocks = [
+            WeeklyTimeblockOut(
+                id=1,
+                weekday=Weekday.TUESDAY,
+                start_hour=time(22),
+                end_hour=END_OF_DAY,
+                valid_from=datetime(2025, 7, 1),
+                valid_until=datetime(2025, 7, 15, 23, 59, 59)
+            ),
+            WeeklyTimeblockOut(
+                id=2,
+                weekday=Weekday.WEDNESDAY,
+                start_hour=time(9),
+                end_hour=time(10),
+                valid_from=datetime(2025, 7, 17),
+                valid_until=datetime(2025, 7, 31, 23, 59, 59)
+            ),
+        ]
+        grid = WeekGrid.from_weekly_timeblocks(MONDAY, weekly_timeblocks)
+        # The last day of the validity is included, up to midnight, and the
+        # Wednesday before the validity is not:
+        self.assertEqual(grid.to_intervals(MONDAY), [
+            (datetime(2025, 7, 15, 22), datetime(2025, 7, 16, 0)),
+        ])
+
+    # Test set operations
+
+    def test_set_operations(self):
+        morning = WeekGrid.from_single_timeblocks([SingleTimeblock(
+            weekday=Weekday.WEDNESDAY, start_hour=time(8), end_hour=time(12)
+        )])
+        lunch = WeekGrid.from_single_timeblocks([SingleTimeblock(
+            weekday=Weekday.WEDNESDAY, start_hour=time(11), end_hour=time(13)
+        )])
+        self.assertEqual((morning | lunch).count_minutes(), 5 * 60)
+        self.assertEqual((morning & lunch).count_minutes(), 60)
+        self.assertEqual((morning - lunch).count_minutes(), 3 * 60)
+        self.assertTrue(morning.overlaps(lunch))
+        self.assertFalse((morning - lunch).overlaps(lunch))
+        self.assertTrue(morning.covers(morning & lunch))
+        self.assertFalse(morning.covers(lunch))
+        self.assertFalse(WeekGrid())
+
+    # Test bookable slots
+
+    def test_slots_are_the_same_as_the_exact_ones(self):
+        free_intervals = [
+            (datetime(2025, 7, 16, 8, 58), datetime(2025, 7, 16, 10, 32)),
+            (datetime(2025, 7, 16, 11), datetime(2025, 7, 16, 12, 0, 30)),
+            (datetime(2025, 7, 16, 23), datetime(2025, 7, 17, 0)),
+        ]
+        busy_intervals = [
+            (datetime(2025, 7, 16, 9, 29), datetime(2025, 7, 16, 9, 31)),
+        ]
+        grid = (
+            WeekGrid.from_free_intervals(MONDAY, free_intervals) -
+            WeekGrid.from_busy_intervals(MONDAY, busy_intervals)
+        )
+        exact_free_intervals = subtract_intervals(
+            merge_intervals(free_intervals), merge_intervals(busy_intervals)
+        )
+        for duration, step in [(30, 15), (60, 5), (5, 5), (45, 30)]:
+            with self.subTest(duration=duration, step=step):
+                duration = timedelta(minutes=duration)
+                step = timedelta(minutes=step)
+                self.assertEqual(
+                    list(grid.iterate_slots(MONDAY, duration, step)),
+                    list(iterate_slots(exact_free_intervals, duration, step))
+                )